@@ -15,16 +15,30 @@ Databases:
 - Evaluations: Risk assessments, audits, and evaluations
 
 Main modules:
-- categories: Category-specific data collectors and processors
-- databases: Database-specific implementations
+- data: Accessors, storage backends and data materialization
+- analysis: Risk analytics, recommendations and report export
 - utils: Utility functions for data processing and analysis
-- models: Risk assessment and machine learning models
+
+Submodules are imported on first attribute access (``aire.data``), so
+``import aire`` stays cheap and does not pull in pandas or supabase.
 """
 
+import importlib
+from typing import Any, List
+
 __version__ = "0.1.0"
 __author__ = "AIRE Development Team"
 
-from . import categories
-from . import databases
-from . import utils
-from . import models
+_SUBMODULES = ("data", "analysis", "utils")
+
+
+def __getattr__(name: str) -> Any:
+    if name in _SUBMODULES:
+        module = importlib.import_module(f"{__name__}.{name}")
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + list(_SUBMODULES))
@@ -0,0 +1,266 @@
+"""Pre-aggregated time x risk x origin count cube for incidents.
+
+``IncidentCube`` counts incidents per cell of three dimensions: a time
+bucket (quarter, from ``quarter`` or ``reporting_date``, or month), a risk
+category and an actor origin. ``risk_cats`` and ``actors_origin`` are
+arrays, so summing finer cells would count an incident once per category.
+Each incident therefore also updates the rolled-up cells where a dimension
+is ``ALL``, and every answer is an exact count of distinct incidents:
+
+    cube = IncidentCube()
+    cube.update_from(accessor.incidents)
+    cube.count(risk="Cyber Offense", origin="Russia", time="Q3 2025")
+    cube.series(risk="Cyber Offense")             # per quarter, zero-filled
+    cube.breakdown("origin", risk="Cyber Offense", start="Q1 2024")
+    cube.pivot("time", "risk", origin="China")
+
+An incident touches at most ``2 x (risks + 1) x (origins + 1)`` cells, so
+adding, replacing or removing one is cheap and no query scans rows.
+"""
+
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from ..data.changes import DEFAULT_FULL_INTERVAL, ChangeFeed
+from ..data.pagination import DEFAULT_PAGE_SIZE
+from .rows import distinct_items, month_key, quarter_key
+
+ALL = None
+DIMENSIONS = ("time", "risk", "origin")
+GRAINS = ("quarter", "month")
+FIELDS = ("id", "quarter", "reporting_date", "risk_cats", "actors_origin")
+
+Bucket = Tuple[int, int]
+Cell = Tuple[Optional[Bucket], Optional[str], Optional[str]]
+Entry = Tuple[Optional[Bucket], Tuple[str, ...], Tuple[str, ...]]
+TimeValue = Union[str, Bucket, None]
+
+
+class IncidentCube:
+    """Incrementally maintained incident counts by time bucket, risk and origin.
+
+    ``change_column`` and ``full_interval`` control how ``update_from``
+    finds edited and deleted incidents (see ``aire.data.changes``).
+    """
+
+    def __init__(
+        self,
+        grain: str = "quarter",
+        change_column: Optional[str] = None,
+        full_interval: Optional[float] = DEFAULT_FULL_INTERVAL,
+    ):
+        if grain not in GRAINS:
+            raise ValueError(f"grain must be one of {GRAINS}, got {grain!r}")
+        self.grain = grain
+        self._bucket = quarter_key if grain == "quarter" else month_key
+        self._lock = threading.RLock()
+        self._cells: Counter = Counter()
+        self._rows: Dict[Any, Entry] = {}
+        self._feed = ChangeFeed(change_column, full_interval)
+
+    def __len__(self) -> int:
+        """Number of incidents in the cube."""
+        return len(self._rows)
+
+    # -- maintenance -----------------------------------------------------
+
+    @staticmethod
+    def _cells_for(
+        bucket: Optional[Bucket], risks: Tuple[str, ...], origins: Tuple[str, ...]
+    ) -> Iterable[Cell]:
+        for time in ((bucket, ALL) if bucket is not None else (ALL,)):
+            for risk in risks + (ALL,):
+                for origin in origins + (ALL,):
+                    yield time, risk, origin
+
+    def _update(self, entry: Entry, sign: int) -> None:
+        cells = self._cells
+        for cell in self._cells_for(*entry):
+            cells[cell] += sign
+            if not cells[cell]:
+                del cells[cell]
+
+    def apply_rows(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Add new incidents or replace changed ones."""
+        applied = 0
+        with self._lock:
+            for row in rows:
+                entry = (
+                    self._bucket(row),
+                    tuple(distinct_items(row.get("risk_cats"))),
+                    tuple(distinct_items(row.get("actors_origin"))),
+                )
+                previous = self._rows.get(row["id"])
+                if previous is not None:
+                    self._update(previous, -1)
+                self._update(entry, +1)
+                self._rows[row["id"]] = entry
+                applied += 1
+        return applied
+
+    def remove_rows(self, ids: Iterable[Any]) -> int:
+        """Subtract deleted incidents."""
+        removed = 0
+        with self._lock:
+            for row_id in ids:
+                previous = self._rows.pop(row_id, None)
+                if previous is not None:
+                    self._update(previous, -1)
+                    removed += 1
+        return removed
+
+    def update_from(
+        self, accessor: Any, page_size: int = DEFAULT_PAGE_SIZE, full: bool = False
+    ) -> int:
+        """Apply incidents changed since the last update from an ``IncidentAccessor``.
+
+        Only the columns the cube needs are transferred; ``full`` recounts
+        every incident and drops deleted ones.
+        """
+        applied, _ = self._feed.pull_from(
+            accessor,
+            FIELDS,
+            apply=self.apply_rows,
+            remove=self.remove_rows,
+            known_ids=self._known_ids,
+            page_size=page_size,
+            full=full,
+        )
+        return applied
+
+    def _known_ids(self) -> List[Any]:
+        with self._lock:
+            return list(self._rows)
+
+    # -- queries ---------------------------------------------------------
+
+    def bucket(self, value: TimeValue) -> Optional[Bucket]:
+        """Parse ``"Q3 2025"``, ``"2025-07"`` or a ``(year, n)`` tuple for this grain."""
+        if value is None or isinstance(value, tuple):
+            return value
+        if self.grain == "quarter":
+            # A month or date names the quarter containing it.
+            key = quarter_key({"quarter": value}) or quarter_key({"reporting_date": value})
+        else:
+            key = month_key({"reporting_date": value})
+        if key is None:
+            raise ValueError(f"Cannot read a {self.grain} from {value!r}")
+        return key
+
+    def label(self, bucket: Bucket) -> str:
+        if self.grain == "quarter":
+            return f"Q{bucket[1]} {bucket[0]}"
+        return f"{bucket[0]:04d}-{bucket[1]:02d}"
+
+    def count(
+        self, time: TimeValue = ALL, risk: Optional[str] = ALL, origin: Optional[str] = ALL
+    ) -> int:
+        """Incidents in one cell; ``None`` (``ALL``) leaves a dimension open."""
+        return self._cells.get((self.bucket(time), risk, origin), 0)
+
+    def buckets(self) -> List[Bucket]:
+        """Time buckets that hold at least one incident, in order."""
+        with self._lock:
+            return sorted({time for time, risk, origin in self._cells if time is not ALL})
+
+    def members(self, dimension: str) -> List[Any]:
+        """Values present along ``dimension`` (labels for ``time``)."""
+        if dimension == "time":
+            return [self.label(bucket) for bucket in self.buckets()]
+        index = DIMENSIONS.index(dimension)
+        with self._lock:
+            return sorted({cell[index] for cell in self._cells if cell[index] is not ALL})
+
+    def _range(self, start: TimeValue, end: TimeValue) -> List[Bucket]:
+        buckets = self.buckets()
+        if not buckets:
+            return []
+        first = self.bucket(start) or buckets[0]
+        last = self.bucket(end) or buckets[-1]
+        step = 4 if self.grain == "quarter" else 12
+        result = []
+        year, n = first
+        while (year, n) <= last:
+            result.append((year, n))
+            year, n = (year + 1, 1) if n == step else (year, n + 1)
+        return result
+
+    def series(
+        self,
+        risk: Optional[str] = ALL,
+        origin: Optional[str] = ALL,
+        start: TimeValue = None,
+        end: TimeValue = None,
+    ) -> Dict[str, int]:
+        """Incidents per time bucket for a risk/origin slice, gaps filled with 0."""
+        with self._lock:
+            return {
+                self.label(bucket): self._cells.get((bucket, risk, origin), 0)
+                for bucket in self._range(start, end)
+            }
+
+    def breakdown(
+        self,
+        dimension: str,
+        time: TimeValue = ALL,
+        risk: Optional[str] = ALL,
+        origin: Optional[str] = ALL,
+        start: TimeValue = None,
+        end: TimeValue = None,
+    ) -> Dict[Any, int]:
+        """Incidents per member of ``dimension``, largest first, given the other filters.
+
+        ``start``/``end`` restrict time to a range of buckets; each incident
+        is in one bucket, so counts over a range are still exact.
+        """
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"dimension must be one of {DIMENSIONS}, got {dimension!r}")
+        if dimension == "time":
+            counts = {
+                label: n for label, n in self.series(risk, origin, start, end).items() if n
+            }
+            return dict(sorted(counts.items(), key=lambda item: item[1], reverse=True))
+
+        filters = {"time": self.bucket(time), "risk": risk, "origin": origin}
+        ranged = time is ALL and (start is not None or end is not None)
+        times = self._range(start, end) if ranged else [filters["time"]]
+        index = DIMENSIONS.index(dimension)
+        counts: Counter = Counter()
+        with self._lock:
+            for member in self.members(dimension):
+                for bucket in times:
+                    cell = [bucket, filters["risk"], filters["origin"]]
+                    cell[index] = member
+                    counts[member] += self._cells.get(tuple(cell), 0)
+        return {member: n for member, n in counts.most_common() if n}
+
+    def pivot(
+        self,
+        rows: str,
+        columns: str,
+        time: TimeValue = ALL,
+        risk: Optional[str] = ALL,
+        origin: Optional[str] = ALL,
+    ) -> Dict[Any, Dict[Any, int]]:
+        """Two-dimensional table of counts, e.g. ``pivot("time", "risk")``."""
+        if len({rows, columns}) != 2 or not {rows, columns} <= set(DIMENSIONS):
+            raise ValueError(f"rows and columns must be two of {DIMENSIONS} and differ")
+        fixed = {"time": self.bucket(time), "risk": risk, "origin": origin}
+        row_index, column_index = DIMENSIONS.index(rows), DIMENSIONS.index(columns)
+        row_members = self.buckets() if rows == "time" else self.members(rows)
+        column_members = self.buckets() if columns == "time" else self.members(columns)
+
+        def name(dimension: str, member: Any) -> Any:
+            return self.label(member) if dimension == "time" else member
+
+        table: Dict[Any, Dict[Any, int]] = {}
+        with self._lock:
+            for row_member in row_members:
+                line = {}
+                for column_member in column_members:
+                    cell = [fixed["time"], fixed["risk"], fixed["origin"]]
+                    cell[row_index], cell[column_index] = row_member, column_member
+                    line[name(columns, column_member)] = self._cells.get(tuple(cell), 0)
+                table[name(rows, row_member)] = line
+        return table
@@ -0,0 +1,451 @@
+"""Risk analytics over the AIRE tables, maintained incrementally.
+
+``RiskAnalyzer`` keeps running aggregates (risk category distributions,
+actor origins, per-quarter counts, risk co-occurrence, benchmark and
+evaluation coverage) built from a narrow projection of each row. Every
+aggregate supports adding and subtracting a row, so refreshing only costs
+the rows that changed:
+
+- tables listed in ``change_columns`` (e.g. ``{"incidents": "updated_at"}``)
+  pick up new and edited rows whose change column moved past the watermark;
+- other tables only pick up rows with an id past the last one seen;
+- every ``full_interval`` seconds a table is recounted from scratch, which
+  also catches deletions and edits without a change column (see
+  ``aire.data.changes``);
+- ``apply_rows``/``remove_rows`` take changes from another feed (a
+  ``ReplicaSync`` run, a webhook ...) directly.
+
+Reports are computed from the aggregates, so their cost depends on the
+number of categories and quarters, not on the number of rows.
+"""
+
+import json
+import math
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..data.changes import DEFAULT_FULL_INTERVAL, ChangeFeed
+from ..data.pagination import DEFAULT_PAGE_SIZE
+from .rows import distinct_items, quarter_key
+
+# Columns each table contributes to the aggregates.
+FIELDS: Dict[str, Tuple[str, ...]] = {
+    "incidents": ("id", "quarter", "reporting_date", "risk_cats", "actors_origin"),
+    "benchmarks": ("id", "availability", "risk_cats"),
+    "evals": ("id", "reviewed", "models", "organizations", "risk_cats"),
+}
+
+
+def _quarter_label(key: Tuple[int, int]) -> str:
+    return f"Q{key[1]} {key[0]}"
+
+
+def _ranked(counter: Counter) -> Dict[Any, int]:
+    return {key: count for key, count in counter.most_common() if count > 0}
+
+
+class _Aggregates:
+    """Counters for one table that rows can be added to and subtracted from."""
+
+    def __init__(self):
+        self.total = 0
+        self.counters: Dict[str, Counter] = {}
+
+    def counter(self, name: str) -> Counter:
+        return self.counters.setdefault(name, Counter())
+
+    def update(self, contribution: Dict[str, Iterable[Any]], sign: int) -> None:
+        self.total += sign
+        for name, keys in contribution.items():
+            counter = self.counter(name)
+            for key in keys:
+                counter[key] += sign
+                if counter[key] == 0:
+                    del counter[key]
+
+
+def _incident_contribution(row: Dict[str, Any]) -> Dict[str, List[Any]]:
+    risks = sorted(distinct_items(row.get("risk_cats")), key=str)
+    quarter = quarter_key(row)
+    return {
+        "risk": risks,
+        "origin": distinct_items(row.get("actors_origin")),
+        "quarter": [quarter] if quarter else [],
+        "quarter_risk": [(quarter, risk) for risk in risks] if quarter else [],
+        "pair": [(a, b) for i, a in enumerate(risks) for b in risks[i + 1:]],
+    }
+
+
+def _benchmark_contribution(row: Dict[str, Any]) -> Dict[str, List[Any]]:
+    return {
+        "risk": distinct_items(row.get("risk_cats")),
+        "open": [True] if row.get("availability") == "Open" else [],
+    }
+
+
+def _eval_contribution(row: Dict[str, Any]) -> Dict[str, List[Any]]:
+    return {
+        "risk": distinct_items(row.get("risk_cats")),
+        "model": distinct_items(row.get("models")),
+        "organization": distinct_items(row.get("organizations")),
+        "reviewed": [True] if row.get("reviewed") else [],
+    }
+
+
+_CONTRIBUTIONS = {
+    "incidents": _incident_contribution,
+    "benchmarks": _benchmark_contribution,
+    "evals": _eval_contribution,
+}
+
+
+class RiskAnalyzer:
+    """Incrementally maintained risk analytics over a ``DataAccessor``.
+
+    With ``auto_refresh`` every report first pulls the rows changed since
+    the previous one; otherwise call ``refresh`` explicitly. Rows are
+    fetched without holding the analyzer's lock, so reports are not blocked
+    by a refresh in progress.
+    """
+
+    def __init__(
+        self,
+        accessor: Any,
+        change_columns: Optional[Dict[str, str]] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        auto_refresh: bool = True,
+        full_interval: Optional[float] = DEFAULT_FULL_INTERVAL,
+    ):
+        self.accessor = accessor
+        self.change_columns = change_columns or {}
+        self.page_size = page_size
+        self.auto_refresh = auto_refresh
+        self._lock = threading.RLock()
+        self._aggregates = {table: _Aggregates() for table in FIELDS}
+        self._contributions: Dict[str, Dict[str, Dict[str, List[Any]]]] = {
+            table: {} for table in FIELDS
+        }
+        self._feeds = {
+            table: ChangeFeed(self.change_columns.get(table), full_interval) for table in FIELDS
+        }
+        self.refreshed_at: Optional[datetime] = None
+
+    # -- maintenance -----------------------------------------------------
+
+    def apply_rows(self, table: str, rows: Iterable[Dict[str, Any]]) -> int:
+        """Add new rows or replace changed ones in the aggregates."""
+        contribute = _CONTRIBUTIONS[table]
+        aggregates = self._aggregates[table]
+        known = self._contributions[table]
+        applied = 0
+        with self._lock:
+            for row in rows:
+                row_id = row["id"]
+                previous = known.get(row_id)
+                if previous is not None:
+                    aggregates.update(previous, -1)
+                contribution = contribute(row)
+                aggregates.update(contribution, +1)
+                known[row_id] = contribution
+                applied += 1
+        return applied
+
+    def remove_rows(self, table: str, ids: Iterable[Any]) -> int:
+        """Subtract deleted rows from the aggregates."""
+        known = self._contributions[table]
+        removed = 0
+        with self._lock:
+            for row_id in ids:
+                previous = known.pop(row_id, None)
+                if previous is not None:
+                    self._aggregates[table].update(previous, -1)
+                    removed += 1
+        return removed
+
+    def _known_ids(self, table: str) -> List[Any]:
+        with self._lock:
+            return list(self._contributions[table])
+
+    def refresh(self, tables: Sequence[str] = tuple(FIELDS), full: bool = False) -> Dict[str, int]:
+        """Pull rows changed since the last refresh; rows applied per table.
+
+        ``full`` recounts the tables from scratch, dropping deleted rows.
+        """
+        applied = {table: self._refresh_table(table, full) for table in tables}
+        with self._lock:
+            self.refreshed_at = datetime.now(timezone.utc)
+        return applied
+
+    def _refresh_table(self, table: str, full: bool) -> int:
+        table_accessor = getattr(self.accessor, table)
+        feed = self._feeds[table]
+        applied, _ = feed.pull_from(
+            table_accessor,
+            FIELDS[table],
+            apply=lambda rows: self.apply_rows(table, rows),
+            remove=lambda ids: self.remove_rows(table, ids),
+            known_ids=lambda: self._known_ids(table),
+            page_size=self.page_size,
+            full=full,
+        )
+        return applied
+
+    def _current(self) -> None:
+        if self.auto_refresh:
+            self.refresh()
+
+    # -- reports ---------------------------------------------------------
+
+    def analyze_incident_trends(self) -> Dict[str, Any]:
+        """Incident totals and distributions by risk, origin and quarter."""
+        self._current()
+        with self._lock:
+            incidents = self._aggregates["incidents"]
+            quarters = incidents.counter("quarter")
+            return {
+                "total_incidents": incidents.total,
+                "risk_category_distribution": _ranked(incidents.counter("risk")),
+                "top_actor_origins": _ranked(incidents.counter("origin")),
+                "incidents_by_quarter": {
+                    _quarter_label(key): quarters[key] for key in sorted(quarters)
+                },
+            }
+
+    def analyze_benchmark_coverage(self) -> Dict[str, Any]:
+        """Benchmark totals, openness and risk coverage."""
+        self._current()
+        with self._lock:
+            benchmarks = self._aggregates["benchmarks"]
+            open_count = benchmarks.counter("open")[True]
+            return {
+                "total_benchmarks": benchmarks.total,
+                "open_source_count": open_count,
+                "open_source_percentage": (
+                    open_count / benchmarks.total * 100 if benchmarks.total else 0.0
+                ),
+                "risk_category_coverage": _ranked(benchmarks.counter("risk")),
+            }
+
+    def analyze_evaluation_landscape(self) -> Dict[str, Any]:
+        """Evaluation totals and the most evaluated models and organizations."""
+        self._current()
+        with self._lock:
+            evals = self._aggregates["evals"]
+            return {
+                "total_evaluations": evals.total,
+                "reviewed_count": evals.counter("reviewed")[True],
+                "most_evaluated_models": _ranked(evals.counter("model")),
+                "top_organizations": _ranked(evals.counter("organization")),
+                "risk_category_distribution": _ranked(evals.counter("risk")),
+            }
+
+    def find_risk_correlations(self, gap_ratio: float = 0.1) -> Dict[str, Any]:
+        """Coverage per risk across tables, coverage gaps and risk co-occurrence.
+
+        A risk is a gap when its benchmarks plus evaluations are fewer than
+        ``gap_ratio`` times its incidents. ``correlations`` holds the phi
+        coefficient of each pair of incident risk categories.
+        """
+        self._current()
+        with self._lock:
+            incidents = self._aggregates["incidents"]
+            risk_incidents = incidents.counter("risk")
+            risk_benchmarks = self._aggregates["benchmarks"].counter("risk")
+            risk_evals = self._aggregates["evals"].counter("risk")
+            pairs = incidents.counter("pair")
+            total = incidents.total
+
+            coverage = {
+                risk: {
+                    "incidents": risk_incidents[risk],
+                    "benchmarks": risk_benchmarks[risk],
+                    "evaluations": risk_evals[risk],
+                }
+                for risk in set(risk_incidents) | set(risk_benchmarks) | set(risk_evals)
+            }
+            most_covered = sorted(
+                coverage.items(), key=lambda item: sum(item[1].values()), reverse=True
+            )
+            gaps = [
+                f"{risk}: {data['incidents']} incidents, {data['benchmarks']} benchmarks, "
+                f"{data['evaluations']} evaluations"
+                for risk, data in sorted(
+                    coverage.items(), key=lambda item: item[1]["incidents"], reverse=True
+                )
+                if data["incidents"]
+                and data["benchmarks"] + data["evaluations"] < gap_ratio * data["incidents"]
+            ]
+
+            correlations = {}
+            for (a, b), both in pairs.items():
+                na, nb = risk_incidents[a], risk_incidents[b]
+                denominator = math.sqrt(na * (total - na) * nb * (total - nb))
+                if denominator:
+                    correlations[f"{a} + {b}"] = (total * both - na * nb) / denominator
+
+            return {
+                "most_covered_risks": most_covered,
+                "gaps": gaps,
+                "co_occurrence": {f"{a} + {b}": n for (a, b), n in pairs.most_common()},
+                "correlations": dict(
+                    sorted(correlations.items(), key=lambda item: item[1], reverse=True)
+                ),
+            }
+
+    def identify_emerging_risks(self, window: int = 2) -> Dict[str, Any]:
+        """Risk categories in the latest ``window`` quarters and their growth.
+
+        Growth compares the latest window with the ``window`` quarters before
+        it; a risk absent from the earlier window has growth ``None``.
+        """
+        self._current()
+        with self._lock:
+            incidents = self._aggregates["incidents"]
+            quarters = sorted(incidents.counter("quarter"))
+            recent_quarters = quarters[-window:]
+            previous_quarters = quarters[-2 * window:-window] if len(quarters) > window else []
+            by_quarter_risk = incidents.counter("quarter_risk")
+
+            def window_counts(keys: List[Tuple[int, int]]) -> Counter:
+                selected = set(keys)
+                counts: Counter = Counter()
+                for (quarter, risk), count in by_quarter_risk.items():
+                    if quarter in selected:
+                        counts[risk] += count
+                return counts
+
+            recent = window_counts(recent_quarters)
+            previous = window_counts(previous_quarters)
+            growth = {
+                risk: (count / previous[risk] if previous[risk] else None)
+                for risk, count in recent.most_common()
+            }
+            return {
+                "window": [_quarter_label(key) for key in recent_quarters],
+                "previous_window": [_quarter_label(key) for key in previous_quarters],
+                "recent_risk_categories": _ranked(recent),
+                "growth": growth,
+                "new_risk_categories": [risk for risk in recent if not previous[risk]],
+            }
+
+
+class SimpleRecommender:
+    """Turns a ``RiskAnalyzer``'s coverage figures into research priorities."""
+
+    def __init__(self, analyzer: RiskAnalyzer):
+        self.analyzer = analyzer
+
+    def recommend_research_priorities(self, limit: int = 10) -> Dict[str, Any]:
+        """Risks ranked by incidents per benchmark or evaluation covering them."""
+        correlations = self.analyzer.find_risk_correlations()
+        emerging = self.analyzer.identify_emerging_risks()
+        growth = emerging["growth"]
+
+        priorities = []
+        for risk, data in correlations["most_covered_risks"]:
+            if not data["incidents"]:
+                continue
+            coverage = data["benchmarks"] + data["evaluations"]
+            pressure = data["incidents"] / (1 + coverage)
+            rising = risk in emerging["new_risk_categories"] or (growth.get(risk) or 0) > 1
+            if coverage == 0:
+                priority = "High"
+                reason = f"{data['incidents']} incidents and no benchmarks or evaluations"
+            elif pressure >= 5 or rising:
+                priority = "High" if pressure >= 5 else "Medium"
+                reason = f"{data['incidents']} incidents against {coverage} benchmarks/evaluations"
+                if rising:
+                    reason += ", and rising"
+            else:
+                priority = "Low"
+                reason = f"covered by {coverage} benchmarks/evaluations"
+            priorities.append({
+                "risk_category": risk,
+                "priority": priority,
+                "reason": reason,
+                "score": pressure,
+            })
+
+        rank = {"High": 0, "Medium": 1, "Low": 2}
+        priorities.sort(key=lambda item: (rank[item["priority"]], -item["score"]))
+        return {"research_priorities": priorities[:limit]}
+
+
+class DataExporter:
+    """Formats analysis results for sharing."""
+
+    @staticmethod
+    def to_json(results: Dict[str, Any]) -> str:
+        return json.dumps(results, indent=2, default=str)
+
+    @staticmethod
+    def to_markdown_report(results: Dict[str, Any], top: int = 10) -> str:
+        """Markdown report of the results built in ``examples/advanced_analysis.py``."""
+        lines = [
+            "# AIRE Risk Analysis Report",
+            "",
+            f"_Generated {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}_",
+        ]
+
+        def table(title: str, header: Tuple[str, str], counts: Dict[Any, Any]) -> None:
+            if not counts:
+                return
+            lines.extend(["", f"### {title}", "", f"| {header[0]} | {header[1]} |", "|---|---|"])
+            for key, value in list(counts.items())[:top]:
+                lines.append(f"| {key} | {value} |")
+
+        incidents = results.get("incident_trends")
+        if incidents:
+            lines.extend(["", "## Incidents", "", f"Total incidents: {incidents['total_incidents']}"])
+            table("Risk categories", ("Risk", "Incidents"), incidents["risk_category_distribution"])
+            table("Actor origins", ("Origin", "Incidents"), incidents["top_actor_origins"])
+
+        benchmarks = results.get("benchmark_coverage")
+        if benchmarks:
+            lines.extend([
+                "", "## Benchmarks", "",
+                f"Total benchmarks: {benchmarks['total_benchmarks']} "
+                f"({benchmarks['open_source_count']} open source, "
+                f"{benchmarks['open_source_percentage']:.1f}%)",
+            ])
+            table("Risk coverage", ("Risk", "Benchmarks"), benchmarks["risk_category_coverage"])
+
+        evals = results.get("evaluation_landscape")
+        if evals:
+            lines.extend([
+                "", "## Evaluations", "",
+                f"Total evaluations: {evals['total_evaluations']} "
+                f"({evals['reviewed_count']} reviewed)",
+            ])
+            table("Most evaluated models", ("Model", "Evaluations"), evals["most_evaluated_models"])
+
+        correlations = results.get("risk_correlations")
+        if correlations:
+            lines.extend([
+                "", "## Risk coverage", "",
+                "| Risk | Incidents | Benchmarks | Evaluations |", "|---|---|---|---|",
+            ])
+            for risk, data in correlations["most_covered_risks"][:top]:
+                lines.append(
+                    f"| {risk} | {data['incidents']} | {data['benchmarks']} | {data['evaluations']} |"
+                )
+            if correlations["gaps"]:
+                lines.extend(["", "### Coverage gaps", ""])
+                lines.extend(f"- {gap}" for gap in correlations["gaps"][:top])
+
+        emerging = results.get("emerging_risks")
+        if emerging:
+            lines.extend(["", "## Emerging risks", ""])
+            if emerging.get("window"):
+                lines.append(f"Window: {', '.join(emerging['window'])}")
+            table("Recent risk categories", ("Risk", "Incidents"), emerging["recent_risk_categories"])
+
+        recommendations = results.get("recommendations")
+        if recommendations:
+            lines.extend(["", "## Research priorities", ""])
+            for item in recommendations["research_priorities"]:
+                lines.append(f"- **{item['risk_category']}** [{item['priority']}]: {item['reason']}")
+
+        return "\n".join(lines) + "\n"
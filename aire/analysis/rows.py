@@ -0,0 +1,51 @@
+"""Reading the fields the analysis modules aggregate on.
+
+``RiskAnalyzer`` and ``IncidentCube`` count rows by array values
+(``risk_cats``, ``actors_origin`` ...) and by time period. These helpers
+read those fields the same way for both, so their counts agree.
+"""
+
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+_QUARTER = re.compile(r"Q([1-4])\s+(\d{4})")
+
+
+def distinct_items(value: Any) -> List[Any]:
+    """Values of an array column without repeats; a scalar is a one-item list."""
+    if not value:
+        return []
+    if isinstance(value, (list, tuple, set)):
+        return list(dict.fromkeys(value))
+    return [value]
+
+
+def year_month(value: Any) -> Optional[Tuple[int, int]]:
+    """``(year, month)`` of an ISO date, timestamp or ``YYYY-MM`` string."""
+    text = str(value)[:10]
+    if len(text) == 7:
+        text += "-01"
+    try:
+        day = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    return day.year, day.month
+
+
+def quarter_key(row: Dict[str, Any]) -> Optional[Tuple[int, int]]:
+    """``(year, quarter)`` of an incident from ``quarter`` or ``reporting_date``."""
+    match = _QUARTER.search(row.get("quarter") or "")
+    if match:
+        return int(match.group(2)), int(match.group(1))
+    reported = row.get("reporting_date")
+    month = year_month(reported) if reported else None
+    if month is None:
+        return None
+    return month[0], (month[1] - 1) // 3 + 1
+
+
+def month_key(row: Dict[str, Any]) -> Optional[Tuple[int, int]]:
+    """``(year, month)`` of an incident from ``reporting_date``."""
+    reported = row.get("reporting_date")
+    return year_month(reported) if reported else None
@@ -0,0 +1,487 @@
+"""TF-IDF similarity between incidents, benchmarks and evaluations.
+
+``SimilarityIndex`` fits one TF-IDF vocabulary over the text of all three
+tables, keeps each table as a sparse matrix in that space and answers
+"which benchmarks and evals are most relevant to this incident?" with a
+cosine nearest-neighbour search, without refitting on each call:
+
+    index = SimilarityIndex("data/similarity")
+    index.update_from(accessor)           # fit once, then only changed rows
+    index.save()
+    index = SimilarityIndex.load("data/similarity")   # in another process
+    index.related("incidents", incident_id, k=5)
+    # {"benchmarks": [SimilarityHit(id=..., score=0.41), ...], "evals": [...]}
+    index.related_rows(accessor, "incidents", incident_id, target="benchmarks")
+
+Changed rows are found with a ``ChangeFeed`` per table (see
+``aire.data.changes``), transformed with the fitted vectorizer and appended
+as one new segment per table, while replaced and deleted rows are only
+marked dead; segments are merged once ``COMPACT_SEGMENTS`` pile up or
+``COMPACT_DEAD_RATIO`` of the rows are dead, so an update costs the size of
+the change rather than of the corpus. Searches are a sparse product of the
+query with each segment, so nothing is refitted either. Words unseen at fit
+time are ignored until ``fit`` is run again (``stale_ratio`` tells how much
+of the corpus arrived after the last fit). A corpus too small for the
+vectorizer's ``min_df``/``max_df`` is fitted keeping every term.
+The vectorizer is stored with joblib and the matrices as ``.npz`` files;
+``manifest.json`` is replaced last, so a reader never sees a half-saved index.
+"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import joblib
+import numpy as np
+import scipy.sparse as sp
+import sklearn
+from sklearn.base import clone
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+from ..data.changes import DEFAULT_FULL_INTERVAL, ChangeFeed
+from ..data.manifests import read_manifest, write_manifest
+from ..data.pagination import DEFAULT_PAGE_SIZE
+from ..data.projections import Columns
+from ..data.search import SEARCH_FIELDS
+
+DEFAULT_SIMILARITY_DIR = os.path.join("data", "similarity")
+SIMILARITY_FORMAT = "tfidf-similarity"
+SIMILARITY_FORMAT_VERSION = 2
+TABLES = ("incidents", "benchmarks", "evals")
+TEXT_FIELDS: Dict[str, Tuple[str, ...]] = {table: SEARCH_FIELDS[table] for table in TABLES}
+COMPACT_SEGMENTS = 16
+COMPACT_DEAD_RATIO = 0.25
+
+
+@dataclass
+class SimilarityHit:
+    """One related row; ``score`` is the cosine similarity in [0, 1]."""
+
+    id: Any
+    score: float
+
+
+def default_vectorizer() -> TfidfVectorizer:
+    return TfidfVectorizer(
+        stop_words="english",
+        ngram_range=(1, 2),
+        min_df=2,
+        max_df=0.5,
+        max_features=200_000,
+        sublinear_tf=True,
+        dtype=np.float32,
+    )
+
+
+def _manifest_files(manifest: Dict[str, Any]) -> set:
+    names = set(manifest.get("files", {}).values())
+    for entry in manifest.get("tables", {}).values():
+        names.update((entry["matrix"], entry["ids"]))
+    return names
+
+
+class _TableMatrix:
+    """Rows of one table in the fitted TF-IDF space, with their ids.
+
+    Rows are L2-normalized and kept in appended segments; ``ids`` and the
+    ``live`` mask cover every position, dead ones included, and
+    ``positions`` maps each live id to its position.
+    """
+
+    def __init__(self, matrix: Any, ids: List[Any]):
+        self._reset(normalize(matrix.tocsr()), list(ids))
+
+    def _reset(self, matrix: Any, ids: List[Any]) -> None:
+        self.width = matrix.shape[1]
+        self.segments: List[Any] = [matrix] if ids else []
+        self.starts: List[int] = [0] if ids else []
+        self.ids = ids
+        self.positions = {row_id: i for i, row_id in enumerate(ids)}
+        self._live = np.ones(len(ids), dtype=bool)
+        self.dead = 0
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    @property
+    def live(self) -> np.ndarray:
+        return self._live[: len(self.ids)]
+
+    @property
+    def matrix(self) -> Any:
+        """All positions as one CSR matrix."""
+        if not self.segments:
+            return sp.csr_matrix((0, self.width), dtype=np.float32)
+        if len(self.segments) == 1:
+            return self.segments[0]
+        return sp.vstack(self.segments, format="csr")
+
+    def row(self, position: int) -> Any:
+        segment = bisect_right(self.starts, position) - 1
+        return self.segments[segment][position - self.starts[segment]]
+
+    def discard(self, ids: Iterable[Any]) -> int:
+        """Mark the rows of ``ids`` dead; returns how many were live."""
+        dropped = 0
+        for row_id in ids:
+            position = self.positions.pop(row_id, None)
+            if position is not None:
+                self._live[position] = False
+                dropped += 1
+        self.dead += dropped
+        return dropped
+
+    def append(self, matrix: Any, ids: List[Any]) -> None:
+        """Add rows (whose ids are not live) as a new segment."""
+        start, end = len(self.ids), len(self.ids) + len(ids)
+        if end > len(self._live):
+            grown = np.zeros(max(2 * len(self._live), end), dtype=bool)
+            grown[:start] = self.live
+            self._live = grown
+        self._live[start:end] = True
+        self.segments.append(normalize(matrix.tocsr()))
+        self.starts.append(start)
+        self.ids.extend(ids)
+        self.positions.update((row_id, start + i) for i, row_id in enumerate(ids))
+        if len(self.segments) > COMPACT_SEGMENTS or self.dead > COMPACT_DEAD_RATIO * end:
+            self.compact()
+
+    def compact(self) -> None:
+        """Merge the segments into one and drop dead rows."""
+        if len(self.segments) <= 1 and not self.dead:
+            return
+        keep = np.flatnonzero(self.live)
+        self._reset(self.matrix[keep], [self.ids[i] for i in keep])
+
+    def scores(self, vector: Any) -> np.ndarray:
+        """Cosine similarity of a normalized row vector with every position; dead ones get -1."""
+        scores = np.concatenate(
+            [(segment @ vector.T).toarray().ravel() for segment in self.segments]
+        ) if self.segments else np.zeros(0, dtype=np.float32)
+        scores[~self.live] = -1.0
+        return scores
+
+
+class SimilarityIndex:
+    """Persisted TF-IDF vectors and nearest-neighbour search over several tables.
+
+    ``change_columns`` (e.g. ``{"incidents": "updated_at"}``) and
+    ``full_interval`` control how ``update_from`` finds edited and deleted
+    rows.
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_SIMILARITY_DIR,
+        vectorizer: Optional[TfidfVectorizer] = None,
+        tables: Sequence[str] = TABLES,
+        change_columns: Optional[Dict[str, str]] = None,
+        full_interval: Optional[float] = DEFAULT_FULL_INTERVAL,
+    ):
+        self.directory = directory
+        self.vectorizer = vectorizer or default_vectorizer()
+        self.tables = tuple(tables)
+        self.fitted = False
+        self.fitted_rows = 0
+        self._lock = threading.RLock()
+        self._matrices: Dict[str, _TableMatrix] = {}
+        change_columns = change_columns or {}
+        self._feeds = {
+            table: ChangeFeed(change_columns.get(table), full_interval) for table in self.tables
+        }
+
+    def __len__(self) -> int:
+        return sum(len(m) for m in self._matrices.values())
+
+    def text(self, table: str, row: Dict[str, Any]) -> str:
+        return " ".join(str(row.get(field) or "") for field in TEXT_FIELDS[table])
+
+    @property
+    def stale_ratio(self) -> float:
+        """Rows added since the last ``fit``, relative to the rows it saw."""
+        return (len(self) - self.fitted_rows) / self.fitted_rows if self.fitted_rows else 0.0
+
+    # -- building --------------------------------------------------------
+
+    def fit(self, rows: Dict[str, Sequence[Dict[str, Any]]]) -> None:
+        """Fit the vocabulary on ``rows`` (by table) and replace all vectors.
+
+        If ``min_df``/``max_df`` leave no terms, as on a corpus of a few
+        rows, the vocabulary keeps every term instead.
+        """
+        texts = {
+            table: [self.text(table, row) for row in rows.get(table, ())]
+            for table in self.tables
+        }
+        corpus = [text for table in self.tables for text in texts[table]]
+        if not corpus:
+            raise ValueError("Cannot fit a similarity index without rows")
+        vectorizer = clone(self.vectorizer)
+        try:
+            vectorizer.fit(corpus)
+        except ValueError:
+            params = vectorizer.get_params()
+            vectorizer.set_params(min_df=1, max_df=1.0).fit(corpus)
+            # Only fit reads the thresholds; keep them for the next refit.
+            vectorizer.set_params(min_df=params["min_df"], max_df=params["max_df"])
+        with self._lock:
+            self.vectorizer = vectorizer
+            matrices = {}
+            for table in self.tables:
+                ids = [row["id"] for row in rows.get(table, ())]
+                matrices[table] = _TableMatrix(self._transform(texts[table]), ids)
+            self._matrices = matrices
+            self.fitted = True
+            self.fitted_rows = len(corpus)
+
+    def _transform(self, texts: List[str]) -> Any:
+        if not texts:
+            return sp.csr_matrix((0, len(self.vectorizer.vocabulary_)), dtype=np.float32)
+        return self.vectorizer.transform(texts)
+
+    def add(self, table: str, rows: Iterable[Dict[str, Any]]) -> int:
+        """Vectorize ``rows`` with the fitted vocabulary and append them in one batch.
+
+        Rows already indexed under the same id are replaced.
+        """
+        return self.update(table, rows)[0]
+
+    def remove(self, table: str, ids: Iterable[Any]) -> int:
+        """Drop rows of ``table`` from the index."""
+        return self.update(table, removed=ids)[1]
+
+    def update(
+        self,
+        table: str,
+        rows: Iterable[Dict[str, Any]] = (),
+        removed: Iterable[Any] = (),
+    ) -> Tuple[int, int]:
+        """Replace or append ``rows`` and drop ``removed`` ids.
+
+        The rows are appended as one segment and the rows they replace
+        marked dead, so the cost follows the size of the change. Returns
+        ``(added, removed)``.
+        """
+        rows = list({row["id"]: row for row in rows}.values())
+        if rows and not self.fitted:
+            raise RuntimeError("Call fit (or update_from) before adding rows")
+        vectors = self._transform([self.text(table, row) for row in rows]) if rows else None
+        with self._lock:
+            current = self._matrices.get(table)
+            if current is None:
+                if rows:
+                    raise KeyError(f"{table!r} is not indexed")
+                return 0, 0
+            new_ids = [row["id"] for row in rows]
+            replacing = set(new_ids)
+            dropped = current.discard(row_id for row_id in removed if row_id not in replacing)
+            if rows:
+                current.discard(new_ids)
+                current.append(vectors, new_ids)
+        return len(rows), dropped
+
+    def _changes(
+        self, accessor: Any, table: str, page_size: int, full: bool
+    ) -> Tuple[List[Dict[str, Any]], List[Any]]:
+        """Rows of ``table`` changed since the last update, and ids deleted since."""
+        table_accessor = getattr(accessor, table)
+        feed = self._feeds[table]
+        rows: List[Dict[str, Any]] = []
+        deleted: List[Any] = []
+
+        def collect(batch: List[Dict[str, Any]]) -> int:
+            rows.extend(batch)
+            return len(batch)
+
+        def known_ids() -> List[Any]:
+            with self._lock:
+                current = self._matrices.get(table)
+                return list(current.positions) if current else []
+
+        feed.pull_from(
+            table_accessor,
+            ("id",) + TEXT_FIELDS[table],
+            apply=collect,
+            remove=lambda ids: deleted.extend(ids) or len(ids),
+            known_ids=known_ids,
+            page_size=page_size,
+            full=full,
+        )
+        return rows, deleted
+
+    def update_from(
+        self, accessor: Any, page_size: int = DEFAULT_PAGE_SIZE, full: bool = False
+    ) -> Dict[str, int]:
+        """Bring the index up to date with a ``DataAccessor``; rows added per table.
+
+        The first call fits on everything; later calls only transfer and
+        vectorize the rows that changed, and drop deleted ones when a full
+        pass is due (or ``full`` is given). If applying the changes fails,
+        the next call fetches them again.
+        """
+        states = {table: feed.state() for table, feed in self._feeds.items()}
+        try:
+            if not self.fitted:
+                rows = {
+                    table: self._changes(accessor, table, page_size, full=True)[0]
+                    for table in self.tables
+                }
+                self.fit(rows)
+                return {table: len(table_rows) for table, table_rows in rows.items()}
+
+            added = {}
+            for table in self.tables:
+                rows, deleted = self._changes(accessor, table, page_size, full)
+                added[table] = self.update(table, rows, deleted)[0]
+            return added
+        except BaseException:
+            for table, state in states.items():
+                self._feeds[table].restore(state)
+            raise
+
+    # -- queries ---------------------------------------------------------
+
+    def _search(
+        self, vector: Any, target: str, k: int, exclude: Any = None
+    ) -> List[SimilarityHit]:
+        current = self._matrices.get(target)
+        if current is None or not len(current) or k <= 0:
+            return []
+        if not vector.nnz:
+            return []
+        scores = current.scores(normalize(vector))
+        n = min(k + (exclude is not None), len(scores))
+        top = np.argpartition(-scores, n - 1)[:n]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        hits = [
+            SimilarityHit(id=current.ids[position], score=min(float(scores[position]), 1.0))
+            for position in top.tolist()
+            if scores[position] > 0 and current.ids[position] != exclude
+        ]
+        return hits[:k]
+
+    def related(
+        self,
+        table: str,
+        row_id: Any,
+        targets: Optional[Sequence[str]] = None,
+        k: int = 10,
+    ) -> Dict[str, List[SimilarityHit]]:
+        """Top ``k`` rows of each target table most similar to an indexed row."""
+        with self._lock:
+            current = self._matrices.get(table)
+            if current is None or row_id not in current.positions:
+                raise KeyError(f"{row_id!r} is not indexed in {table!r}")
+            vector = current.row(current.positions[row_id])
+            targets = targets or [t for t in self.tables if t != table]
+            return {
+                target: self._search(vector, target, k, row_id if target == table else None)
+                for target in targets
+            }
+
+    def similar_to_text(self, text: str, target: str, k: int = 10) -> List[SimilarityHit]:
+        """Top ``k`` rows of ``target`` most similar to free text."""
+        if not self.fitted:
+            raise RuntimeError("Call fit (or update_from) before searching")
+        vector = self.vectorizer.transform([text])
+        with self._lock:
+            return self._search(vector, target, k)
+
+    def related_rows(
+        self,
+        accessor: Any,
+        table: str,
+        row_id: Any,
+        target: str,
+        k: int = 10,
+        columns: Columns = None,
+    ) -> List[Dict[str, Any]]:
+        """Fetch the related rows of ``target`` in score order in one batch."""
+        hits = self.related(table, row_id, [target], k)[target]
+        rows = getattr(accessor, target).get_many_by_id([hit.id for hit in hits], columns)
+        return [rows[hit.id] for hit in hits if hit.id in rows]
+
+    # -- persistence -----------------------------------------------------
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.directory, "manifest.json")
+
+    def save(self) -> None:
+        """Write the vectorizer, matrices and ids; the manifest is swapped in last."""
+        if not self.fitted:
+            raise RuntimeError("Nothing to save; the index is not fitted")
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock:
+            stamp = f"{time.time_ns()}"
+            files = {"vectorizer": f"vectorizer-{stamp}.joblib"}
+            joblib.dump(self.vectorizer, os.path.join(self.directory, files["vectorizer"]))
+            tables = {}
+            for table, current in self._matrices.items():
+                current.compact()
+                matrix_file, ids_file = f"{table}-{stamp}.npz", f"{table}-{stamp}.ids.json"
+                path = os.path.join(self.directory, matrix_file)
+                sp.save_npz(path, current.matrix, compressed=False)
+                with open(os.path.join(self.directory, ids_file), "w") as handle:
+                    json.dump({"ids": current.ids, "feed": self._feeds[table].state()}, handle)
+                tables[table] = {"matrix": matrix_file, "ids": ids_file, "rows": len(current.ids)}
+            manifest = {
+                "format": SIMILARITY_FORMAT,
+                "version": SIMILARITY_FORMAT_VERSION,
+                "sklearn": sklearn.__version__,
+                "saved_at": time.time(),
+                "fitted_rows": self.fitted_rows,
+                "files": files,
+                "tables": tables,
+            }
+        previous = self._read_manifest(self.directory)
+        write_manifest(self.manifest_path, manifest)
+        # Keep the previous files for readers that opened the old manifest.
+        self._prune(_manifest_files(manifest) | _manifest_files(previous))
+
+    def _prune(self, keep: set) -> None:
+        for name in os.listdir(self.directory):
+            if name.endswith((".joblib", ".npz", ".ids.json")) and name not in keep:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+
+    @staticmethod
+    def _read_manifest(directory: str) -> Dict[str, Any]:
+        return read_manifest(
+            os.path.join(directory, "manifest.json"),
+            format=SIMILARITY_FORMAT,
+            version=SIMILARITY_FORMAT_VERSION,
+        )
+
+    @classmethod
+    def load(
+        cls,
+        directory: str = DEFAULT_SIMILARITY_DIR,
+        change_columns: Optional[Dict[str, str]] = None,
+        full_interval: Optional[float] = DEFAULT_FULL_INTERVAL,
+    ) -> "SimilarityIndex":
+        """Open a saved index; nothing is refitted."""
+        manifest = cls._read_manifest(directory)
+        if not manifest:
+            raise FileNotFoundError(f"No similarity index in {directory!r}")
+        vectorizer = joblib.load(os.path.join(directory, manifest["files"]["vectorizer"]))
+        index = cls(
+            directory, vectorizer, tuple(manifest["tables"]), change_columns, full_interval
+        )
+        for table, entry in manifest["tables"].items():
+            with open(os.path.join(directory, entry["ids"])) as handle:
+                saved = json.load(handle)
+            matrix = sp.load_npz(os.path.join(directory, entry["matrix"]))
+            current = _TableMatrix(matrix, saved["ids"])
+            index._feeds[table].restore(saved["feed"])
+            index._matrices[table] = current
+        index.fitted = True
+        index.fitted_rows = manifest["fitted_rows"]
+        return index
@@ -1,209 +1,667 @@
 """Data accessor classes for querying Supabase tables."""
 
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Iterator, List, Dict, Any, Optional, Sequence
 from datetime import datetime
+from .batch import LookupResult, chunk_keys, collect_lookup
+from .cache import QueryCache, query_key
+from .coalesce import SingleFlight
+from .escaping import contains_pattern, quote_value
+from .pagination import DEFAULT_PAGE_SIZE, iter_keyset
+from .projections import Columns, select_columns
+from .query import QUERY_CLASSES, Query
+from .records import records_response, to_records
 from .storage.database import SupabaseDB
+from .storage.replica import DEFAULT_REPLICA_PATH, ReplicaDB
 
+if TYPE_CHECKING:
+    from .dedup import DuplicateIndex
+    from .search import SearchIndex
 
-class IncidentAccessor:
-    """Accessor for AI incidents data."""
 
-    def __init__(self, db: SupabaseDB):
+class BaseAccessor:
+    """Shared plumbing for the per-table accessors."""
+
+    table: str = ""
+
+    def __init__(
+        self,
+        db: SupabaseDB,
+        cache: Optional[QueryCache] = None,
+        records: bool = False,
+        coalescer: Optional[SingleFlight] = None,
+    ):
         self.db = db
+        self.cache = cache
+        self.records = records
+        self.coalescer = coalescer
+
+    def _query(self, columns: Columns = None, key: Optional[str] = None) -> Any:
+        """Start a select on this table with the given column projection."""
+        return self.db.table(self.table).select(select_columns(self.table, columns, key))
+
+    def query(self, columns: Columns = None) -> Query:
+        """Start a composable query that runs as a single request (see ``query.py``)."""
+        return QUERY_CLASSES[self.table](self, columns)
+
+    def _send(self, query: Any) -> Any:
+        """Execute a built query on the database, bypassing the cache.
+
+        With a ``coalescer`` identical concurrent queries share one request;
+        with ``records`` the rows come back as compact ``Record``s.
+        """
+        if self.coalescer is None:
+            return self._fetch(query)
+        return self.coalescer.do(query_key(self.table, query), lambda: self._fetch(query))
+
+    def send(self, query: Any) -> Any:
+        """Execute a built query on the database, bypassing the cache."""
+        return self._send(query)
+
+    def changes_query(self, columns: Sequence[str]) -> Any:
+        """Select of ``columns`` and ``id`` with no filter, ordering or limit.
+
+        ``ChangeFeed.pull_from`` pages through it with ``send``.
+        """
+        return self._query(columns, key="id")
+
+    def _fetch(self, query: Any) -> Any:
+        response = self.db.execute(query, self.table)
+        return records_response(self.table, response) if self.records else response
+
+    def _execute(self, query: Any) -> Any:
+        """Execute a built query, consulting the result cache if configured."""
+        if self.cache is None:
+            return self._send(query)
+        return self.cache.get_or_execute(self.table, query, self._send)
+
+    def _get_many(
+        self, column: str, keys: Sequence[Any], columns: Columns = None, max_workers: int = 4
+    ) -> LookupResult:
+        """Look up rows for many values of ``column`` in a few batched requests.
+
+        Keys are de-duplicated and split into URL-safe chunks that are fetched
+        concurrently with ``column=in.(...)`` filters.
+        """
+        unique_keys = list(dict.fromkeys(keys))
+        queries = [
+            self._query(columns, key=column).in_(column, chunk)
+            for chunk in chunk_keys(unique_keys)
+        ]
+        if len(queries) <= 1 or max_workers <= 1:
+            responses = [self._execute(query) for query in queries]
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(queries))) as executor:
+                responses = list(executor.map(self._execute, queries))
+        rows = (row for response in responses for row in response.data)
+        return collect_lookup(unique_keys, column, rows)
+
+    def get_many_by_id(
+        self, ids: Sequence[Any], columns: Columns = None, max_workers: int = 4
+    ) -> LookupResult:
+        """Get many rows by ID; ``missing`` lists ids with no row."""
+        return self._get_many("id", ids, columns, max_workers)
+
+    def get_columns(self, ids: Sequence[Any], columns: Columns = "full") -> Dict[Any, Dict[str, Any]]:
+        """Fetch ``columns`` for the given ids, keyed by id."""
+        return self.get_many_by_id(ids, columns).found
+
+    def to_frame(self, columns: Columns = None, page_size: int = DEFAULT_PAGE_SIZE) -> Any:
+        """Stream the whole table into a typed pandas DataFrame."""
+        from .frames import rows_to_frame
+
+        return rows_to_frame(self.table, self.iter_all(columns=columns, page_size=page_size))
+
+    def to_arrow(self, columns: Columns = None, page_size: int = DEFAULT_PAGE_SIZE) -> Any:
+        """Stream the whole table into an Arrow table (requires pyarrow)."""
+        from .frames import frame_to_arrow
+
+        return frame_to_arrow(self.table, self.to_frame(columns, page_size))
+
+    def hydrate(
+        self, rows: List[Dict[str, Any]], columns: Columns = "full"
+    ) -> List[Dict[str, Any]]:
+        """Fill in heavier columns for rows fetched with a narrow projection.
+
+        Returns new rows with the extra columns merged in, so a list view can
+        be fetched with ``columns="listing"`` and only the chosen rows
+        expanded later. The given rows are not modified (they may be shared
+        with the cache); ``Record`` rows come back as merged records.
+        """
+        extra = self.get_columns([row["id"] for row in rows], columns)
+        merged = []
+        for row in rows:
+            combined = {**row, **extra.get(row["id"], {})}
+            merged.append(combined if isinstance(row, dict) else to_records(self.table, [combined])[0])
+        return merged
+
+
+class IncidentAccessor(BaseAccessor):
+    """Accessor for AI incidents data."""
 
-    def get_all(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    table = "incidents"
+
+    def get_all(self, limit: Optional[int] = None, columns: Columns = None) -> List[Dict[str, Any]]:
         """Get all incidents."""
-        query = self.db.incidents.select("*")
+        query = self._query(columns)
         if limit:
             query = query.limit(limit)
-        return query.execute().data
+        return self._execute(query).data
+
+    def count(self) -> int:
+        """Count incidents on the server without transferring any rows."""
+        return self._execute(self.db.incidents.select("id", count="exact", head=True)).count or 0
 
-    def get_by_id(self, incident_id: str) -> Optional[Dict[str, Any]]:
+    def get_by_id(self, incident_id: str, columns: Columns = None) -> Optional[Dict[str, Any]]:
         """Get incident by ID."""
-        result = self.db.incidents.select("*").eq("id", incident_id).execute()
+        result = self._execute(self._query(columns).eq("id", incident_id))
         return result.data[0] if result.data else None
 
-    def get_by_risk_category(self, risk_cat: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
-        """Get incidents by risk category (e.g., 'Manipulation', 'Cyber Offense')."""
-        query = self.db.incidents.select("*").contains("risk_cats", [risk_cat])
+    def get_by_risk_category(
+        self,
+        risk_cat: str,
+        limit: Optional[int] = None,
+        columns: Columns = None,
+        duplicates: Optional["DuplicateIndex"] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get incidents by risk category (e.g., 'Manipulation', 'Cyber Offense').
+
+        With ``duplicates`` only the first report of each near-duplicate
+        cluster is returned (``limit`` applies before deduplication).
+        """
+        query = self._query(columns, key="id" if duplicates else None)
+        query = query.contains("risk_cats", [risk_cat])
         if limit:
             query = query.limit(limit)
-        return query.execute().data
+        rows = self._execute(query).data
+        return duplicates.deduplicate(rows) if duplicates else rows
 
-    def get_by_quarter(self, quarter: str) -> List[Dict[str, Any]]:
+    def get_by_quarter(self, quarter: str, columns: Columns = None) -> List[Dict[str, Any]]:
         """Get incidents by quarter (e.g., 'Q3 2025')."""
-        return self.db.incidents.select("*").eq("quarter", quarter).execute().data
+        return self._execute(self._query(columns).eq("quarter", quarter)).data
 
-    def get_by_actor_origin(self, origin: str) -> List[Dict[str, Any]]:
+    def get_by_actor_origin(self, origin: str, columns: Columns = None) -> List[Dict[str, Any]]:
         """Get incidents by actor origin country."""
-        return self.db.incidents.select("*").contains("actors_origin", [origin]).execute().data
-
-    def search_by_keyword(self, keyword: str) -> List[Dict[str, Any]]:
-        """Search incidents by keyword in headline or description."""
-        return self.db.incidents.select("*").or_(
-            f"headline.ilike.%{keyword}%,description.ilike.%{keyword}%"
-        ).execute().data
-
-    def get_recent(self, limit: int = 10) -> List[Dict[str, Any]]:
+        return self._execute(self._query(columns).contains("actors_origin", [origin])).data
+
+    def search_by_keyword(
+        self, keyword: str, columns: Columns = None, index: Optional["SearchIndex"] = None
+    ) -> List[Dict[str, Any]]:
+        """Search incidents by keyword in headline or description.
+
+        With a full-text ``index`` (see ``search.py``) the ids come from the
+        local index ranked by relevance and only the matching rows are
+        fetched; otherwise the table is scanned with ``ilike``.
+        """
+        if index is not None:
+            return index.search_rows(self, keyword, limit=None, columns=columns)
+        pattern = quote_value(contains_pattern(keyword))
+        query = self._query(columns).or_(
+            f"headline.ilike.{pattern},description.ilike.{pattern}"
+        )
+        return self._execute(query).data
+
+    def get_recent(self, limit: int = 10, columns: Columns = None) -> List[Dict[str, Any]]:
         """Get most recent incidents by reporting date."""
-        return self.db.incidents.select("*").order("reporting_date", desc=True).limit(limit).execute().data
-
-
-class BenchmarkAccessor:
+        query = self._query(columns).order("reporting_date", desc=True).limit(limit)
+        return self._execute(query).data
+
+    def iter_all(
+        self,
+        columns: Columns = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream all incidents page by page."""
+        return iter_keyset(
+            lambda: self._query(columns, key="id"),
+            page_size=page_size,
+            prefetch=prefetch,
+            execute=self._send,
+        )
+
+    def iter_by_risk_category(
+        self,
+        risk_cat: str,
+        columns: Columns = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream incidents by risk category page by page."""
+        return iter_keyset(
+            lambda: self._query(columns, key="id").contains("risk_cats", [risk_cat]),
+            page_size=page_size,
+            prefetch=prefetch,
+            execute=self._send,
+        )
+
+    def iter_by_quarter(
+        self,
+        quarter: str,
+        columns: Columns = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream incidents by quarter page by page."""
+        return iter_keyset(
+            lambda: self._query(columns, key="id").eq("quarter", quarter),
+            page_size=page_size,
+            prefetch=prefetch,
+            execute=self._send,
+        )
+
+    def iter_by_actor_origin(
+        self,
+        origin: str,
+        columns: Columns = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream incidents by actor origin country page by page."""
+        return iter_keyset(
+            lambda: self._query(columns, key="id").contains("actors_origin", [origin]),
+            page_size=page_size,
+            prefetch=prefetch,
+            execute=self._send,
+        )
+
+    def iter_search_by_keyword(
+        self,
+        keyword: str,
+        columns: Columns = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream incidents matching a keyword page by page."""
+        pattern = quote_value(contains_pattern(keyword))
+        return iter_keyset(
+            lambda: self._query(columns, key="id").or_(
+                f"headline.ilike.{pattern},description.ilike.{pattern}"
+            ),
+            page_size=page_size,
+            prefetch=prefetch,
+            execute=self._send,
+        )
+
+
+class BenchmarkAccessor(BaseAccessor):
     """Accessor for AI risk benchmarks."""
 
-    def __init__(self, db: SupabaseDB):
-        self.db = db
+    table = "benchmarks"
 
-    def get_all(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    def get_all(self, limit: Optional[int] = None, columns: Columns = None) -> List[Dict[str, Any]]:
         """Get all benchmarks."""
-        query = self.db.benchmarks.select("*")
+        query = self._query(columns)
         if limit:
             query = query.limit(limit)
-        return query.execute().data
+        return self._execute(query).data
 
-    def get_by_id(self, benchmark_id: str) -> Optional[Dict[str, Any]]:
+    def count(self) -> int:
+        """Count benchmarks on the server without transferring any rows."""
+        return self._execute(self.db.benchmarks.select("id", count="exact", head=True)).count or 0
+
+    def get_by_id(self, benchmark_id: str, columns: Columns = None) -> Optional[Dict[str, Any]]:
         """Get benchmark by ID."""
-        result = self.db.benchmarks.select("*").eq("id", benchmark_id).execute()
+        result = self._execute(self._query(columns).eq("id", benchmark_id))
         return result.data[0] if result.data else None
 
-    def get_by_name(self, benchmark_name: str) -> Optional[Dict[str, Any]]:
+    def get_by_name(self, benchmark_name: str, columns: Columns = None) -> Optional[Dict[str, Any]]:
         """Get benchmark by name (e.g., 'VCT', 'AttackSeqBench')."""
-        result = self.db.benchmarks.select("*").eq("benchmark", benchmark_name).execute()
+        result = self._execute(self._query(columns).eq("benchmark", benchmark_name))
         return result.data[0] if result.data else None
 
-    def get_by_risk_category(self, risk_cat: str) -> List[Dict[str, Any]]:
+    def get_many_by_name(
+        self, benchmark_names: Sequence[str], columns: Columns = None, max_workers: int = 4
+    ) -> LookupResult:
+        """Get many benchmarks by name in batched requests."""
+        return self._get_many("benchmark", benchmark_names, columns, max_workers)
+
+    def get_by_risk_category(self, risk_cat: str, columns: Columns = None) -> List[Dict[str, Any]]:
         """Get benchmarks by risk category."""
-        return self.db.benchmarks.select("*").contains("risk_cats", [risk_cat]).execute().data
+        return self._execute(self._query(columns).contains("risk_cats", [risk_cat])).data
 
-    def get_recent(self, limit: int = 10) -> List[Dict[str, Any]]:
+    def get_recent(self, limit: int = 10, columns: Columns = None) -> List[Dict[str, Any]]:
         """Get most recent benchmarks by publication date."""
-        return self.db.benchmarks.select("*").order("date", desc=True).limit(limit).execute().data
+        return self._execute(self._query(columns).order("date", desc=True).limit(limit)).data
 
-    def get_open_source(self) -> List[Dict[str, Any]]:
+    def get_open_source(self, columns: Columns = None) -> List[Dict[str, Any]]:
         """Get all open-source benchmarks."""
-        return self.db.benchmarks.select("*").eq("availability", "Open").execute().data
-
-
-class EvalAccessor:
+        return self._execute(self._query(columns).eq("availability", "Open")).data
+
+    def iter_all(
+        self,
+        columns: Columns = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream all benchmarks page by page."""
+        return iter_keyset(
+            lambda: self._query(columns, key="id"),
+            page_size=page_size,
+            prefetch=prefetch,
+            execute=self._send,
+        )
+
+    def iter_by_risk_category(
+        self,
+        risk_cat: str,
+        columns: Columns = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream benchmarks by risk category page by page."""
+        return iter_keyset(
+            lambda: self._query(columns, key="id").contains("risk_cats", [risk_cat]),
+            page_size=page_size,
+            prefetch=prefetch,
+            execute=self._send,
+        )
+
+    def iter_open_source(
+        self,
+        columns: Columns = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream open-source benchmarks page by page."""
+        return iter_keyset(
+            lambda: self._query(columns, key="id").eq("availability", "Open"),
+            page_size=page_size,
+            prefetch=prefetch,
+            execute=self._send,
+        )
+
+
+class EvalAccessor(BaseAccessor):
     """Accessor for AI safety evaluations."""
 
-    def __init__(self, db: SupabaseDB):
-        self.db = db
+    table = "evals"
 
-    def get_all(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    def get_all(self, limit: Optional[int] = None, columns: Columns = None) -> List[Dict[str, Any]]:
         """Get all evaluations."""
-        query = self.db.evals.select("*")
+        query = self._query(columns)
         if limit:
             query = query.limit(limit)
-        return query.execute().data
+        return self._execute(query).data
 
-    def get_by_id(self, eval_id: str) -> Optional[Dict[str, Any]]:
+    def count(self) -> int:
+        """Count evaluations on the server without transferring any rows."""
+        return self._execute(self.db.evals.select("id", count="exact", head=True)).count or 0
+
+    def get_by_id(self, eval_id: str, columns: Columns = None) -> Optional[Dict[str, Any]]:
         """Get evaluation by ID."""
-        result = self.db.evals.select("*").eq("id", eval_id).execute()
+        result = self._execute(self._query(columns).eq("id", eval_id))
         return result.data[0] if result.data else None
 
-    def get_by_public_id(self, public_id: str) -> Optional[Dict[str, Any]]:
+    def get_by_public_id(self, public_id: str, columns: Columns = None) -> Optional[Dict[str, Any]]:
         """Get evaluation by public ID (e.g., 'card_claude4.5')."""
-        result = self.db.evals.select("*").eq("public_id", public_id).execute()
+        result = self._execute(self._query(columns).eq("public_id", public_id))
         return result.data[0] if result.data else None
 
-    def get_by_organization(self, org_name: str) -> List[Dict[str, Any]]:
+    def get_many_by_public_id(
+        self, public_ids: Sequence[str], columns: Columns = None, max_workers: int = 4
+    ) -> LookupResult:
+        """Get many evaluations by public ID in batched requests."""
+        return self._get_many("public_id", public_ids, columns, max_workers)
+
+    def get_by_organization(self, org_name: str, columns: Columns = None) -> List[Dict[str, Any]]:
         """Get evaluations by organization."""
-        return self.db.evals.select("*").contains("organizations", [org_name]).execute().data
+        return self._execute(self._query(columns).contains("organizations", [org_name])).data
 
-    def get_by_model(self, model_name: str) -> List[Dict[str, Any]]:
+    def get_by_model(self, model_name: str, columns: Columns = None) -> List[Dict[str, Any]]:
         """Get evaluations for a specific model."""
-        return self.db.evals.select("*").contains("models", [model_name]).execute().data
+        return self._execute(self._query(columns).contains("models", [model_name])).data
 
-    def get_by_risk_category(self, risk_cat: str) -> List[Dict[str, Any]]:
+    def get_by_risk_category(self, risk_cat: str, columns: Columns = None) -> List[Dict[str, Any]]:
         """Get evaluations by risk category."""
-        return self.db.evals.select("*").contains("risk_cats", [risk_cat]).execute().data
+        return self._execute(self._query(columns).contains("risk_cats", [risk_cat])).data
 
-    def get_recent(self, limit: int = 10) -> List[Dict[str, Any]]:
+    def get_recent(self, limit: int = 10, columns: Columns = None) -> List[Dict[str, Any]]:
         """Get most recent evaluations by release date."""
-        return self.db.evals.select("*").order("release_date", desc=True).limit(limit).execute().data
+        query = self._query(columns).order("release_date", desc=True).limit(limit)
+        return self._execute(query).data
 
-    def get_reviewed(self) -> List[Dict[str, Any]]:
+    def get_reviewed(self, columns: Columns = None) -> List[Dict[str, Any]]:
         """Get all reviewed evaluations."""
-        return self.db.evals.select("*").eq("reviewed", True).execute().data
-
-
-class VersionAccessor:
+        return self._execute(self._query(columns).eq("reviewed", True)).data
+
+    def iter_all(
+        self,
+        columns: Columns = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream all evaluations page by page."""
+        return iter_keyset(
+            lambda: self._query(columns, key="id"),
+            page_size=page_size,
+            prefetch=prefetch,
+            execute=self._send,
+        )
+
+    def iter_by_organization(
+        self,
+        org_name: str,
+        columns: Columns = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream evaluations by organization page by page."""
+        return iter_keyset(
+            lambda: self._query(columns, key="id").contains("organizations", [org_name]),
+            page_size=page_size,
+            prefetch=prefetch,
+            execute=self._send,
+        )
+
+    def iter_by_model(
+        self,
+        model_name: str,
+        columns: Columns = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream evaluations for a specific model page by page."""
+        return iter_keyset(
+            lambda: self._query(columns, key="id").contains("models", [model_name]),
+            page_size=page_size,
+            prefetch=prefetch,
+            execute=self._send,
+        )
+
+    def iter_by_risk_category(
+        self,
+        risk_cat: str,
+        columns: Columns = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream evaluations by risk category page by page."""
+        return iter_keyset(
+            lambda: self._query(columns, key="id").contains("risk_cats", [risk_cat]),
+            page_size=page_size,
+            prefetch=prefetch,
+            execute=self._send,
+        )
+
+    def iter_reviewed(
+        self,
+        columns: Columns = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream reviewed evaluations page by page."""
+        return iter_keyset(
+            lambda: self._query(columns, key="id").eq("reviewed", True),
+            page_size=page_size,
+            prefetch=prefetch,
+            execute=self._send,
+        )
+
+
+class VersionAccessor(BaseAccessor):
     """Accessor for model versions."""
 
-    def __init__(self, db: SupabaseDB):
-        self.db = db
+    table = "versions"
 
-    def get_all(self) -> List[Dict[str, Any]]:
+    def get_all(self, columns: Columns = None) -> List[Dict[str, Any]]:
         """Get all model versions."""
-        return self.db.versions.select("*").execute().data
+        return self._execute(self._query(columns)).data
 
-    def get_by_id(self, version_id: str) -> Optional[Dict[str, Any]]:
+    def count(self) -> int:
+        """Count model versions on the server without transferring any rows."""
+        return self._execute(self.db.versions.select("id", count="exact", head=True)).count or 0
+
+    def get_by_id(self, version_id: str, columns: Columns = None) -> Optional[Dict[str, Any]]:
         """Get version by ID."""
-        result = self.db.versions.select("*").eq("id", version_id).execute()
+        result = self._execute(self._query(columns).eq("id", version_id))
         return result.data[0] if result.data else None
 
-    def get_by_name(self, name: str) -> Optional[Dict[str, Any]]:
+    def get_by_name(self, name: str, columns: Columns = None) -> Optional[Dict[str, Any]]:
         """Get version by exact name."""
-        result = self.db.versions.select("*").eq("name", name).execute()
+        result = self._execute(self._query(columns).eq("name", name))
         return result.data[0] if result.data else None
 
-    def search_by_name(self, keyword: str) -> List[Dict[str, Any]]:
-        """Search versions by keyword in name."""
-        return self.db.versions.select("*").ilike("name", f"%{keyword}%").execute().data
-
+    def get_many_by_name(
+        self, names: Sequence[str], columns: Columns = None, max_workers: int = 4
+    ) -> LookupResult:
+        """Get many versions by exact name in batched requests."""
+        return self._get_many("name", names, columns, max_workers)
 
-class EpochModelsAccessor:
+    def search_by_name(self, keyword: str, columns: Columns = None) -> List[Dict[str, Any]]:
+        """Search versions by keyword in name."""
+        return self._execute(self._query(columns).ilike("name", contains_pattern(keyword))).data
+
+    def iter_all(
+        self,
+        columns: Columns = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream all model versions page by page."""
+        return iter_keyset(
+            lambda: self._query(columns, key="id"),
+            page_size=page_size,
+            prefetch=prefetch,
+            execute=self._send,
+        )
+
+    def iter_search_by_name(
+        self,
+        keyword: str,
+        columns: Columns = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream versions matching a keyword page by page."""
+        return iter_keyset(
+            lambda: self._query(columns, key="id").ilike("name", contains_pattern(keyword)),
+            page_size=page_size,
+            prefetch=prefetch,
+            execute=self._send,
+        )
+
+
+class EpochModelsAccessor(BaseAccessor):
     """Accessor for Epoch AI models data."""
 
-    def __init__(self, db: SupabaseDB):
-        self.db = db
+    table = "epoch_models"
 
-    def get_all(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    def get_all(self, limit: Optional[int] = None, columns: Columns = None) -> List[Dict[str, Any]]:
         """Get all epoch models."""
-        query = self.db.epoch_models.select("*")
+        query = self._query(columns)
         if limit:
             query = query.limit(limit)
-        return query.execute().data
+        return self._execute(query).data
+
+    def count(self) -> int:
+        """Count epoch models on the server without transferring any rows."""
+        return self._execute(self.db.epoch_models.select("id", count="exact", head=True)).count or 0
 
-    def get_by_id(self, model_id: str) -> Optional[Dict[str, Any]]:
+    def get_by_id(self, model_id: str, columns: Columns = None) -> Optional[Dict[str, Any]]:
         """Get model by ID."""
-        result = self.db.epoch_models.select("*").eq("id", model_id).execute()
+        result = self._execute(self._query(columns).eq("id", model_id))
         return result.data[0] if result.data else None
 
+    def iter_all(
+        self,
+        columns: Columns = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream all epoch models page by page."""
+        return iter_keyset(
+            lambda: self._query(columns, key="id"),
+            page_size=page_size,
+            prefetch=prefetch,
+            execute=self._send,
+        )
+
 
 class DataAccessor:
     """Unified accessor providing access to all AIRE data."""
 
-    def __init__(self, db: Optional[SupabaseDB] = None):
-        """Initialize with database connection."""
+    def __init__(
+        self,
+        db: Optional[SupabaseDB] = None,
+        cache: Optional[QueryCache] = None,
+        records: bool = False,
+        coalesce: bool = False,
+    ):
+        """Initialize with database connection and an optional result cache.
+
+        With ``records`` rows are returned as compact, read-only ``Record``s
+        (see ``records.py``) instead of dicts. With ``coalesce`` identical
+        queries issued concurrently share one request (see ``coalesce.py``).
+        """
         self.db = db if db else SupabaseDB()
-        self.incidents = IncidentAccessor(self.db)
-        self.benchmarks = BenchmarkAccessor(self.db)
-        self.evals = EvalAccessor(self.db)
-        self.versions = VersionAccessor(self.db)
-        self.epoch_models = EpochModelsAccessor(self.db)
-
-    def get_summary(self) -> Dict[str, Any]:
-        """Get summary statistics for all data types."""
-        return {
-            "incidents": {
-                "total": len(self.incidents.get_all()),
-                "recent": self.incidents.get_recent(5)
-            },
-            "benchmarks": {
-                "total": len(self.benchmarks.get_all()),
-                "recent": self.benchmarks.get_recent(5)
-            },
-            "evals": {
-                "total": len(self.evals.get_all()),
-                "recent": self.evals.get_recent(5)
-            },
-            "versions": {
-                "total": len(self.versions.get_all())
-            },
-            "epoch_models": {
-                "total": len(self.epoch_models.get_all())
-            }
+        self.cache = cache
+        self.records = records
+        self.coalescer = SingleFlight() if coalesce else None
+        shared = (self.db, cache, records, self.coalescer)
+        self.incidents = IncidentAccessor(*shared)
+        self.benchmarks = BenchmarkAccessor(*shared)
+        self.evals = EvalAccessor(*shared)
+        self.versions = VersionAccessor(*shared)
+        self.epoch_models = EpochModelsAccessor(*shared)
+
+    @classmethod
+    def from_replica(
+        cls,
+        path: str = DEFAULT_REPLICA_PATH,
+        cache: Optional[QueryCache] = None,
+        records: bool = False,
+        coalesce: bool = False,
+    ) -> "DataAccessor":
+        """Answer queries from a local SQLite replica instead of Supabase."""
+        return cls(db=ReplicaDB(path), cache=cache, records=records, coalesce=coalesce)
+
+    def get_summary(
+        self, max_workers: int = 8, duplicates: Optional["DuplicateIndex"] = None
+    ) -> Dict[str, Any]:
+        """Get summary statistics for all data types.
+
+        Totals are counted server-side and every request is issued
+        concurrently, so latency stays close to a single round trip. With
+        ``duplicates`` the incidents also get a ``distinct`` total that counts
+        each near-duplicate cluster once.
+        """
+        requests = {
+            ("incidents", "total"): self.incidents.count,
+            ("incidents", "recent"): lambda: self.incidents.get_recent(5),
+            ("benchmarks", "total"): self.benchmarks.count,
+            ("benchmarks", "recent"): lambda: self.benchmarks.get_recent(5),
+            ("evals", "total"): self.evals.count,
+            ("evals", "recent"): lambda: self.evals.get_recent(5),
+            ("versions", "total"): self.versions.count,
+            ("epoch_models", "total"): self.epoch_models.count,
         }
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {key: executor.submit(fn) for key, fn in requests.items()}
+
+        summary: Dict[str, Any] = {}
+        for (table, field), future in futures.items():
+            summary.setdefault(table, {})[field] = future.result()
+        if duplicates is not None:
+            summary["incidents"]["distinct"] = duplicates.distinct_count()
+        return summary
@@ -0,0 +1,670 @@
+"""Async data accessors built on the async Supabase client.
+
+Method-for-method twins of ``aire.data.accessors``. Every request goes
+through a shared semaphore, so callers can ``asyncio.gather`` many queries
+while bounding how many are in flight at once.
+"""
+
+import asyncio
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Sequence
+
+from .batch import LookupResult, chunk_keys, collect_lookup
+from .cache import query_key
+from .coalesce import AsyncSingleFlight
+from .escaping import contains_pattern, quote_value
+from .pagination import DEFAULT_PAGE_SIZE, aiter_keyset
+from .projections import Columns, select_columns
+from .records import records_response, to_records
+from .search import ranked_rows
+from .storage.database import AsyncSupabaseDB
+
+if TYPE_CHECKING:
+    from .dedup import DuplicateIndex
+    from .search import SearchIndex
+
+DEFAULT_MAX_CONCURRENCY = 10
+
+
+class AsyncBaseAccessor:
+    """Shared plumbing for the async per-table accessors."""
+
+    table: str = ""
+
+    def __init__(
+        self,
+        db: AsyncSupabaseDB,
+        limiter: Optional[asyncio.Semaphore] = None,
+        records: bool = False,
+        coalescer: Optional[AsyncSingleFlight] = None,
+    ):
+        self.db = db
+        self.limiter = limiter or asyncio.Semaphore(DEFAULT_MAX_CONCURRENCY)
+        self.records = records
+        self.coalescer = coalescer
+
+    def _query(self, columns: Columns = None, key: Optional[str] = None) -> Any:
+        """Start a select on this table with the given column projection."""
+        return self.db.table(self.table).select(select_columns(self.table, columns, key))
+
+    async def _execute(self, query: Any) -> Any:
+        """Execute a built query once a concurrency slot is free.
+
+        With a ``coalescer`` identical concurrent queries share one request.
+        """
+        if self.coalescer is None:
+            return await self._fetch(query)
+        return await self.coalescer.do(query_key(self.table, query), lambda: self._fetch(query))
+
+    async def _fetch(self, query: Any) -> Any:
+        async with self.limiter:
+            response = await self.db.execute(query, self.table)
+        return records_response(self.table, response) if self.records else response
+
+    async def _get_many(
+        self, column: str, keys: Sequence[Any], columns: Columns = None
+    ) -> LookupResult:
+        """Look up rows for many values of ``column`` in concurrent batched requests."""
+        unique_keys = list(dict.fromkeys(keys))
+        queries = [
+            self._query(columns, key=column).in_(column, chunk)
+            for chunk in chunk_keys(unique_keys)
+        ]
+        responses = await asyncio.gather(*(self._execute(query) for query in queries))
+        rows = (row for response in responses for row in response.data)
+        return collect_lookup(unique_keys, column, rows)
+
+    async def get_many_by_id(self, ids: Sequence[Any], columns: Columns = None) -> LookupResult:
+        """Get many rows by ID; ``missing`` lists ids with no row."""
+        return await self._get_many("id", ids, columns)
+
+    async def get_columns(
+        self, ids: Sequence[Any], columns: Columns = "full"
+    ) -> Dict[Any, Dict[str, Any]]:
+        """Fetch ``columns`` for the given ids, keyed by id."""
+        return (await self.get_many_by_id(ids, columns)).found
+
+    async def to_frame(self, columns: Columns = None, page_size: int = DEFAULT_PAGE_SIZE) -> Any:
+        """Stream the whole table into a typed pandas DataFrame."""
+        from .frames import rows_to_frame
+
+        rows = [row async for row in self.iter_all(columns=columns, page_size=page_size)]
+        return rows_to_frame(self.table, rows)
+
+    async def to_arrow(self, columns: Columns = None, page_size: int = DEFAULT_PAGE_SIZE) -> Any:
+        """Stream the whole table into an Arrow table (requires pyarrow)."""
+        from .frames import frame_to_arrow
+
+        return frame_to_arrow(self.table, await self.to_frame(columns, page_size))
+
+    async def hydrate(
+        self, rows: List[Dict[str, Any]], columns: Columns = "full"
+    ) -> List[Dict[str, Any]]:
+        """Fill in heavier columns for rows fetched with a narrow projection."""
+        extra = await self.get_columns([row["id"] for row in rows], columns)
+        merged = []
+        for row in rows:
+            combined = {**row, **extra.get(row["id"], {})}
+            merged.append(combined if isinstance(row, dict) else to_records(self.table, [combined])[0])
+        return merged
+
+
+class AsyncIncidentAccessor(AsyncBaseAccessor):
+    """Accessor for AI incidents data."""
+
+    table = "incidents"
+
+    async def get_all(
+        self, limit: Optional[int] = None, columns: Columns = None
+    ) -> List[Dict[str, Any]]:
+        """Get all incidents."""
+        query = self._query(columns)
+        if limit:
+            query = query.limit(limit)
+        return (await self._execute(query)).data
+
+    async def count(self) -> int:
+        """Count incidents on the server without transferring any rows."""
+        query = self.db.incidents.select("id", count="exact", head=True)
+        return (await self._execute(query)).count or 0
+
+    async def get_by_id(
+        self, incident_id: str, columns: Columns = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get incident by ID."""
+        result = await self._execute(self._query(columns).eq("id", incident_id))
+        return result.data[0] if result.data else None
+
+    async def get_by_risk_category(
+        self,
+        risk_cat: str,
+        limit: Optional[int] = None,
+        columns: Columns = None,
+        duplicates: Optional["DuplicateIndex"] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get incidents by risk category (e.g., 'Manipulation', 'Cyber Offense').
+
+        With ``duplicates`` only the first report of each near-duplicate
+        cluster is returned (``limit`` applies before deduplication).
+        """
+        query = self._query(columns, key="id" if duplicates else None)
+        query = query.contains("risk_cats", [risk_cat])
+        if limit:
+            query = query.limit(limit)
+        rows = (await self._execute(query)).data
+        return duplicates.deduplicate(rows) if duplicates else rows
+
+    async def get_by_quarter(self, quarter: str, columns: Columns = None) -> List[Dict[str, Any]]:
+        """Get incidents by quarter (e.g., 'Q3 2025')."""
+        query = self._query(columns).eq("quarter", quarter)
+        return (await self._execute(query)).data
+
+    async def get_by_actor_origin(
+        self, origin: str, columns: Columns = None
+    ) -> List[Dict[str, Any]]:
+        """Get incidents by actor origin country."""
+        query = self._query(columns).contains("actors_origin", [origin])
+        return (await self._execute(query)).data
+
+    async def search_by_keyword(
+        self, keyword: str, columns: Columns = None, index: Optional["SearchIndex"] = None
+    ) -> List[Dict[str, Any]]:
+        """Search incidents by keyword in headline or description.
+
+        With a full-text ``index`` the ids come from the local index ranked
+        by relevance and only the matching rows are fetched.
+        """
+        if index is not None:
+            hits = index.search(keyword, limit=None)
+            return ranked_rows(hits, await self.get_many_by_id([hit.id for hit in hits], columns))
+        pattern = quote_value(contains_pattern(keyword))
+        query = self._query(columns).or_(
+            f"headline.ilike.{pattern},description.ilike.{pattern}"
+        )
+        return (await self._execute(query)).data
+
+    async def get_recent(self, limit: int = 10, columns: Columns = None) -> List[Dict[str, Any]]:
+        """Get most recent incidents by reporting date."""
+        query = self._query(columns).order("reporting_date", desc=True).limit(limit)
+        return (await self._execute(query)).data
+
+    def iter_all(
+        self,
+        columns: Columns = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream all incidents page by page."""
+        return aiter_keyset(
+            lambda: self._query(columns, key="id"),
+            page_size=page_size,
+            prefetch=prefetch,
+            execute=self._execute,
+        )
+
+    def iter_by_risk_category(
+        self,
+        risk_cat: str,
+        columns: Columns = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream incidents by risk category page by page."""
+        return aiter_keyset(
+            lambda: self._query(columns, key="id").contains("risk_cats", [risk_cat]),
+            page_size=page_size,
+            prefetch=prefetch,
+            execute=self._execute,
+        )
+
+    def iter_by_quarter(
+        self,
+        quarter: str,
+        columns: Columns = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream incidents by quarter page by page."""
+        return aiter_keyset(
+            lambda: self._query(columns, key="id").eq("quarter", quarter),
+            page_size=page_size,
+            prefetch=prefetch,
+            execute=self._execute,
+        )
+
+    def iter_by_actor_origin(
+        self,
+        origin: str,
+        columns: Columns = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream incidents by actor origin country page by page."""
+        return aiter_keyset(
+            lambda: self._query(columns, key="id").contains("actors_origin", [origin]),
+            page_size=page_size,
+            prefetch=prefetch,
+            execute=self._execute,
+        )
+
+    def iter_search_by_keyword(
+        self,
+        keyword: str,
+        columns: Columns = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream incidents matching a keyword page by page."""
+        pattern = quote_value(contains_pattern(keyword))
+        return aiter_keyset(
+            lambda: self._query(columns, key="id").or_(
+                f"headline.ilike.{pattern},description.ilike.{pattern}"
+            ),
+            page_size=page_size,
+            prefetch=prefetch,
+            execute=self._execute,
+        )
+
+
+class AsyncBenchmarkAccessor(AsyncBaseAccessor):
+    """Accessor for AI risk benchmarks."""
+
+    table = "benchmarks"
+
+    async def get_all(
+        self, limit: Optional[int] = None, columns: Columns = None
+    ) -> List[Dict[str, Any]]:
+        """Get all benchmarks."""
+        query = self._query(columns)
+        if limit:
+            query = query.limit(limit)
+        return (await self._execute(query)).data
+
+    async def count(self) -> int:
+        """Count benchmarks on the server without transferring any rows."""
+        query = self.db.benchmarks.select("id", count="exact", head=True)
+        return (await self._execute(query)).count or 0
+
+    async def get_by_id(
+        self, benchmark_id: str, columns: Columns = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get benchmark by ID."""
+        result = await self._execute(self._query(columns).eq("id", benchmark_id))
+        return result.data[0] if result.data else None
+
+    async def get_by_name(
+        self, benchmark_name: str, columns: Columns = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get benchmark by name (e.g., 'VCT', 'AttackSeqBench')."""
+        result = await self._execute(self._query(columns).eq("benchmark", benchmark_name))
+        return result.data[0] if result.data else None
+
+    async def get_many_by_name(
+        self, benchmark_names: Sequence[str], columns: Columns = None
+    ) -> LookupResult:
+        """Get many benchmarks by name in batched requests."""
+        return await self._get_many("benchmark", benchmark_names, columns)
+
+    async def get_by_risk_category(
+        self, risk_cat: str, columns: Columns = None
+    ) -> List[Dict[str, Any]]:
+        """Get benchmarks by risk category."""
+        query = self._query(columns).contains("risk_cats", [risk_cat])
+        return (await self._execute(query)).data
+
+    async def get_recent(self, limit: int = 10, columns: Columns = None) -> List[Dict[str, Any]]:
+        """Get most recent benchmarks by publication date."""
+        query = self._query(columns).order("date", desc=True).limit(limit)
+        return (await self._execute(query)).data
+
+    async def get_open_source(self, columns: Columns = None) -> List[Dict[str, Any]]:
+        """Get all open-source benchmarks."""
+        query = self._query(columns).eq("availability", "Open")
+        return (await self._execute(query)).data
+
+    def iter_all(
+        self,
+        columns: Columns = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream all benchmarks page by page."""
+        return aiter_keyset(
+            lambda: self._query(columns, key="id"),
+            page_size=page_size,
+            prefetch=prefetch,
+            execute=self._execute,
+        )
+
+    def iter_by_risk_category(
+        self,
+        risk_cat: str,
+        columns: Columns = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream benchmarks by risk category page by page."""
+        return aiter_keyset(
+            lambda: self._query(columns, key="id").contains("risk_cats", [risk_cat]),
+            page_size=page_size,
+            prefetch=prefetch,
+            execute=self._execute,
+        )
+
+    def iter_open_source(
+        self,
+        columns: Columns = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream open-source benchmarks page by page."""
+        return aiter_keyset(
+            lambda: self._query(columns, key="id").eq("availability", "Open"),
+            page_size=page_size,
+            prefetch=prefetch,
+            execute=self._execute,
+        )
+
+
+class AsyncEvalAccessor(AsyncBaseAccessor):
+    """Accessor for AI safety evaluations."""
+
+    table = "evals"
+
+    async def get_all(
+        self, limit: Optional[int] = None, columns: Columns = None
+    ) -> List[Dict[str, Any]]:
+        """Get all evaluations."""
+        query = self._query(columns)
+        if limit:
+            query = query.limit(limit)
+        return (await self._execute(query)).data
+
+    async def count(self) -> int:
+        """Count evaluations on the server without transferring any rows."""
+        query = self.db.evals.select("id", count="exact", head=True)
+        return (await self._execute(query)).count or 0
+
+    async def get_by_id(self, eval_id: str, columns: Columns = None) -> Optional[Dict[str, Any]]:
+        """Get evaluation by ID."""
+        result = await self._execute(self._query(columns).eq("id", eval_id))
+        return result.data[0] if result.data else None
+
+    async def get_by_public_id(
+        self, public_id: str, columns: Columns = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get evaluation by public ID (e.g., 'card_claude4.5')."""
+        result = await self._execute(self._query(columns).eq("public_id", public_id))
+        return result.data[0] if result.data else None
+
+    async def get_many_by_public_id(
+        self, public_ids: Sequence[str], columns: Columns = None
+    ) -> LookupResult:
+        """Get many evaluations by public ID in batched requests."""
+        return await self._get_many("public_id", public_ids, columns)
+
+    async def get_by_organization(
+        self, org_name: str, columns: Columns = None
+    ) -> List[Dict[str, Any]]:
+        """Get evaluations by organization."""
+        query = self._query(columns).contains("organizations", [org_name])
+        return (await self._execute(query)).data
+
+    async def get_by_model(self, model_name: str, columns: Columns = None) -> List[Dict[str, Any]]:
+        """Get evaluations for a specific model."""
+        query = self._query(columns).contains("models", [model_name])
+        return (await self._execute(query)).data
+
+    async def get_by_risk_category(
+        self, risk_cat: str, columns: Columns = None
+    ) -> List[Dict[str, Any]]:
+        """Get evaluations by risk category."""
+        query = self._query(columns).contains("risk_cats", [risk_cat])
+        return (await self._execute(query)).data
+
+    async def get_recent(self, limit: int = 10, columns: Columns = None) -> List[Dict[str, Any]]:
+        """Get most recent evaluations by release date."""
+        query = self._query(columns).order("release_date", desc=True).limit(limit)
+        return (await self._execute(query)).data
+
+    async def get_reviewed(self, columns: Columns = None) -> List[Dict[str, Any]]:
+        """Get all reviewed evaluations."""
+        query = self._query(columns).eq("reviewed", True)
+        return (await self._execute(query)).data
+
+    def iter_all(
+        self,
+        columns: Columns = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream all evaluations page by page."""
+        return aiter_keyset(
+            lambda: self._query(columns, key="id"),
+            page_size=page_size,
+            prefetch=prefetch,
+            execute=self._execute,
+        )
+
+    def iter_by_organization(
+        self,
+        org_name: str,
+        columns: Columns = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream evaluations by organization page by page."""
+        return aiter_keyset(
+            lambda: self._query(columns, key="id").contains("organizations", [org_name]),
+            page_size=page_size,
+            prefetch=prefetch,
+            execute=self._execute,
+        )
+
+    def iter_by_model(
+        self,
+        model_name: str,
+        columns: Columns = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream evaluations for a specific model page by page."""
+        return aiter_keyset(
+            lambda: self._query(columns, key="id").contains("models", [model_name]),
+            page_size=page_size,
+            prefetch=prefetch,
+            execute=self._execute,
+        )
+
+    def iter_by_risk_category(
+        self,
+        risk_cat: str,
+        columns: Columns = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream evaluations by risk category page by page."""
+        return aiter_keyset(
+            lambda: self._query(columns, key="id").contains("risk_cats", [risk_cat]),
+            page_size=page_size,
+            prefetch=prefetch,
+            execute=self._execute,
+        )
+
+    def iter_reviewed(
+        self,
+        columns: Columns = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream reviewed evaluations page by page."""
+        return aiter_keyset(
+            lambda: self._query(columns, key="id").eq("reviewed", True),
+            page_size=page_size,
+            prefetch=prefetch,
+            execute=self._execute,
+        )
+
+
+class AsyncVersionAccessor(AsyncBaseAccessor):
+    """Accessor for model versions."""
+
+    table = "versions"
+
+    async def get_all(self, columns: Columns = None) -> List[Dict[str, Any]]:
+        """Get all model versions."""
+        return (await self._execute(self._query(columns))).data
+
+    async def count(self) -> int:
+        """Count model versions on the server without transferring any rows."""
+        query = self.db.versions.select("id", count="exact", head=True)
+        return (await self._execute(query)).count or 0
+
+    async def get_by_id(self, version_id: str, columns: Columns = None) -> Optional[Dict[str, Any]]:
+        """Get version by ID."""
+        result = await self._execute(self._query(columns).eq("id", version_id))
+        return result.data[0] if result.data else None
+
+    async def get_by_name(self, name: str, columns: Columns = None) -> Optional[Dict[str, Any]]:
+        """Get version by exact name."""
+        result = await self._execute(self._query(columns).eq("name", name))
+        return result.data[0] if result.data else None
+
+    async def get_many_by_name(
+        self, names: Sequence[str], columns: Columns = None
+    ) -> LookupResult:
+        """Get many versions by exact name in batched requests."""
+        return await self._get_many("name", names, columns)
+
+    async def search_by_name(self, keyword: str, columns: Columns = None) -> List[Dict[str, Any]]:
+        """Search versions by keyword in name."""
+        query = self._query(columns).ilike("name", contains_pattern(keyword))
+        return (await self._execute(query)).data
+
+    def iter_all(
+        self,
+        columns: Columns = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream all model versions page by page."""
+        return aiter_keyset(
+            lambda: self._query(columns, key="id"),
+            page_size=page_size,
+            prefetch=prefetch,
+            execute=self._execute,
+        )
+
+    def iter_search_by_name(
+        self,
+        keyword: str,
+        columns: Columns = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream versions matching a keyword page by page."""
+        return aiter_keyset(
+            lambda: self._query(columns, key="id").ilike("name", contains_pattern(keyword)),
+            page_size=page_size,
+            prefetch=prefetch,
+            execute=self._execute,
+        )
+
+
+class AsyncEpochModelsAccessor(AsyncBaseAccessor):
+    """Accessor for Epoch AI models data."""
+
+    table = "epoch_models"
+
+    async def get_all(
+        self, limit: Optional[int] = None, columns: Columns = None
+    ) -> List[Dict[str, Any]]:
+        """Get all epoch models."""
+        query = self._query(columns)
+        if limit:
+            query = query.limit(limit)
+        return (await self._execute(query)).data
+
+    async def count(self) -> int:
+        """Count epoch models on the server without transferring any rows."""
+        query = self.db.epoch_models.select("id", count="exact", head=True)
+        return (await self._execute(query)).count or 0
+
+    async def get_by_id(self, model_id: str, columns: Columns = None) -> Optional[Dict[str, Any]]:
+        """Get model by ID."""
+        result = await self._execute(self._query(columns).eq("id", model_id))
+        return result.data[0] if result.data else None
+
+    def iter_all(
+        self,
+        columns: Columns = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream all epoch models page by page."""
+        return aiter_keyset(
+            lambda: self._query(columns, key="id"),
+            page_size=page_size,
+            prefetch=prefetch,
+            execute=self._execute,
+        )
+
+
+class AsyncDataAccessor:
+    """Async unified accessor providing access to all AIRE data."""
+
+    def __init__(
+        self,
+        db: AsyncSupabaseDB,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        records: bool = False,
+        coalesce: bool = False,
+    ):
+        """Initialize with an async database connection and a concurrency limit.
+
+        With ``records`` rows are returned as compact ``Record``s; with
+        ``coalesce`` identical concurrent queries share one request.
+        """
+        self.db = db
+        self.limiter = asyncio.Semaphore(max_concurrency)
+        self.coalescer = AsyncSingleFlight() if coalesce else None
+        shared = (self.db, self.limiter, records, self.coalescer)
+        self.incidents = AsyncIncidentAccessor(*shared)
+        self.benchmarks = AsyncBenchmarkAccessor(*shared)
+        self.evals = AsyncEvalAccessor(*shared)
+        self.versions = AsyncVersionAccessor(*shared)
+        self.epoch_models = AsyncEpochModelsAccessor(*shared)
+
+    @classmethod
+    async def create(
+        cls,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        records: bool = False,
+        coalesce: bool = False,
+    ) -> "AsyncDataAccessor":
+        """Connect to Supabase using the environment and build an accessor."""
+        db = await AsyncSupabaseDB.create()
+        return cls(db, max_concurrency=max_concurrency, records=records, coalesce=coalesce)
+
+    async def get_summary(self, duplicates: Optional["DuplicateIndex"] = None) -> Dict[str, Any]:
+        """Get summary statistics for all data types, fetched concurrently.
+
+        With ``duplicates`` the incidents also get a ``distinct`` total.
+        """
+        requests = {
+            ("incidents", "total"): self.incidents.count(),
+            ("incidents", "recent"): self.incidents.get_recent(5),
+            ("benchmarks", "total"): self.benchmarks.count(),
+            ("benchmarks", "recent"): self.benchmarks.get_recent(5),
+            ("evals", "total"): self.evals.count(),
+            ("evals", "recent"): self.evals.get_recent(5),
+            ("versions", "total"): self.versions.count(),
+            ("epoch_models", "total"): self.epoch_models.count(),
+        }
+        results = await asyncio.gather(*requests.values())
+
+        summary: Dict[str, Any] = {}
+        for (table, field), result in zip(requests, results):
+            summary.setdefault(table, {})[field] = result
+        if duplicates is not None:
+            summary["incidents"]["distinct"] = duplicates.distinct_count()
+        return summary
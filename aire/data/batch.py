@@ -0,0 +1,76 @@
+"""Helpers for batched multi-key lookups."""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+from urllib.parse import quote
+
+# Budget for the encoded ``column=in.(...)`` filter in one request. Proxies in
+# front of PostgREST commonly reject URLs somewhere above 8 KB.
+DEFAULT_MAX_URL_CHARS = 6000
+DEFAULT_MAX_KEYS = 500
+
+
+@dataclass
+class LookupResult:
+    """Rows found by a batched lookup, keyed by the requested key."""
+
+    found: Dict[Any, Dict[str, Any]] = field(default_factory=dict)
+    missing: List[Any] = field(default_factory=list)
+
+    def __getitem__(self, key: Any) -> Dict[str, Any]:
+        return self.found[key]
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self.found
+
+    def __len__(self) -> int:
+        return len(self.found)
+
+    def get(self, key: Any, default: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        return self.found.get(key, default)
+
+
+def _encoded_length(key: Any) -> int:
+    # Quotes may be added around values with reserved characters, plus a comma.
+    return len(quote(str(key), safe="")) + 3
+
+
+def chunk_keys(
+    keys: Sequence[Any],
+    max_url_chars: int = DEFAULT_MAX_URL_CHARS,
+    max_keys: int = DEFAULT_MAX_KEYS,
+) -> Iterator[List[Any]]:
+    """Split keys into chunks whose encoded ``in.(...)`` filter fits in a URL."""
+    chunk: List[Any] = []
+    size = 0
+    for key in keys:
+        length = _encoded_length(key)
+        if chunk and (size + length > max_url_chars or len(chunk) >= max_keys):
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(key)
+        size += length
+    if chunk:
+        yield chunk
+
+
+def collect_lookup(
+    keys: Sequence[Any], column: str, rows: Iterable[Dict[str, Any]]
+) -> LookupResult:
+    """Match fetched rows back to the requested keys.
+
+    Keys are compared as strings, so ``"42"`` finds a row whose id is ``42``.
+    When several rows share a key the first one wins, as in ``get_by_name``.
+    """
+    by_value: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        by_value.setdefault(str(row.get(column)), row)
+
+    result = LookupResult()
+    for key in keys:
+        row = by_value.get(str(key))
+        if row is None:
+            result.missing.append(key)
+        else:
+            result.found[key] = row
+    return result
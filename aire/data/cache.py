@@ -0,0 +1,312 @@
+"""Query-result caching for the data accessors.
+
+Results are keyed on the table plus everything that shapes the request
+(selected columns, filters, ordering, limit and count mode), so two accessor
+calls share an entry exactly when they would send the same request.
+"""
+
+import hashlib
+import json
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .coalesce import share_response
+
+CacheKey = Tuple[str, str]
+
+
+@dataclass
+class CachedResponse:
+    """Cached query result, shaped like postgrest's ``APIResponse``."""
+
+    data: List[Dict[str, Any]] = field(default_factory=list)
+    count: Optional[int] = None
+
+
+@dataclass
+class CacheEntry:
+    """A stored response and its absolute expiry time (``None`` = never)."""
+
+    response: CachedResponse
+    expires_at: Optional[float] = None
+
+    def expired(self, now: float) -> bool:
+        return self.expires_at is not None and now >= self.expires_at
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for one table."""
+
+    hits: int = 0
+    misses: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def query_fingerprint(query: Any) -> str:
+    """Describe everything that determines a query's result as a string.
+
+    Works for postgrest request builders (both the ``request``-based and the
+    older attribute-based layout) and for ``ReplicaQuery``.
+    """
+    if hasattr(query, "to_sql"):
+        sql, params = query.to_sql()
+        parts: List[Any] = [sql, params, query.columns, query.count_method, query.head]
+    else:
+        request = getattr(query, "request", query)
+        params = sorted(request.params.multi_items())
+        method = getattr(request, "http_method", getattr(request, "method", ""))
+        prefer = request.headers.get("prefer", "")
+        parts = [str(method), params, prefer]
+    return json.dumps(parts, default=str, separators=(",", ":"))
+
+
+def query_key(table: str, query: Any) -> CacheKey:
+    """Cache key for a query against ``table``."""
+    digest = hashlib.sha1(query_fingerprint(query).encode("utf-8")).hexdigest()
+    return table, digest
+
+
+class CacheBackend:
+    """Storage interface for cache entries."""
+
+    evictions: int = 0
+
+    def get(self, key: CacheKey) -> Optional[CacheEntry]:
+        raise NotImplementedError
+
+    def set(self, key: CacheKey, entry: CacheEntry) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: CacheKey) -> None:
+        raise NotImplementedError
+
+    def clear(self, table: Optional[str] = None) -> int:
+        """Remove all entries, or only those of ``table``; return the count."""
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """In-process LRU cache bounded by entry count.
+
+    Responses are copied when stored and again when returned (see
+    ``coalesce.share_response``), so callers may sort, extend or edit the
+    rows they get without affecting the cache.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._entries: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: CacheKey) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+        return CacheEntry(share_response(entry.response), entry.expires_at)
+
+    def set(self, key: CacheKey, entry: CacheEntry) -> None:
+        entry = CacheEntry(share_response(entry.response), entry.expires_at)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: CacheKey) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self, table: Optional[str] = None) -> int:
+        with self._lock:
+            if table is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+            keys = [key for key in self._entries if key[0] == table]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskCache(CacheBackend):
+    """SQLite-backed cache that survives restarts and is shared by processes.
+
+    Least recently used entries are evicted once ``max_entries`` is exceeded.
+    """
+
+    def __init__(self, path: str = ".aire_cache.db", max_entries: int = 10000):
+        self.path = path
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._local = threading.local()
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS query_cache ("
+            "table_name TEXT NOT NULL, key TEXT NOT NULL, expires_at REAL, "
+            "accessed_at REAL NOT NULL, value BLOB NOT NULL, "
+            "PRIMARY KEY (table_name, key))"
+        )
+        self._connection().execute(
+            "CREATE INDEX IF NOT EXISTS ix_query_cache_accessed "
+            "ON query_cache (accessed_at)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: CacheKey) -> Optional[CacheEntry]:
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT expires_at, value FROM query_cache WHERE table_name = ? AND key = ?",
+            key,
+        ).fetchone()
+        if row is None:
+            return None
+        conn.execute(
+            "UPDATE query_cache SET accessed_at = ? WHERE table_name = ? AND key = ?",
+            (time.time(), *key),
+        )
+        return CacheEntry(response=pickle.loads(row[1]), expires_at=row[0])
+
+    def set(self, key: CacheKey, entry: CacheEntry) -> None:
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO query_cache "
+            "(table_name, key, expires_at, accessed_at, value) VALUES (?, ?, ?, ?, ?)",
+            (*key, entry.expires_at, time.time(), pickle.dumps(entry.response)),
+        )
+        excess = conn.execute("SELECT COUNT(*) FROM query_cache").fetchone()[0] - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM query_cache WHERE rowid IN ("
+                "SELECT rowid FROM query_cache ORDER BY accessed_at LIMIT ?)",
+                (excess,),
+            )
+            self.evictions += excess
+
+    def delete(self, key: CacheKey) -> None:
+        self._connection().execute(
+            "DELETE FROM query_cache WHERE table_name = ? AND key = ?", key
+        )
+
+    def clear(self, table: Optional[str] = None) -> int:
+        conn = self._connection()
+        if table is None:
+            return conn.execute("DELETE FROM query_cache").rowcount
+        return conn.execute(
+            "DELETE FROM query_cache WHERE table_name = ?", (table,)
+        ).rowcount
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM query_cache").fetchone()[0]
+
+
+class QueryCache:
+    """TTL-aware result cache placed in front of the accessors.
+
+    ``ttls`` overrides ``default_ttl`` (seconds) per table. A TTL of ``None``
+    never expires; a TTL of ``0`` disables caching for that table.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        default_ttl: Optional[float] = 300.0,
+        ttls: Optional[Dict[str, Optional[float]]] = None,
+    ):
+        self.backend = backend if backend is not None else MemoryCache()
+        self.default_ttl = default_ttl
+        self.ttls = dict(ttls or {})
+        self._stats: Dict[str, CacheStats] = {}
+        self._lock = threading.Lock()
+
+    def ttl_for(self, table: str) -> Optional[float]:
+        return self.ttls.get(table, self.default_ttl)
+
+    def _count(self, table: str, name: str) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(table, CacheStats())
+            setattr(stats, name, getattr(stats, name) + 1)
+
+    def get_or_execute(
+        self, table: str, query: Any, execute: Optional[Callable[[Any], Any]] = None
+    ) -> Any:
+        """Return the cached response for ``query`` or execute and store it.
+
+        ``execute`` runs the query on a miss (defaults to ``query.execute()``).
+        """
+        execute = execute or (lambda q: q.execute())
+        ttl = self.ttl_for(table)
+        if ttl == 0:
+            return execute(query)
+
+        key = query_key(table, query)
+        now = time.time()
+        entry = self.backend.get(key)
+        if entry is not None and entry.expired(now):
+            self.backend.delete(key)
+            self._count(table, "expirations")
+            entry = None
+        if entry is not None:
+            self._count(table, "hits")
+            return entry.response
+
+        self._count(table, "misses")
+        result = execute(query)
+        response = CachedResponse(data=result.data, count=getattr(result, "count", None))
+        expires_at = None if ttl is None else now + ttl
+        self.backend.set(key, CacheEntry(response=response, expires_at=expires_at))
+        return response
+
+    def invalidate(self, table: Optional[str] = None) -> int:
+        """Drop cached results for ``table`` (or every table)."""
+        removed = self.backend.clear(table)
+        with self._lock:
+            for name, stats in self._stats.items():
+                if table is None or name == table:
+                    stats.invalidations += 1
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-table and overall hit/miss statistics."""
+        with self._lock:
+            tables = {
+                table: dict(vars(stats), hit_rate=stats.hit_rate)
+                for table, stats in self._stats.items()
+            }
+        hits = sum(t["hits"] for t in tables.values())
+        misses = sum(t["misses"] for t in tables.values())
+        return {
+            "tables": tables,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "entries": len(self.backend),
+            "evictions": self.backend.evictions,
+        }
@@ -0,0 +1,170 @@
+"""Change tracking for indexes and aggregates derived from a table.
+
+Resuming from the last id seen only finds inserted rows, and only when ids
+grow. A ``ChangeFeed`` keeps what a derived structure has seen of one table
+and pulls what changed since, in one of two ways:
+
+- an incremental pull transfers rows whose ``change_column`` (e.g.
+  ``updated_at``) is at or past the highest value seen, so edited rows are
+  picked up too. Without a change column it falls back to rows with an id
+  past the highest one seen, which only finds appended rows;
+- a full pull streams every row and reports the ids the consumer still
+  holds but the table no longer returned as deleted. It runs on the first
+  pull, when asked for, and once ``full_interval`` seconds have passed since
+  the last one, so edits and deletions are never missed for longer than
+  that.
+
+The consumer supplies callbacks to apply a batch of rows, remove ids and
+list the ids it holds; each is called without any lock held by the feed's
+caller, so consumers lock per batch and readers are not blocked while
+pages are fetched. Consumers pull through a table accessor's public
+``changes_query`` and ``send``:
+
+    feed = ChangeFeed("updated_at", full_interval=3600)
+    feed.pull_from(
+        accessor.evals,
+        ("id", "models"),
+        apply=index.add,
+        remove=index.remove,
+        known_ids=index.ids,
+    )
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .pagination import DEFAULT_PAGE_SIZE, iter_keyset
+
+DEFAULT_FULL_INTERVAL = 3600.0
+
+
+def _batches(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch: List[Dict[str, Any]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class ChangeFeed:
+    """What a consumer has seen of one table, and how to pull what changed.
+
+    ``full_interval`` is in seconds; ``None`` disables periodic full pulls,
+    and ``0`` makes every pull a full one.
+    """
+
+    def __init__(
+        self,
+        change_column: Optional[str] = None,
+        full_interval: Optional[float] = DEFAULT_FULL_INTERVAL,
+    ):
+        self.change_column = change_column
+        self.full_interval = full_interval
+        self.watermark: Optional[Any] = None
+        self.last_id: Optional[Any] = None
+        self.full_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def columns(self, columns: Sequence[str]) -> Tuple[str, ...]:
+        """``columns`` plus the change column, for the consumer's projection."""
+        columns = tuple(columns)
+        if self.change_column and self.change_column not in columns:
+            columns += (self.change_column,)
+        return columns
+
+    def full_due(self) -> bool:
+        """Whether the next pull streams the whole table."""
+        if self.full_at is None:
+            return True
+        return self.full_interval is not None and time.time() - self.full_at >= self.full_interval
+
+    def pull(
+        self,
+        build_query: Callable[[], Any],
+        execute: Callable[[Any], Any],
+        apply: Callable[[List[Dict[str, Any]]], int],
+        remove: Callable[[List[Any]], int],
+        known_ids: Callable[[], Iterable[Any]],
+        page_size: int = DEFAULT_PAGE_SIZE,
+        full: bool = False,
+    ) -> Tuple[int, int]:
+        """Apply rows changed since the last pull; returns ``(applied, removed)``.
+
+        ``build_query`` returns a fresh select over ``columns(...)`` with no
+        ordering or limit. The watermark only moves once the pull completes,
+        so an interrupted pull is repeated rather than skipped.
+        """
+        with self._lock:
+            full = full or self.full_due()
+            started = time.time()
+            change_column, watermark, last_id = self.change_column, self.watermark, self.last_id
+
+            def query() -> Any:
+                query = build_query()
+                if not full and change_column and watermark is not None:
+                    query = query.gte(change_column, watermark)
+                return query
+
+            rows = iter_keyset(
+                query,
+                page_size=page_size,
+                after=None if full or change_column else last_id,
+                execute=execute,
+            )
+            seen = set()
+            applied = 0
+            for batch in _batches(rows, page_size):
+                applied += apply(batch)
+                if full:
+                    seen.update(row["id"] for row in batch)
+                newest = batch[-1]["id"]
+                last_id = newest if last_id is None else max(last_id, newest)
+                if change_column:
+                    values = [row[change_column] for row in batch if row.get(change_column) is not None]
+                    if values:
+                        watermark = max(values) if watermark is None else max(watermark, *values)
+
+            removed = 0
+            if full:
+                gone = [row_id for row_id in known_ids() if row_id not in seen]
+                removed = remove(gone) if gone else 0
+                self.full_at = started
+            self.watermark, self.last_id = watermark, last_id
+            return applied, removed
+
+    def pull_from(
+        self,
+        accessor: Any,
+        columns: Sequence[str],
+        apply: Callable[[List[Dict[str, Any]]], int],
+        remove: Callable[[List[Any]], int],
+        known_ids: Callable[[], Iterable[Any]],
+        page_size: int = DEFAULT_PAGE_SIZE,
+        full: bool = False,
+    ) -> Tuple[int, int]:
+        """``pull`` the ``columns`` (plus id and change column) of a table accessor's table."""
+        selected = self.columns(columns)
+        return self.pull(
+            lambda: accessor.changes_query(selected),
+            accessor.send,
+            apply=apply,
+            remove=remove,
+            known_ids=known_ids,
+            page_size=page_size,
+            full=full,
+        )
+
+    def state(self) -> Dict[str, Any]:
+        """JSON-serializable position, for indexes persisted to disk."""
+        return {"watermark": self.watermark, "last_id": self.last_id, "full_at": self.full_at}
+
+    def restore(self, state: Dict[str, Any]) -> "ChangeFeed":
+        """Resume from a ``state()`` saved earlier."""
+        self.watermark = state.get("watermark")
+        self.last_id = state.get("last_id")
+        self.full_at = state.get("full_at")
+        return self
@@ -0,0 +1,142 @@
+"""Single-flight coalescing of identical in-flight queries.
+
+When several threads (or tasks) send the same request at the same moment,
+only the first one reaches the database; the others wait for its response
+and share it. Requests are identical when ``cache.query_key`` matches, i.e.
+same table, columns, filters, ordering, limit and count mode. Nothing is
+kept once the request finishes, so this is not a cache: a query issued just
+after another completes goes upstream again.
+
+    accessor = DataAccessor(coalesce=True)
+
+The response is copied once when it arrives, before anyone is woken, and
+every caller (the one that sent it included) gets its own copy of that
+snapshot with copied row dicts and array values, so callers that edit their
+rows do not affect each other.
+Errors are raised in every waiting caller.
+"""
+
+import copy
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Hashable, Optional
+
+if TYPE_CHECKING:
+    import asyncio
+
+
+@dataclass
+class CoalesceStats:
+    """Requests sent upstream versus requests answered by another caller's flight."""
+
+    leaders: int = 0
+    followers: int = 0
+
+    @property
+    def saved_ratio(self) -> float:
+        total = self.leaders + self.followers
+        return self.followers / total if total else 0.0
+
+
+def _copy_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: list(value) if type(value) is list else value for key, value in row.items()}
+
+
+def share_response(response: Any) -> Any:
+    """Copy of ``response`` whose rows (and their array values) can be modified independently.
+
+    Read-only ``Record`` rows are shared as they are.
+    """
+    data = getattr(response, "data", None)
+    if not isinstance(data, list):
+        return response
+    shared = copy.copy(response)
+    shared.data = [_copy_row(row) if type(row) is dict else row for row in data]
+    return shared
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Thread-safe single-flight group keyed by any hashable key."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.stats = CoalesceStats()
+
+    def __len__(self) -> int:
+        """Number of requests currently in flight."""
+        with self._lock:
+            return len(self._flights)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run ``fn()`` unless a call for ``key`` is running; then share its result."""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.stats.leaders += 1
+            else:
+                self.stats.followers += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return share_response(flight.result)
+
+        try:
+            # Kept private: callers only ever see copies of this snapshot.
+            flight.result = share_response(fn())
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return share_response(flight.result)
+
+
+class AsyncSingleFlight:
+    """``SingleFlight`` for coroutines running on one event loop.
+
+    The shared request runs as its own task, so a caller that is cancelled
+    does not cancel it for the others.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, "asyncio.Future"] = {}
+        self.stats = CoalesceStats()
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await ``fn()`` unless a call for ``key`` is running; then share its result."""
+        import asyncio
+
+        task = self._flights.get(key)
+        if task is not None:
+            self.stats.followers += 1
+            return share_response(await asyncio.shield(task))
+
+        self.stats.leaders += 1
+        task = asyncio.ensure_future(self._snapshot(fn))
+        self._flights[key] = task
+        task.add_done_callback(lambda _: self._flights.pop(key, None))
+        return share_response(await asyncio.shield(task))
+
+    @staticmethod
+    async def _snapshot(fn: Callable[[], Awaitable[Any]]) -> Any:
+        # Copied before any caller resumes; callers only ever see copies of it.
+        return share_response(await fn())
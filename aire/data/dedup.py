@@ -0,0 +1,378 @@
+"""Near-duplicate detection over accessor text columns with MinHash and LSH.
+
+The same real-world incident is often reported by many outlets with nearly
+the same headline and description. ``DuplicateIndex`` turns each row's text
+into word shingles, summarizes them as a MinHash signature and files the
+signature into LSH bands. Rows that share a band are candidates; candidates
+whose estimated Jaccard similarity reaches ``threshold`` are merged into one
+cluster. Adding a row only compares it with its candidates, so building the
+index stays close to linear and handles hundreds of thousands of rows.
+
+    duplicates = DuplicateIndex("incidents", threshold=0.8)
+    duplicates.update_from(accessor.incidents)      # only changed rows next time
+    duplicates.cluster_id(incident_id)              # id of the first report
+    accessor.incidents.get_by_risk_category("Bio", duplicates=duplicates)
+    accessor.get_summary(duplicates=duplicates)["incidents"]["distinct"]
+
+A cluster is identified by the id of its earliest indexed member, so ids
+stay stable as later reports join; a row that is re-indexed after an edit
+keeps its place. Rows with no text are never clustered.
+"""
+
+import re
+import threading
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .changes import DEFAULT_FULL_INTERVAL, ChangeFeed
+from .pagination import DEFAULT_PAGE_SIZE
+from .projections import resolve_columns
+from .search import SEARCH_FIELDS
+
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_NUM_PERM = 64
+DEFAULT_SHINGLE_SIZE = 3
+# Shingles hashed at once by ``signatures``; bounds its temporary arrays to
+# about ``num_perm * SIGNATURE_CHUNK * 12`` bytes.
+SIGNATURE_CHUNK = 16 * 1024
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_SHIFT = np.uint64(32)
+# Odd 64-bit multipliers that mix the word hashes of a shingle.
+_SHINGLE_MIX = np.random.default_rng(0).integers(1, 1 << 63, 16, dtype=np.uint64) | np.uint64(1)
+
+
+def shingle_hashes(
+    texts: Sequence[str], size: int = DEFAULT_SHINGLE_SIZE
+) -> Tuple[np.ndarray, np.ndarray]:
+    """64-bit hashes of the word ``size``-grams of each text, concatenated.
+
+    Returns the hashes and the number belonging to each text; a text with
+    fewer than ``size`` words is one shingle, a text without words has none.
+    """
+    words = [
+        [zlib.crc32(word.encode()) for word in _WORD.findall(text.casefold())]
+        for text in texts
+    ]
+    lengths = np.fromiter((len(w) for w in words), dtype=np.int64, count=len(words))
+    counts = np.where(lengths > 0, np.maximum(lengths - size + 1, 1), 0)
+    total = int(counts.sum())
+    if not total:
+        return np.zeros(0, dtype=np.uint64), counts
+    flat = np.fromiter(
+        (h for w in words for h in w), dtype=np.uint64, count=int(lengths.sum())
+    )
+    offsets = np.cumsum(lengths) - lengths
+    first = np.cumsum(counts) - counts
+    starts = np.repeat(offsets, counts) + np.arange(total) - np.repeat(first, counts)
+    ends = np.repeat(offsets + lengths, counts)
+    hashes = np.zeros(total, dtype=np.uint64)
+    for j in range(size):
+        index = starts + j
+        inside = index < ends
+        hashes[inside] += flat[index[inside]] * _SHINGLE_MIX[j % len(_SHINGLE_MIX)]
+    return hashes, counts
+
+
+def lsh_bands(
+    threshold: float, num_perm: int, false_positive_weight: float = 0.1
+) -> Tuple[int, int]:
+    """``(bands, rows)`` whose collision curve best separates pairs at ``threshold``.
+
+    Minimizes the weighted area of false positives below the threshold plus
+    false negatives above it. Candidates are verified before they are
+    merged, so false positives only cost time and recall is favoured.
+    """
+    grid = np.linspace(0.0, 1.0, 201)[1:-1]
+    below, above = grid[grid < threshold], grid[grid >= threshold]
+    best, best_error = (1, num_perm), float("inf")
+    for bands in range(1, num_perm + 1):
+        rows = num_perm // bands
+        if rows == 0:
+            break
+        false_positive = (1 - (1 - below ** rows) ** bands).mean() * threshold
+        false_negative = ((1 - above ** rows) ** bands).mean() * (1 - threshold)
+        error = (
+            false_positive_weight * false_positive
+            + (1 - false_positive_weight) * false_negative
+        )
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+class _Cluster:
+    __slots__ = ("members", "first")
+
+    def __init__(self, position: int):
+        self.members = {position}
+        self.first = position
+
+
+class DuplicateIndex:
+    """Incrementally maintained MinHash LSH clusters over the text of one table.
+
+    ``change_column`` and ``full_interval`` control how ``update_from``
+    finds edited and deleted rows (see ``aire.data.changes``).
+    """
+
+    def __init__(
+        self,
+        table: str = "incidents",
+        fields: Optional[Sequence[str]] = None,
+        threshold: float = DEFAULT_THRESHOLD,
+        num_perm: int = DEFAULT_NUM_PERM,
+        shingle_size: int = DEFAULT_SHINGLE_SIZE,
+        seed: int = 1,
+        change_column: Optional[str] = None,
+        full_interval: Optional[float] = DEFAULT_FULL_INTERVAL,
+    ):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+        if num_perm < 2 or shingle_size < 1:
+            raise ValueError("num_perm must be at least 2 and shingle_size at least 1")
+        self.table = table
+        self.fields = resolve_columns(table, list(fields or SEARCH_FIELDS[table]))
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.band_rows = lsh_bands(threshold, num_perm)
+
+        generator = np.random.default_rng(seed)
+        # Multiply-shift hashing: the high 32 bits of a * h + b (mod 2**64), a odd.
+        self._a = generator.integers(1, 1 << 63, num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = generator.integers(0, 1 << 63, num_perm, dtype=np.uint64)
+        self._band_mix = generator.integers(1, 1 << 63, self.band_rows, dtype=np.uint64)
+
+        self._lock = threading.RLock()
+        self._signatures = np.zeros((1024, num_perm), dtype=np.uint32)
+        self._ids: List[Any] = []
+        self._positions: Dict[Any, int] = {}
+        self._band_keys: Dict[int, List[int]] = {}
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(self.bands)]
+        self._clusters: Dict[int, _Cluster] = {}
+        self._feed = ChangeFeed(change_column, full_interval)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, row_id: Any) -> bool:
+        return row_id in self._positions
+
+    # -- signatures ------------------------------------------------------
+
+    def text(self, row: Dict[str, Any]) -> str:
+        return " ".join(str(row.get(field) or "") for field in self.fields)
+
+    def signatures(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """MinHash signatures of ``texts`` and a mask of the texts that had words."""
+        hashes, counts = shingle_hashes(texts, self.shingle_size)
+        present = counts > 0
+        result = np.full((len(texts), self.num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+        owners = np.repeat(np.arange(len(texts)), counts)
+        for start in range(0, len(hashes), SIGNATURE_CHUNK):
+            chunk = hashes[start:start + SIGNATURE_CHUNK]
+            chunk_owners = owners[start:start + SIGNATURE_CHUNK]
+            permuted = ((chunk[:, None] * self._a + self._b) >> _SHIFT).astype(np.uint32)
+            # A text's shingles are contiguous and may continue in the next chunk.
+            starts = np.flatnonzero(np.r_[True, chunk_owners[1:] != chunk_owners[:-1]])
+            rows = chunk_owners[starts]
+            result[rows] = np.minimum(result[rows], np.minimum.reduceat(permuted, starts, axis=0))
+        result[~present] = 0
+        return result, present
+
+    def _band_hashes(self, signature: np.ndarray) -> List[int]:
+        rows = self.band_rows
+        bands = signature[: self.bands * rows].reshape(self.bands, rows).astype(np.uint64)
+        return (bands * self._band_mix).sum(axis=1).tolist()
+
+    # -- maintenance -----------------------------------------------------
+
+    def add(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Index rows (replacing rows already indexed under the same id).
+
+        A replaced row keeps its position, so it stays the canonical row of
+        its cluster if it was before.
+        """
+        rows = list(rows)
+        if not rows:
+            return 0
+        signatures, present = self.signatures([self.text(row) for row in rows])
+        with self._lock:
+            for row, signature, has_text in zip(rows, signatures, present):
+                row_id = row["id"]
+                position = self._positions.get(row_id)
+                if position is not None:
+                    self._remove(row_id)
+                self._insert(row_id, signature if has_text else None, position)
+        return len(rows)
+
+    def _insert(
+        self, row_id: Any, signature: Optional[np.ndarray], position: Optional[int] = None
+    ) -> None:
+        if position is None:
+            position = len(self._ids)
+            if position == len(self._signatures):
+                grown = np.zeros((2 * position, self.num_perm), dtype=np.uint32)
+                grown[:position] = self._signatures
+                self._signatures = grown
+            self._ids.append(row_id)
+        self._positions[row_id] = position
+        self._clusters[position] = _Cluster(position)
+        if signature is None:
+            return
+        self._signatures[position] = signature
+        keys = self._band_hashes(signature)
+        self._band_keys[position] = keys
+        self._link(position, self._candidates(keys))
+        for bucket, key in zip(self._buckets, keys):
+            bucket.setdefault(key, []).append(position)
+
+    def _candidates(self, keys: List[int]) -> List[int]:
+        found = set()
+        for bucket, key in zip(self._buckets, keys):
+            found.update(bucket.get(key, ()))
+        return list(found)
+
+    def _link(self, position: int, candidates: Iterable[int], within: Optional[set] = None) -> None:
+        """Merge ``position`` with every candidate similar enough to it."""
+        cluster = self._clusters[position]
+        candidates = [
+            c for c in candidates
+            if c != position and (within is None or c in within)
+            and self._clusters[c] is not cluster
+        ]
+        if not candidates:
+            return
+        similar = self.estimate(position, candidates) >= self.threshold
+        for candidate in np.asarray(candidates)[similar].tolist():
+            other = self._clusters[candidate]
+            if other is not cluster:
+                cluster = self._merge(cluster, other)
+
+    def _merge(self, left: _Cluster, right: _Cluster) -> _Cluster:
+        if len(left.members) < len(right.members):
+            left, right = right, left
+        left.members |= right.members
+        left.first = min(left.first, right.first)
+        for member in right.members:
+            self._clusters[member] = left
+        return left
+
+    def estimate(self, position: int, others: Sequence[int]) -> np.ndarray:
+        """Estimated Jaccard similarity between one indexed position and others."""
+        with self._lock:
+            signatures = self._signatures
+            return (signatures[list(others)] == signatures[position]).mean(axis=1)
+
+    def remove(self, ids: Iterable[Any]) -> int:
+        """Drop rows; clusters they held together are split again if needed."""
+        removed = 0
+        with self._lock:
+            for row_id in ids:
+                if row_id in self._positions:
+                    self._remove(row_id)
+                    removed += 1
+        return removed
+
+    def _remove(self, row_id: Any) -> None:
+        position = self._positions.pop(row_id)
+        keys = self._band_keys.pop(position, None)
+        if keys is not None:
+            for bucket, key in zip(self._buckets, keys):
+                members = bucket[key]
+                members.remove(position)
+                if not members:
+                    del bucket[key]
+        cluster = self._clusters.pop(position)
+        cluster.members.discard(position)
+        if not cluster.members:
+            return
+        # Re-cluster the remaining members; the removed row may have been the only link.
+        remaining = cluster.members
+        for member in remaining:
+            self._clusters[member] = _Cluster(member)
+        for member in sorted(remaining):
+            self._link(member, self._candidates(self._band_keys[member]), within=remaining)
+
+    def update_from(
+        self, accessor: Any, page_size: int = DEFAULT_PAGE_SIZE, full: bool = False
+    ) -> int:
+        """Index rows of ``accessor``'s table changed since the last update.
+
+        Only the id and text columns are transferred; ``full`` re-reads every
+        row and drops deleted ones.
+        """
+        written, _ = self._feed.pull_from(
+            accessor,
+            ("id",) + self.fields,
+            apply=self.add,
+            remove=self.remove,
+            known_ids=self._known_ids,
+            page_size=page_size,
+            full=full,
+        )
+        return written
+
+    def _known_ids(self) -> List[Any]:
+        with self._lock:
+            return list(self._positions)
+
+    # -- queries ---------------------------------------------------------
+
+    def cluster_id(self, row_id: Any) -> Optional[Any]:
+        """Id of the earliest indexed row in ``row_id``'s cluster, or ``None``."""
+        with self._lock:
+            position = self._positions.get(row_id)
+            if position is None:
+                return None
+            return self._ids[self._clusters[position].first]
+
+    def cluster_ids(self, ids: Iterable[Any]) -> Dict[Any, Any]:
+        """Cluster id of every indexed id in ``ids``."""
+        with self._lock:
+            return {
+                row_id: self._ids[self._clusters[self._positions[row_id]].first]
+                for row_id in ids
+                if row_id in self._positions
+            }
+
+    def cluster(self, row_id: Any) -> List[Any]:
+        """All ids in ``row_id``'s cluster, earliest first."""
+        with self._lock:
+            position = self._positions.get(row_id)
+            if position is None:
+                return []
+            return [self._ids[member] for member in sorted(self._clusters[position].members)]
+
+    def clusters(self, min_size: int = 2) -> Dict[Any, List[Any]]:
+        """Clusters with at least ``min_size`` members, keyed by cluster id."""
+        with self._lock:
+            seen = {id(cluster): cluster for cluster in self._clusters.values()}
+            return {
+                self._ids[cluster.first]: [self._ids[m] for m in sorted(cluster.members)]
+                for cluster in sorted(seen.values(), key=lambda c: c.first)
+                if len(cluster.members) >= min_size
+            }
+
+    def distinct_count(self) -> int:
+        """Number of clusters, i.e. indexed rows with duplicates counted once."""
+        with self._lock:
+            return len({id(cluster) for cluster in self._clusters.values()})
+
+    def deduplicate(self, rows: Iterable[Any]) -> List[Any]:
+        """Keep the first row of each cluster; rows not in the index are kept."""
+        seen = set()
+        result = []
+        with self._lock:
+            for row in rows:
+                position = self._positions.get(row.get("id"))
+                if position is not None:
+                    cluster = id(self._clusters[position])
+                    if cluster in seen:
+                        continue
+                    seen.add(cluster)
+                result.append(row)
+        return result
@@ -0,0 +1,25 @@
+"""Escaping of user input placed into PostgREST filters."""
+
+_RESERVED = set(',.:()"\\ ')
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards so ``value`` only matches itself.
+
+    PostgREST treats ``*`` as an alias for ``%`` and offers no way to escape
+    it, so a literal ``*`` is matched with the single-character wildcard.
+    """
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped.replace("*", "_")
+
+
+def contains_pattern(value: str) -> str:
+    """ILIKE pattern matching ``value`` anywhere in a column."""
+    return f"%{escape_like(value)}%"
+
+
+def quote_value(value: str) -> str:
+    """Quote a value for use inside ``or``/``and``/``in`` filter expressions."""
+    if not any(char in _RESERVED for char in value):
+        return value
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
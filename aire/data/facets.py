@@ -0,0 +1,279 @@
+"""In-memory facet index over array (and low-cardinality) columns.
+
+Each row gets a position and every ``(column, value)`` pair an inverted
+bitmap, stored as a Python ``int`` with bit ``i`` set when row ``i`` has the
+value. Combined facet filters are then a handful of ``&``/``|`` operations
+on those ints, and facet counts are popcounts, so the UI can filter on
+several facets at once and show live counts without any round trips.
+
+    index = FacetIndex("evals")
+    index.update_from(accessor.evals)
+    hits = index.filter({"risk_cats": ["Bio"], "models": ["gpt-4o", "claude-3"]})
+    index.ids(hits)
+    index.facet_counts({"risk_cats": ["Bio"]})
+
+Within one column the values are OR-ed (AND-ed with ``match_all=True``);
+across columns the conditions are AND-ed.
+"""
+
+import threading
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .changes import DEFAULT_FULL_INTERVAL, ChangeFeed
+from .pagination import DEFAULT_PAGE_SIZE
+from .projections import resolve_columns
+from .storage.replica import ARRAY_COLUMNS
+
+Filters = Mapping[str, Sequence[Any]]
+
+if hasattr(int, "bit_count"):
+    _popcount = int.bit_count
+else:  # Python < 3.10
+    def _popcount(bitmap: int) -> int:
+        return bin(bitmap).count("1")
+
+
+def _bitmap(positions: Iterable[int]) -> int:
+    """Build a bitmap from positions in one pass over a byte buffer."""
+    positions = list(positions)
+    if not positions:
+        return 0
+    buffer = bytearray(max(positions) // 8 + 1)
+    for position in positions:
+        buffer[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def _positions(bitmap: int) -> np.ndarray:
+    """Set bit positions of ``bitmap`` in ascending order."""
+    buffer = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    bits = np.unpackbits(np.frombuffer(buffer, dtype=np.uint8), bitorder="little")
+    return np.flatnonzero(bits)
+
+
+def _values(value: Any) -> Tuple[Any, ...]:
+    if value is None:
+        return ()
+    if isinstance(value, (list, tuple, set)):
+        return tuple(dict.fromkeys(value))
+    return (value,)
+
+
+class FacetIndex:
+    """Inverted bitmaps for the facet columns of one table.
+
+    ``columns`` defaults to the table's array columns; scalar columns such
+    as ``quarter`` can be added and behave like one-element arrays. The
+    index is safe to query while another thread updates it.
+    ``change_column`` and ``full_interval`` control how ``update_from``
+    finds edited and deleted rows (see ``aire.data.changes``).
+    """
+
+    def __init__(
+        self,
+        table: str,
+        columns: Optional[Sequence[str]] = None,
+        change_column: Optional[str] = None,
+        full_interval: Optional[float] = DEFAULT_FULL_INTERVAL,
+    ):
+        self.table = table
+        self.columns = resolve_columns(table, list(columns or ARRAY_COLUMNS[table]))
+        if not self.columns:
+            raise ValueError(f"{table} has no facet columns")
+        self._lock = threading.RLock()
+        self._ids: List[Any] = []
+        self._position: Dict[Any, int] = {}
+        self._row_values: List[Optional[Dict[str, Tuple[Any, ...]]]] = []
+        self._live = 0
+        self._bitmaps: Dict[str, Dict[Any, int]] = {column: {} for column in self.columns}
+        self._feed = ChangeFeed(change_column, full_interval)
+
+    def __len__(self) -> int:
+        return _popcount(self._live)
+
+    def __contains__(self, row_id: Any) -> bool:
+        with self._lock:
+            position = self._position.get(row_id)
+            return position is not None and bool(self._live >> position & 1)
+
+    @property
+    def all(self) -> int:
+        """Bitmap of every indexed row."""
+        return self._live
+
+    def values(self, column: str) -> List[Any]:
+        """Distinct values of ``column`` present in at least one row."""
+        with self._lock:
+            return [
+                value for value, bitmap in self._bitmaps[column].items() if bitmap & self._live
+            ]
+
+    def add(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Index rows, replacing any already indexed with the same id."""
+        new_positions: Dict[str, Dict[Any, List[int]]] = {column: {} for column in self.columns}
+        written = 0
+        # The last occurrence of an id within one call wins.
+        rows = list({row["id"]: row for row in rows}.values())
+        with self._lock:
+            for row in rows:
+                row_id = row["id"]
+                if row_id in self._position:
+                    self._drop(self._position[row_id])
+                position = len(self._ids)
+                self._ids.append(row_id)
+                self._position[row_id] = position
+                values = {column: _values(row.get(column)) for column in self.columns}
+                self._row_values.append(values)
+                for column, items in values.items():
+                    for value in items:
+                        new_positions[column].setdefault(value, []).append(position)
+                written += 1
+            if not written:
+                return 0
+
+            start = len(self._ids) - written
+            self._live |= ((1 << written) - 1) << start
+            for column, by_value in new_positions.items():
+                bitmaps = self._bitmaps[column]
+                for value, positions in by_value.items():
+                    bitmaps[value] = bitmaps.get(value, 0) | _bitmap(positions)
+        return written
+
+    def remove(self, ids: Iterable[Any]) -> int:
+        """Drop rows from the index; unknown ids are ignored."""
+        removed = 0
+        with self._lock:
+            for row_id in ids:
+                position = self._position.pop(row_id, None)
+                if position is not None:
+                    self._drop(position)
+                    removed += 1
+        return removed
+
+    def _drop(self, position: int) -> None:
+        mask = ~(1 << position)
+        self._live &= mask
+        values = self._row_values[position] or {}
+        for column, items in values.items():
+            bitmaps = self._bitmaps[column]
+            for value in items:
+                bitmaps[value] &= mask
+        self._row_values[position] = None
+
+    def compact(self) -> None:
+        """Renumber live rows so removed and replaced rows stop using memory."""
+        with self._lock:
+            rows = [
+                {"id": self._ids[position], **values}
+                for position, values in enumerate(self._row_values)
+                if values is not None
+            ]
+            self._ids, self._position, self._row_values, self._live = [], {}, [], 0
+            self._bitmaps = {column: {} for column in self.columns}
+            self.add(rows)
+
+    def update_from(
+        self, accessor: Any, page_size: int = DEFAULT_PAGE_SIZE, full: bool = False
+    ) -> int:
+        """Index rows of ``accessor``'s table changed since the last update.
+
+        Only ``id`` and the facet columns are transferred; ``full`` re-reads
+        every row and drops deleted ones.
+        """
+        written, _ = self._feed.pull_from(
+            accessor,
+            ("id",) + tuple(self.columns),
+            apply=self.add,
+            remove=self.remove,
+            known_ids=self._known_ids,
+            page_size=page_size,
+            full=full,
+        )
+        return written
+
+    def _known_ids(self) -> List[Any]:
+        with self._lock:
+            return list(self._position)
+
+    def match(self, column: str, values: Sequence[Any], match_all: bool = False) -> int:
+        """Bitmap of rows having any (or, with ``match_all``, every) value."""
+        with self._lock:
+            bitmaps = self._bitmaps[column]
+            if match_all:
+                result = self._live
+                for value in values:
+                    result &= bitmaps.get(value, 0)
+                return result
+            result = 0
+            for value in values:
+                result |= bitmaps.get(value, 0)
+            return result & self._live
+
+    def filter(
+        self,
+        filters: Filters,
+        match_all: bool = False,
+        exclude: Optional[Filters] = None,
+        within: Optional[int] = None,
+    ) -> int:
+        """Bitmap of rows satisfying every column's condition in ``filters``.
+
+        Rows having any value listed in ``exclude`` are removed. ``within``
+        restricts the result to an earlier bitmap.
+        """
+        with self._lock:
+            result = self._live if within is None else within & self._live
+            for column, values in filters.items():
+                if values:
+                    result &= self.match(column, values, match_all)
+            for column, values in (exclude or {}).items():
+                result &= ~self.match(column, values)
+            return result
+
+    def count(self, bitmap: int) -> int:
+        """Number of rows in a bitmap."""
+        return _popcount(bitmap)
+
+    def ids(self, bitmap: int, limit: Optional[int] = None) -> List[Any]:
+        """Ids of the rows in ``bitmap`` in index order."""
+        positions = _positions(bitmap)[:limit].tolist()
+        with self._lock:
+            ids = self._ids
+            return [ids[position] for position in positions]
+
+    def counts(self, column: str, within: Optional[int] = None) -> Dict[Any, int]:
+        """Rows per value of ``column``, optionally within a bitmap, largest first."""
+        with self._lock:
+            scope = self._live if within is None else within & self._live
+            counts = {
+                value: _popcount(bitmap & scope)
+                for value, bitmap in self._bitmaps[column].items()
+            }
+        return dict(sorted(
+            ((value, n) for value, n in counts.items() if n),
+            key=lambda item: item[1],
+            reverse=True,
+        ))
+
+    def facet_counts(
+        self,
+        filters: Optional[Filters] = None,
+        match_all: bool = False,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Dict[Any, int]]:
+        """Live counts for every facet column given the active ``filters``.
+
+        Each column's counts apply the filters on the *other* columns only,
+        so the UI can show how many rows each alternative value would give.
+        """
+        filters = filters or {}
+        with self._lock:
+            return {
+                column: self.counts(column, self.filter(
+                    {other: values for other, values in filters.items() if other != column},
+                    match_all,
+                ))
+                for column in (columns or self.columns)
+            }
@@ -0,0 +1,160 @@
+"""Columnar materialization of accessor results.
+
+``rows_to_frame`` turns accessor rows into a typed pandas DataFrame: date
+columns are parsed once and low-cardinality text columns become categoricals.
+Array columns (``risk_cats``, ``models`` ...) stay as lists in the frame and
+can be turned into long (``explode_list``) or indicator (``indicator_matrix``)
+form. ``rows_to_arrow`` produces an Arrow table with the array columns
+dictionary-encoded, and ``ParquetSnapshot`` caches whole tables on disk so
+they reload without querying Supabase.
+"""
+
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+from .manifests import read_manifest, require_pyarrow, write_manifest
+from .projections import CATEGORY_COLUMNS, DATE_COLUMNS
+from .storage.replica import ARRAY_COLUMNS, TABLES
+
+DEFAULT_SNAPSHOT_DIR = os.path.join("data", "snapshots")
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+def rows_to_frame(table: str, rows: Iterable[Dict[str, Any]]) -> pd.DataFrame:
+    """Build a typed DataFrame from accessor rows (dicts or ``Record``s)."""
+    frame = pd.DataFrame.from_records([row if type(row) is dict else dict(row) for row in rows])
+    for column in DATE_COLUMNS.get(table, ()):
+        if column in frame.columns:
+            frame[column] = pd.to_datetime(frame[column], errors="coerce")
+    for column in CATEGORY_COLUMNS.get(table, ()):
+        if column in frame.columns:
+            frame[column] = frame[column].astype("category")
+    for column in ARRAY_COLUMNS.get(table, ()):
+        if column in frame.columns:
+            frame[column] = frame[column].map(
+                lambda v: list(v) if isinstance(v, (list, tuple)) else []
+            )
+    return frame
+
+
+def explode_list(frame: pd.DataFrame, column: str, key: str = "id") -> pd.DataFrame:
+    """Long ``(key, value)`` form of an array column with categorical values."""
+    long = frame[[key, column]].explode(column).dropna(subset=[column])
+    long[column] = long[column].astype("category")
+    return long.reset_index(drop=True)
+
+
+def indicator_matrix(frame: pd.DataFrame, column: str, key: str = "id") -> pd.DataFrame:
+    """Boolean matrix with one row per ``key`` and one column per array value."""
+    long = explode_list(frame, column, key)
+    matrix = pd.crosstab(long[key], long[column]).astype(bool)
+    return matrix.reindex(frame[key], fill_value=False)
+
+
+def _dictionary_list_array(values: Sequence[Optional[List[str]]]):
+    """Arrow ``list<dictionary<int32, string>>`` array from Python lists."""
+    pa = require_pyarrow()
+    offsets = [0]
+    flat: List[str] = []
+    for items in values:
+        flat.extend(items or [])
+        offsets.append(len(flat))
+    dictionary = pa.array(flat, type=pa.string()).dictionary_encode()
+    return pa.ListArray.from_arrays(pa.array(offsets, type=pa.int32()), dictionary)
+
+
+def frame_to_arrow(table: str, frame: pd.DataFrame):
+    """Arrow table from a typed frame, dictionary-encoding array columns."""
+    pa = require_pyarrow()
+    array_columns = [c for c in ARRAY_COLUMNS.get(table, ()) if c in frame.columns]
+    arrow = pa.Table.from_pandas(frame.drop(columns=array_columns), preserve_index=False)
+    for column in array_columns:
+        arrow = arrow.append_column(column, _dictionary_list_array(frame[column].tolist()))
+    return arrow
+
+
+def rows_to_arrow(table: str, rows: Iterable[Dict[str, Any]]):
+    """Build an Arrow table from accessor rows."""
+    return frame_to_arrow(table, rows_to_frame(table, rows))
+
+
+class ParquetSnapshot:
+    """On-disk Parquet cache of whole tables.
+
+    ``manifest.json`` records when each table was saved, so callers can
+    reload a fresh snapshot and only re-query Supabase once it is stale.
+    """
+
+    def __init__(self, directory: str = DEFAULT_SNAPSHOT_DIR):
+        self.directory = directory
+
+    def path(self, table: str) -> str:
+        return os.path.join(self.directory, f"{table}.parquet")
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.directory, "manifest.json")
+
+    def manifest(self) -> Dict[str, Any]:
+        return read_manifest(self.manifest_path, version=SNAPSHOT_FORMAT_VERSION)
+
+    def _write_manifest(self, manifest: Dict[str, Any]) -> None:
+        manifest["version"] = SNAPSHOT_FORMAT_VERSION
+        write_manifest(self.manifest_path, manifest)
+
+    def age(self, table: str) -> Optional[float]:
+        """Seconds since ``table`` was saved, or ``None`` if it never was."""
+        entry = self.manifest().get("tables", {}).get(table)
+        if entry is None or not os.path.exists(self.path(table)):
+            return None
+        return time.time() - entry["saved_at"]
+
+    def save_frame(self, table: str, frame: pd.DataFrame) -> int:
+        """Write a table's frame to Parquet and record it in the manifest."""
+        pq = require_pyarrow(parquet=True).parquet
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self.path(table) + ".tmp"
+        pq.write_table(frame_to_arrow(table, frame), tmp_path)
+        os.replace(tmp_path, self.path(table))
+
+        manifest = self.manifest()
+        manifest.setdefault("tables", {})[table] = {
+            "rows": len(frame),
+            "saved_at": time.time(),
+            "saved_at_iso": datetime.now(timezone.utc).isoformat(),
+        }
+        self._write_manifest(manifest)
+        return len(frame)
+
+    def save(self, accessor: Any, tables: Sequence[str] = TABLES) -> Dict[str, int]:
+        """Stream tables from a ``DataAccessor`` and snapshot them."""
+        return {
+            table: self.save_frame(table, getattr(accessor, table).to_frame())
+            for table in tables
+        }
+
+    def load_arrow(self, table: str, columns: Optional[Sequence[str]] = None):
+        """Read a snapshotted table as Arrow, optionally only some columns."""
+        pq = require_pyarrow(parquet=True).parquet
+        return pq.read_table(self.path(table), columns=list(columns) if columns else None)
+
+    def load_frame(self, table: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Read a snapshotted table as a DataFrame."""
+        frame = self.load_arrow(table, columns).to_pandas()
+        for column in ARRAY_COLUMNS.get(table, ()):
+            if column in frame.columns:
+                frame[column] = frame[column].map(lambda v: [] if v is None else list(v))
+        return frame
+
+    def frame(self, accessor: Any, table: str, max_age: Optional[float] = 3600.0) -> pd.DataFrame:
+        """Load ``table`` from the snapshot, refreshing it first if stale."""
+        age = self.age(table)
+        if age is None or (max_age is not None and age > max_age):
+            frame = getattr(accessor, table).to_frame()
+            self.save_frame(table, frame)
+            return frame
+        return self.load_frame(table)
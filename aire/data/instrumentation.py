@@ -0,0 +1,325 @@
+"""Per-query instrumentation for the database clients.
+
+Every query the accessors run goes through ``SupabaseDB.execute`` (or the
+replica/async equivalents), which reports a ``QueryEvent`` to an
+``Instrumentation``: the table, the query's shape (the request with every
+filter value replaced by ``?``), latency, rows returned and response bytes.
+Events feed per-table histograms that export in the Prometheus text format,
+per-shape totals for finding hot paths, a slow-query log and any hooks
+registered with ``add_hook``.
+
+Response sizes come from an ``httpx`` response hook installed on the shared
+clients (see ``storage/client.py``); they are ``None`` for the replica.
+"""
+
+import contextvars
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+Hook = Callable[["QueryEvent"], None]
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ROW_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000)
+BYTE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+DEFAULT_SLOW_QUERY_SECONDS = 1.0
+
+_response_bytes: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar(
+    "aire_response_bytes", default=None
+)
+
+# ``op.value`` inside ``or``/``and`` expressions; values may be quoted.
+_NESTED_FILTER = re.compile(r'(\w+)\.(not\.)?(\w+)\.(?:"(?:[^"\\]|\\.)*"|\([^)]*\)|\{[^}]*\}|[^,()]+)')
+_KEPT_PARAMS = {"select", "order"}
+
+
+@dataclass
+class QueryEvent:
+    """One executed query."""
+
+    table: str
+    shape: str
+    latency: float
+    rows: int
+    bytes: Optional[int] = None
+    error: Optional[str] = None
+
+
+def query_table(query: Any) -> str:
+    """Name of the table a built query targets."""
+    table = getattr(query, "table", None)
+    if isinstance(table, str):
+        return table
+    request = getattr(query, "request", None)
+    if request is not None:
+        return str(request.path).rstrip("/").rsplit("/", 1)[-1]
+    return "unknown"
+
+
+def _filter_shape(value: str) -> str:
+    operator, _, _ = value.partition(".")
+    if operator == "not":
+        operator = "not." + value.split(".")[1]
+    return f"{operator}.?"
+
+
+def query_shape(query: Any) -> str:
+    """Describe a query without its filter values, e.g. ``GET quarter=eq.?&limit=?``."""
+    request = getattr(query, "request", None)
+    if request is not None:
+        parts = []
+        for name, value in request.params.multi_items():
+            if name in _KEPT_PARAMS:
+                parts.append(f"{name}={value}")
+            elif name in ("limit", "offset"):
+                parts.append(f"{name}=?")
+            elif name in ("or", "and"):
+                parts.append(f"{name}=" + _NESTED_FILTER.sub(
+                    lambda m: f"{m.group(1)}.{m.group(2) or ''}{m.group(3)}.?", value
+                ))
+            else:
+                parts.append(f"{name}={_filter_shape(value)}")
+        return f"{request.http_method} " + "&".join(parts)
+    if hasattr(query, "to_sql"):
+        return query.to_sql()[0]
+    return type(query).__name__
+
+
+def _row_count(response: Any) -> int:
+    data = getattr(response, "data", None)
+    if isinstance(data, list):
+        return len(data)
+    return 0 if data is None else 1
+
+
+def record_response_size(response: Any) -> None:
+    """``httpx`` response hook noting the body size for the running query."""
+    response.read()
+    _response_bytes.set(len(response.content))
+
+
+async def arecord_response_size(response: Any) -> None:
+    """Async twin of ``record_response_size``."""
+    await response.aread()
+    _response_bytes.set(len(response.content))
+
+
+def _format_number(value: float) -> str:
+    """Exact text for a sample or bound: integral values as integers, else ``repr``."""
+    value = float(value)
+    if value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class Histogram:
+    """Cumulative histogram with fixed upper bounds, one series per label value."""
+
+    def __init__(self, name: str, help: str, buckets: Sequence[float], label: str = "table"):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        self.label = label
+        self._series: Dict[str, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, label_value: str, value: float) -> None:
+        counts, totals = self._series.setdefault(
+            label_value, ([0] * (len(self.buckets) + 1), [0.0])
+        )
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+        counts[-1] += 1
+        totals[0] += value
+
+    def count(self, label_value: str) -> int:
+        series = self._series.get(label_value)
+        return series[0][-1] if series else 0
+
+    def quantile(self, label_value: str, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the ``q`` quantile (0..1)."""
+        series = self._series.get(label_value)
+        if not series or not series[0][-1]:
+            return None
+        counts = series[0]
+        target = q * counts[-1]
+        for bound, cumulative in zip(self.buckets, counts):
+            if cumulative >= target:
+                return bound
+        return float("inf")
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for label_value, (counts, totals) in sorted(self._series.items()):
+            label = f'{self.label}="{label_value}"'
+            for bound, cumulative in zip(self.buckets, counts):
+                yield f'{self.name}_bucket{{{label},le="{_format_number(bound)}"}} {cumulative}'
+            yield f'{self.name}_bucket{{{label},le="+Inf"}} {counts[-1]}'
+            yield f"{self.name}_sum{{{label}}} {_format_number(totals[0])}"
+            yield f"{self.name}_count{{{label}}} {counts[-1]}"
+
+
+@dataclass
+class ShapeStats:
+    """Running totals for one query shape."""
+
+    table: str
+    shape: str
+    calls: int = 0
+    errors: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+    rows: int = 0
+    bytes: int = 0
+
+
+class Instrumentation:
+    """Collects ``QueryEvent``s from database clients.
+
+    Queries slower than ``slow_query_seconds`` are logged at WARNING on the
+    ``aire.data.instrumentation`` logger; ``None`` disables the slow log.
+    Hooks run synchronously after each query and must not raise (errors
+    are logged and swallowed).
+    """
+
+    def __init__(self, slow_query_seconds: Optional[float] = DEFAULT_SLOW_QUERY_SECONDS):
+        self.slow_query_seconds = slow_query_seconds
+        self._lock = threading.Lock()
+        self._hooks: List[Hook] = []
+        self._shapes: Dict[Tuple[str, str], ShapeStats] = {}
+        self._errors: Dict[str, int] = {}
+        self.latency = Histogram(
+            "aire_query_duration_seconds", "Query latency in seconds.", LATENCY_BUCKETS
+        )
+        self.rows = Histogram("aire_query_rows", "Rows returned per query.", ROW_BUCKETS)
+        self.bytes = Histogram(
+            "aire_query_response_bytes", "Response body size per query.", BYTE_BUCKETS
+        )
+
+    def add_hook(self, hook: Hook) -> None:
+        with self._lock:
+            self._hooks.append(hook)
+
+    def remove_hook(self, hook: Hook) -> None:
+        with self._lock:
+            self._hooks.remove(hook)
+
+    def run(self, table: str, query: Any, execute: Callable[[], Any]) -> Any:
+        """Run ``execute()`` for ``query`` and record it."""
+        token = _response_bytes.set(None)
+        start = time.perf_counter()
+        try:
+            response = execute()
+        except Exception as exc:
+            self._finish(table, query, start, None, type(exc).__name__)
+            raise
+        finally:
+            size = _response_bytes.get()
+            _response_bytes.reset(token)
+        self._finish(table, query, start, response, None, size)
+        return response
+
+    async def arun(self, table: str, query: Any, execute: Callable[[], Awaitable[Any]]) -> Any:
+        """Async twin of ``run``."""
+        token = _response_bytes.set(None)
+        start = time.perf_counter()
+        try:
+            response = await execute()
+        except Exception as exc:
+            self._finish(table, query, start, None, type(exc).__name__)
+            raise
+        finally:
+            size = _response_bytes.get()
+            _response_bytes.reset(token)
+        self._finish(table, query, start, response, None, size)
+        return response
+
+    def _finish(
+        self,
+        table: str,
+        query: Any,
+        start: float,
+        response: Any,
+        error: Optional[str],
+        size: Optional[int] = None,
+    ) -> None:
+        event = QueryEvent(
+            table=table,
+            shape=query_shape(query),
+            latency=time.perf_counter() - start,
+            rows=_row_count(response),
+            bytes=size,
+            error=error,
+        )
+        self.record(event)
+
+    def record(self, event: QueryEvent) -> None:
+        """Add an event to the metrics, slow log and hooks."""
+        with self._lock:
+            self.latency.observe(event.table, event.latency)
+            stats = self._shapes.get((event.table, event.shape))
+            if stats is None:
+                stats = self._shapes[(event.table, event.shape)] = ShapeStats(event.table, event.shape)
+            stats.calls += 1
+            stats.total_latency += event.latency
+            stats.max_latency = max(stats.max_latency, event.latency)
+            if event.error:
+                stats.errors += 1
+                self._errors[event.table] = self._errors.get(event.table, 0) + 1
+            else:
+                self.rows.observe(event.table, event.rows)
+                stats.rows += event.rows
+                if event.bytes is not None:
+                    self.bytes.observe(event.table, event.bytes)
+                    stats.bytes += event.bytes
+            hooks = list(self._hooks)
+
+        if self.slow_query_seconds is not None and event.latency >= self.slow_query_seconds:
+            logger.warning(
+                "Slow query on %s took %.3fs (%d rows, %s bytes): %s",
+                event.table, event.latency, event.rows, event.bytes, event.shape,
+            )
+        for hook in hooks:
+            try:
+                hook(event)
+            except Exception:
+                logger.exception("Query hook %r failed", hook)
+
+    def top_shapes(self, limit: int = 10, by: str = "total_latency") -> List[ShapeStats]:
+        """Query shapes with the highest ``by`` (``total_latency``, ``calls``, ``rows`` ...)."""
+        with self._lock:
+            shapes = list(self._shapes.values())
+        return sorted(shapes, key=lambda stats: getattr(stats, by), reverse=True)[:limit]
+
+    def prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            lines = [*self.latency.render(), *self.rows.render(), *self.bytes.render()]
+            lines.append("# HELP aire_query_errors_total Queries that raised.")
+            lines.append("# TYPE aire_query_errors_total counter")
+            for table, errors in sorted(self._errors.items()):
+                lines.append(f'aire_query_errors_total{{table="{table}"}} {errors}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Forget all recorded metrics (hooks are kept)."""
+        with self._lock:
+            self._shapes.clear()
+            self._errors.clear()
+            for histogram in (self.latency, self.rows, self.bytes):
+                histogram._series.clear()
+
+
+_default = Instrumentation()
+
+
+def get_instrumentation() -> Instrumentation:
+    """Process-wide ``Instrumentation`` used by clients not given their own."""
+    return _default
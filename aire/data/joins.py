@@ -0,0 +1,254 @@
+"""Local hash joins between ``evals``, ``versions`` and ``epoch_models``.
+
+The three tables are linked by model name (``evals.models`` is an array,
+``versions.name`` and ``epoch_models.model`` are scalars), but the names are
+written inconsistently ("Claude 3.5 Sonnet", "claude-3.5-sonnet" ...). The
+``JoinEngine`` loads each table once, normalizes every name into an
+interned key and indexes rows by key, so cross-table questions are answered
+in memory in one pass instead of one ``get_by_model`` request per model.
+Indexed rows keep their original names and carry their keys in
+``KEY_FIELD``:
+
+    engine = JoinEngine(accessor)
+    large = lambda m: (m.get("parameters") or 0) > 1e11
+    evals = engine.semi_join("evals", "epoch_models", where=large)
+    by_org = engine.group_by(
+        engine.join("evals", "epoch_models", where={"epoch_models": large}),
+        key=lambda row: row["epoch_models"].get("organization"),
+    )
+"""
+
+import itertools
+import re
+import sys
+import threading
+import unicodedata
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from .projections import Columns, resolve_columns
+
+Row = Dict[str, Any]
+Predicate = Callable[[Row], bool]
+
+# Column holding the model name(s) in each joinable table.
+JOIN_KEYS: Dict[str, str] = {
+    "evals": "models",
+    "versions": "name",
+    "epoch_models": "model",
+}
+
+# Field added to every indexed row with its join keys, after aliases.
+KEY_FIELD = "model_keys"
+
+# Whitespace, underscores, slashes, colons, Unicode dashes and dots that are
+# not decimal points (so "3.5" survives but "o1.preview" does not).
+_SEPARATORS = re.compile(r"(?:[\s_/:\u2010-\u2015-]|(?<!\d)\.|\.(?!\d))+")
+
+
+def normalize_model_name(name: str) -> str:
+    """Canonical, interned join key for a model name.
+
+    Case, Unicode forms and separators are unified:
+    ``"Claude 3.5 Sonnet"``, ``"claude_3.5_sonnet"`` and
+    ``"CLAUDE-3.5-SONNET "`` all become ``"claude-3.5-sonnet"``.
+    """
+    key = unicodedata.normalize("NFKC", name).casefold().strip()
+    key = _SEPARATORS.sub("-", key).strip("-")
+    return sys.intern(key)
+
+
+def _keys(value: Any, key: Callable[[str], str] = normalize_model_name) -> Tuple[str, ...]:
+    if value is None:
+        return ()
+    names = value if isinstance(value, (list, tuple, set)) else (value,)
+    return tuple(dict.fromkeys(
+        key(name) for name in names if isinstance(name, str) and name.strip()
+    ))
+
+
+class KeyIndex:
+    """Rows of one table indexed by normalized model key.
+
+    Each row is copied with its keys in ``KEY_FIELD``; rows without a usable
+    model name are kept in ``keyless``.
+    """
+
+    def __init__(
+        self,
+        table: str,
+        key_column: str,
+        rows: Sequence[Row],
+        key: Callable[[str], str] = normalize_model_name,
+    ):
+        self.table = table
+        self.key_column = key_column
+        self.rows = [{**row, KEY_FIELD: _keys(row.get(key_column), key)} for row in rows]
+        self.by_key: Dict[str, List[Row]] = {}
+        self.keyless: List[Row] = []
+        for row in self.rows:
+            for row_key in row[KEY_FIELD]:
+                self.by_key.setdefault(row_key, []).append(row)
+            if not row[KEY_FIELD]:
+                self.keyless.append(row)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def lookup(self, key: str, where: Optional[Predicate] = None) -> List[Row]:
+        rows = self.by_key.get(key, [])
+        return [row for row in rows if where(row)] if where else rows
+
+
+class JoinEngine:
+    """Loads joinable tables from a ``DataAccessor`` and joins them locally.
+
+    ``aliases`` maps extra spellings to a canonical name before
+    normalization (e.g. ``{"GPT-4 Omni": "GPT-4o"}``); ``key_columns``
+    overrides ``JOIN_KEYS``.
+    """
+
+    def __init__(
+        self,
+        accessor: Any,
+        key_columns: Optional[Mapping[str, str]] = None,
+        aliases: Optional[Mapping[str, str]] = None,
+    ):
+        self.accessor = accessor
+        self.key_columns = {**JOIN_KEYS, **(key_columns or {})}
+        self._aliases: Dict[str, str] = {}
+        self._indexes: Dict[str, KeyIndex] = {}
+        self._lock = threading.Lock()
+        for alias, canonical in (aliases or {}).items():
+            self.add_alias(alias, canonical)
+
+    def add_alias(self, alias: str, canonical: str) -> None:
+        """Treat ``alias`` as another spelling of ``canonical``."""
+        self._aliases[normalize_model_name(alias)] = normalize_model_name(canonical)
+        self._indexes.clear()
+
+    def key(self, name: str) -> str:
+        """Join key for a model name, after aliases."""
+        key = normalize_model_name(name)
+        return self._aliases.get(key, key)
+
+    def load(self, table: str, columns: Columns = None, reload: bool = False) -> KeyIndex:
+        """Fetch ``table`` (every column by default) and index it by model key."""
+        with self._lock:
+            index = self._indexes.get(table)
+            if index is not None and not reload:
+                return index
+        key_column = self.key_columns[table]
+        if columns is not None:
+            names = resolve_columns(table, columns)
+            if "*" not in names and key_column not in names:
+                columns = names + (key_column,)
+        rows = getattr(self.accessor, table).iter_all(columns=columns)
+        return self.add_rows(table, rows)
+
+    def add_rows(self, table: str, rows: Iterable[Row]) -> KeyIndex:
+        """Index already fetched rows instead of loading them from the accessor."""
+        index = KeyIndex(table, self.key_columns[table], list(rows), key=self.key)
+        with self._lock:
+            self._indexes[table] = index
+        return index
+
+    def index(self, table: str) -> KeyIndex:
+        return self._indexes.get(table) or self.load(table)
+
+    def models(self, table: str) -> List[str]:
+        """Distinct model keys appearing in ``table``."""
+        return list(self.index(table).by_key)
+
+    def join(
+        self,
+        *tables: str,
+        where: Optional[Mapping[str, Predicate]] = None,
+        how: str = "inner",
+    ) -> Iterator[Row]:
+        """Join ``tables`` on model key.
+
+        Yields one ``{"model": key, table: row, ...}`` per combination of
+        matching rows. With ``how="left"`` every row of the first table is
+        kept and missing partners are ``None``; rows with no model name are
+        yielded last with ``"model": None``. ``where`` filters each table's
+        rows before joining.
+        """
+        if len(tables) < 2:
+            raise ValueError("join needs at least two tables")
+        if how not in ("inner", "left"):
+            raise ValueError(f"Unsupported join type: {how!r}")
+        where = where or {}
+        indexes = [self.index(table) for table in tables]
+
+        if how == "inner":
+            # Drive from the table with the fewest keys; probe the others.
+            driver = min(indexes, key=lambda index: len(index.by_key))
+            keys = [key for key in driver.by_key if all(key in i.by_key for i in indexes)]
+        else:
+            keys = list(indexes[0].by_key)
+
+        for key in keys:
+            groups = []
+            for table, index in zip(tables, indexes):
+                rows = index.lookup(key, where.get(table))
+                if not rows:
+                    if how == "inner" or table == tables[0]:
+                        break
+                    rows = [None]
+                groups.append(rows)
+            else:
+                for combination in itertools.product(*groups):
+                    joined: Row = {"model": key}
+                    joined.update(zip(tables, combination))
+                    yield joined
+
+        if how == "left":
+            first = where.get(tables[0])
+            for row in indexes[0].keyless:
+                if not first or first(row):
+                    joined = {"model": None, tables[0]: row}
+                    joined.update((table, None) for table in tables[1:])
+                    yield joined
+
+    def semi_join(
+        self,
+        table: str,
+        other: str,
+        where: Optional[Predicate] = None,
+        table_where: Optional[Predicate] = None,
+    ) -> List[Row]:
+        """Rows of ``table`` sharing a model with a row of ``other`` matching ``where``.
+
+        Each row is returned once, in table order.
+        """
+        other_index = self.index(other)
+        keys = {
+            key for key, rows in other_index.by_key.items()
+            if not where or any(where(row) for row in rows)
+        }
+        index = self.index(table)
+        return [
+            row for row in index.rows
+            if (not table_where or table_where(row))
+            and any(key in keys for key in row[KEY_FIELD])
+        ]
+
+    @staticmethod
+    def group_by(
+        rows: Iterator[Row],
+        key: Callable[[Row], Any],
+        aggregate: Optional[Callable[[Any, Row], Any]] = None,
+        start: Callable[[], Any] = int,
+    ) -> Dict[Any, Any]:
+        """Fold joined rows into groups in one pass.
+
+        ``aggregate(accumulator, row)`` returns the new accumulator, starting
+        from ``start()`` for each group; by default rows are counted.
+        """
+        aggregate = aggregate or (lambda count, _row: count + 1)
+        groups: Dict[Any, Any] = {}
+        for row in rows:
+            group = key(row)
+            accumulator = groups[group] if group in groups else start()
+            groups[group] = aggregate(accumulator, row)
+        return groups
@@ -0,0 +1,43 @@
+"""Helpers shared by the on-disk table snapshots and indexes.
+
+``ParquetSnapshot`` (``frames.py``), ``MappedSnapshot`` (``snapshots.py``)
+and ``SimilarityIndex`` (``aire.analysis.similarity``) describe their files
+in a ``manifest.json`` that is replaced atomically; the snapshots need
+pyarrow only once a snapshot is written or read.
+This module imports neither pandas nor pyarrow.
+"""
+
+import json
+import os
+from typing import Any, Dict
+
+
+def require_pyarrow(parquet: bool = False):
+    """Import pyarrow (and ``pyarrow.parquet``) on first use."""
+    try:
+        import pyarrow
+        if parquet:
+            import pyarrow.parquet  # noqa: F401
+    except ImportError as exc:
+        raise ImportError("pyarrow is required for Arrow and Parquet support") from exc
+    return pyarrow
+
+
+def read_manifest(path: str, **expected: Any) -> Dict[str, Any]:
+    """Manifest at ``path``, or ``{}`` if missing or any ``expected`` key differs."""
+    try:
+        with open(path) as handle:
+            manifest = json.load(handle)
+    except FileNotFoundError:
+        return {}
+    if any(manifest.get(key) != value for key, value in expected.items()):
+        return {}
+    return manifest
+
+
+def write_manifest(path: str, manifest: Dict[str, Any]) -> None:
+    """Replace the manifest at ``path`` so readers see the old or new one, never a mix."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as handle:
+        json.dump(manifest, handle, indent=2)
+    os.replace(tmp_path, path)
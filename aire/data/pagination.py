@@ -0,0 +1,102 @@
+"""Keyset pagination helpers for streaming Supabase query results."""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional
+
+if TYPE_CHECKING:
+    import asyncio
+
+DEFAULT_PAGE_SIZE = 1000
+
+
+def iter_keyset(
+    build_query: Callable[[], Any],
+    key: str = "id",
+    page_size: int = DEFAULT_PAGE_SIZE,
+    prefetch: bool = True,
+    after: Optional[Any] = None,
+    execute: Optional[Callable[[Any], Any]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield rows from a query one page at a time, paging by ``key``.
+
+    ``build_query`` must return a fresh filter builder on every call (the
+    builders are mutable), with any filters applied but no ordering or limit.
+    Pages are requested as ``key > last_seen`` ordered by ``key``, which stays
+    stable while rows are inserted, unlike offset pagination. With
+    ``prefetch`` the next page is requested in the background while the
+    current one is being consumed. ``after`` resumes from a known key.
+    ``execute`` runs a built query (defaults to ``query.execute()``).
+    """
+    if page_size <= 0:
+        raise ValueError("page_size must be positive")
+
+    def fetch(last: Optional[Any]) -> List[Dict[str, Any]]:
+        query = build_query()
+        if last is not None:
+            query = query.gt(key, last)
+        query = query.order(key).limit(page_size)
+        return (execute(query) if execute else query.execute()).data
+
+    if not prefetch:
+        while True:
+            page = fetch(after)
+            yield from page
+            if len(page) < page_size:
+                return
+            after = page[-1][key]
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    pending: Optional[Future] = executor.submit(fetch, after)
+    try:
+        while pending is not None:
+            page = pending.result()
+            pending = None
+            if len(page) == page_size:
+                pending = executor.submit(fetch, page[-1][key])
+            yield from page
+    finally:
+        if pending is not None:
+            pending.cancel()
+        executor.shutdown(wait=False)
+
+
+async def aiter_keyset(
+    build_query: Callable[[], Any],
+    key: str = "id",
+    page_size: int = DEFAULT_PAGE_SIZE,
+    prefetch: bool = True,
+    execute: Optional[Callable[[Any], Awaitable[Any]]] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Async counterpart of ``iter_keyset`` for async request builders.
+
+    ``execute`` runs a built query (defaults to ``query.execute()``), which
+    lets callers route pages through a concurrency limiter.
+    """
+    import asyncio
+
+    if page_size <= 0:
+        raise ValueError("page_size must be positive")
+
+    async def fetch(after: Optional[Any]) -> List[Dict[str, Any]]:
+        query = build_query()
+        if after is not None:
+            query = query.gt(key, after)
+        query = query.order(key).limit(page_size)
+        response = await (execute(query) if execute else query.execute())
+        return response.data
+
+    pending: Optional["asyncio.Task"] = asyncio.ensure_future(fetch(None))
+    try:
+        while pending is not None:
+            page = await pending
+            pending = None
+            more = len(page) == page_size
+            if more and prefetch:
+                pending = asyncio.ensure_future(fetch(page[-1][key]))
+            for row in page:
+                yield row
+            if more and not prefetch:
+                pending = asyncio.ensure_future(fetch(page[-1][key]))
+    finally:
+        if pending is not None:
+            pending.cancel()
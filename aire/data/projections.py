@@ -0,0 +1,86 @@
+"""Column projections for accessor queries.
+
+Accessor methods take a ``columns`` argument that is either a preset name
+from ``PROJECTIONS`` (``"listing"``, ``"full"`` ...), a comma-separated
+string, or a sequence of column names. ``None`` selects every column.
+"""
+
+import re
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+Columns = Optional[Union[str, Sequence[str]]]
+
+PROJECTIONS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "incidents": {
+        "ids": ("id",),
+        "listing": ("id", "headline", "reporting_date", "quarter", "risk_cats", "actors_origin"),
+        "full": ("*",),
+    },
+    "benchmarks": {
+        "ids": ("id",),
+        "listing": ("id", "benchmark", "date", "availability", "risk_cats"),
+        "full": ("*",),
+    },
+    "evals": {
+        "ids": ("id",),
+        "listing": (
+            "id", "public_id", "publication", "release_date",
+            "organizations", "models", "risk_cats", "reviewed",
+        ),
+        "full": ("*",),
+    },
+    "versions": {
+        "ids": ("id",),
+        "listing": ("id", "name"),
+        "full": ("*",),
+    },
+    "epoch_models": {
+        "ids": ("id",),
+        "full": ("*",),
+    },
+}
+
+# Columns holding ISO dates, and low-cardinality text columns.
+DATE_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "incidents": ("reporting_date", "created_at"),
+    "benchmarks": ("date", "created_at"),
+    "evals": ("release_date", "created_at"),
+    "versions": ("created_at",),
+    "epoch_models": ("created_at",),
+}
+
+CATEGORY_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "incidents": ("quarter",),
+    "benchmarks": ("availability",),
+    "evals": (),
+    "versions": (),
+    "epoch_models": ("organization",),
+}
+
+_COLUMN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def resolve_columns(table: str, columns: Columns = None) -> Tuple[str, ...]:
+    """Expand a preset name or column list into column names."""
+    if columns is None:
+        return ("*",)
+    if isinstance(columns, str):
+        preset = PROJECTIONS.get(table, {}).get(columns)
+        if preset is not None:
+            return preset
+        columns = columns.split(",")
+    names = tuple(column.strip() for column in columns if column.strip())
+    if not names:
+        raise ValueError("At least one column must be selected")
+    for name in names:
+        if name != "*" and not _COLUMN.match(name):
+            raise ValueError(f"Invalid column name: {name!r}")
+    return names
+
+
+def select_columns(table: str, columns: Columns = None, key: Optional[str] = None) -> str:
+    """Build the ``select`` argument for ``columns``, always including ``key``."""
+    names = resolve_columns(table, columns)
+    if key and "*" not in names and key not in names:
+        names = (key,) + names
+    return ",".join(names)
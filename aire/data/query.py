@@ -0,0 +1,342 @@
+"""Composable queries that combine several filters into one request.
+
+The accessor methods apply one filter each; ``Query`` chains any number of
+filters, orderings, a projection and a row window, and sends them to the
+server as a single request:
+
+    (accessor.incidents.query("listing")
+        .risk_category("Cyber Offense")
+        .actor_origin("Russia")
+        .quarter("Q3 2025")
+        .order("reporting_date", desc=True)
+        .limit(50)
+        .all())
+
+Queries are immutable: every method returns a new ``Query``, so a base query
+can be shared and refined. Column names are validated, array columns only
+accept ``contains`` and text searches are escaped (see ``escaping.py``). The
+request is rebuilt from the recorded steps on every execution, so the same
+query works with ``SupabaseDB`` and ``ReplicaDB`` and can be paged.
+"""
+
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+from .escaping import contains_pattern, quote_value
+from .pagination import DEFAULT_PAGE_SIZE, iter_keyset
+from .projections import Columns, resolve_columns, select_columns
+from .storage.replica import ARRAY_COLUMNS
+
+Q = TypeVar("Q", bound="Query")
+
+# (builder method, column, value)
+Step = Tuple[str, str, Any]
+Condition = Tuple[str, str, Any]
+
+_COMPARISONS = ("eq", "neq", "gt", "gte", "lt", "lte")
+
+
+def _value(value: Any) -> Any:
+    """Serialize dates the way PostgREST expects them."""
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def _expression_value(value: Any) -> str:
+    value = _value(value)
+    if value is None:
+        raise ValueError("None can only be compared with eq or neq")
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return quote_value(str(value))
+
+
+class Query:
+    """Immutable, chainable query over one accessor's table."""
+
+    def __init__(self, accessor: Any, columns: Columns = None):
+        self.accessor = accessor
+        self.table: str = accessor.table
+        self._columns = columns
+        resolve_columns(self.table, columns)
+        self._steps: Tuple[Step, ...] = ()
+        self._order: Tuple[Tuple[str, bool], ...] = ()
+        self._limit: Optional[int] = None
+        self._offset: int = 0
+
+    def _copy(self: Q, **changes: Any) -> Q:
+        query = object.__new__(type(self))
+        query.__dict__.update(self.__dict__)
+        query.__dict__.update(changes)
+        return query
+
+    def _column(self, column: str, array: Optional[bool] = None) -> str:
+        (name,) = resolve_columns(self.table, [column])
+        if name == "*":
+            raise ValueError("'*' is not a filterable column")
+        is_array = name in ARRAY_COLUMNS.get(self.table, ())
+        if array is True and not is_array:
+            raise ValueError(f"{self.table}.{name} is not an array column")
+        if array is False and is_array:
+            raise ValueError(f"{self.table}.{name} is an array column; use contains()")
+        return name
+
+    def _add(self: Q, method: str, column: str, value: Any) -> Q:
+        return self._copy(_steps=self._steps + ((method, column, value),))
+
+    def __repr__(self) -> str:
+        steps = ", ".join(
+            f"{method}({column!r}, {value!r})" for method, column, value in self._steps
+        )
+        return f"<{type(self).__name__} {self.table}: {steps or 'all rows'}>"
+
+    # Projection and window
+
+    def select(self: Q, columns: Columns) -> Q:
+        """Replace the column projection."""
+        resolve_columns(self.table, columns)
+        return self._copy(_columns=columns)
+
+    def order(self: Q, column: str, desc: bool = False) -> Q:
+        """Add a sort key; later calls break ties of earlier ones."""
+        return self._copy(_order=self._order + ((self._column(column), desc),))
+
+    def limit(self: Q, count: int) -> Q:
+        if count < 0:
+            raise ValueError("limit must not be negative")
+        return self._copy(_limit=count)
+
+    def offset(self: Q, count: int) -> Q:
+        if count < 0:
+            raise ValueError("offset must not be negative")
+        return self._copy(_offset=count)
+
+    # Filters
+
+    def eq(self: Q, column: str, value: Any) -> Q:
+        return self._add("eq", self._column(column, array=False), _value(value))
+
+    def neq(self: Q, column: str, value: Any) -> Q:
+        return self._add("neq", self._column(column, array=False), _value(value))
+
+    def gt(self: Q, column: str, value: Any) -> Q:
+        return self._add("gt", self._column(column, array=False), _value(value))
+
+    def gte(self: Q, column: str, value: Any) -> Q:
+        return self._add("gte", self._column(column, array=False), _value(value))
+
+    def lt(self: Q, column: str, value: Any) -> Q:
+        return self._add("lt", self._column(column, array=False), _value(value))
+
+    def lte(self: Q, column: str, value: Any) -> Q:
+        return self._add("lte", self._column(column, array=False), _value(value))
+
+    def between(self: Q, column: str, low: Any, high: Any) -> Q:
+        """Rows with ``low <= column <= high``; either bound may be ``None``."""
+        query = self
+        if low is not None:
+            query = query.gte(column, low)
+        if high is not None:
+            query = query.lte(column, high)
+        return query
+
+    def in_(self: Q, column: str, values: Iterable[Any]) -> Q:
+        return self._add("in_", self._column(column, array=False), [_value(v) for v in values])
+
+    def is_null(self: Q, column: str) -> Q:
+        return self._add("is_", self._column(column), "null")
+
+    def contains(self: Q, column: str, values: Sequence[Any]) -> Q:
+        """Rows whose array ``column`` holds every one of ``values``."""
+        if isinstance(values, str):
+            values = [values]
+        return self._add("contains", self._column(column, array=True), list(values))
+
+    def text_contains(self: Q, column: str, text: str) -> Q:
+        """Case-insensitive substring match; wildcards in ``text`` are literal."""
+        return self._add("ilike", self._column(column, array=False), contains_pattern(text))
+
+    def any_of(self: Q, *conditions: Condition) -> Q:
+        """Rows matching at least one ``(column, operator, value)`` condition.
+
+        Operators are the comparisons (``eq``, ``gt`` ...), ``in``,
+        ``contains`` (array columns) and ``text_contains``; values are
+        escaped and quoted. ``eq``/``neq`` with ``None`` match null / not
+        null; ``None`` anywhere else raises ``ValueError``.
+        """
+        if not conditions:
+            raise ValueError("any_of needs at least one condition")
+        parts = []
+        for column, operator, value in conditions:
+            if operator in ("eq", "neq") and value is None:
+                name = self._column(column, array=False)
+                parts.append(f"{name}.{'is' if operator == 'eq' else 'not.is'}.null")
+            elif operator in _COMPARISONS:
+                name = self._column(column, array=False)
+                parts.append(f"{name}.{operator}.{_expression_value(value)}")
+            elif operator == "in":
+                name = self._column(column, array=False)
+                items = ",".join(_expression_value(item) for item in value)
+                parts.append(f"{name}.in.({items})")
+            elif operator == "contains":
+                name = self._column(column, array=True)
+                items = ",".join(_expression_value(item) for item in value)
+                parts.append(f"{name}.cs.{{{items}}}")
+            elif operator == "text_contains":
+                name = self._column(column, array=False)
+                parts.append(f"{name}.ilike.{quote_value(contains_pattern(value))}")
+            else:
+                raise ValueError(f"Unsupported operator: {operator!r}")
+        return self._add("or_", "", ",".join(parts))
+
+    def search(self: Q, text: str, *columns: str) -> Q:
+        """Rows where any of ``columns`` contains ``text`` (case-insensitive)."""
+        if not columns:
+            raise ValueError("search needs at least one column")
+        return self.any_of(*((column, "text_contains", text) for column in columns))
+
+    # Execution
+
+    def _apply(self, builder: Any) -> Any:
+        for method, column, value in self._steps:
+            if method == "or_":
+                builder = builder.or_(value)
+            else:
+                builder = getattr(builder, method)(column, value)
+        return builder
+
+    def build(self, key: Optional[str] = None) -> Any:
+        """A fresh database request for this query."""
+        columns = select_columns(self.table, self._columns, key)
+        builder = self._apply(self.accessor.db.table(self.table).select(columns))
+        for column, desc in self._order:
+            builder = builder.order(column, desc=desc)
+        if self._offset:
+            end = self._offset + (self._limit if self._limit is not None else 2 ** 31) - 1
+            builder = builder.range(self._offset, end)
+        elif self._limit is not None:
+            builder = builder.limit(self._limit)
+        return builder
+
+    def all(self) -> List[Dict[str, Any]]:
+        """Run the query as one request and return the rows."""
+        if self._limit == 0:
+            return []
+        return self.accessor._execute(self.build()).data
+
+    def first(self) -> Optional[Dict[str, Any]]:
+        """First matching row, or ``None``."""
+        rows = self.limit(1).all()
+        return rows[0] if rows else None
+
+    def count(self) -> int:
+        """Count matching rows on the server without transferring them."""
+        builder = self._apply(
+            self.accessor.db.table(self.table).select("id", count="exact", head=True)
+        )
+        return self.accessor._execute(builder).count or 0
+
+    def exists(self) -> bool:
+        return self.select("ids").first() is not None
+
+    def iter(
+        self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream the matching rows page by page.
+
+        Unordered queries page by ``id``; ordered or windowed ones page with
+        offsets inside their window.
+        """
+        if not self._order and self._limit is None and not self._offset:
+            columns = select_columns(self.table, self._columns, "id")
+            return iter_keyset(
+                lambda: self._apply(self.accessor.db.table(self.table).select(columns)),
+                page_size=page_size,
+                prefetch=prefetch,
+                execute=self.accessor._send,
+            )
+        return self._iter_offsets(page_size)
+
+    def _iter_offsets(self, page_size: int) -> Iterator[Dict[str, Any]]:
+        if page_size <= 0:
+            raise ValueError("page_size must be positive")
+        remaining = self._limit
+        offset = self._offset
+        while remaining is None or remaining > 0:
+            size = page_size if remaining is None else min(page_size, remaining)
+            page = self.accessor._send(self._copy(_limit=size, _offset=offset).build())
+            yield from page.data
+            if len(page.data) < size:
+                return
+            offset += size
+            if remaining is not None:
+                remaining -= size
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.iter()
+
+
+class IncidentQuery(Query):
+    def risk_category(self, *risk_cats: str) -> "IncidentQuery":
+        return self.contains("risk_cats", risk_cats)
+
+    def quarter(self, *quarters: str) -> "IncidentQuery":
+        if len(quarters) == 1:
+            return self.eq("quarter", quarters[0])
+        return self.in_("quarter", quarters)
+
+    def actor_origin(self, *origins: str) -> "IncidentQuery":
+        return self.contains("actors_origin", origins)
+
+    def reported_between(self, start: Any = None, end: Any = None) -> "IncidentQuery":
+        return self.between("reporting_date", start, end)
+
+    def keyword(self, keyword: str) -> "IncidentQuery":
+        return self.search(keyword, "headline", "description")
+
+
+class BenchmarkQuery(Query):
+    def risk_category(self, *risk_cats: str) -> "BenchmarkQuery":
+        return self.contains("risk_cats", risk_cats)
+
+    def open_source(self) -> "BenchmarkQuery":
+        return self.eq("availability", "Open")
+
+    def dated_between(self, start: Any = None, end: Any = None) -> "BenchmarkQuery":
+        return self.between("date", start, end)
+
+
+class EvalQuery(Query):
+    def organization(self, *organizations: str) -> "EvalQuery":
+        return self.contains("organizations", organizations)
+
+    def model(self, *models: str) -> "EvalQuery":
+        return self.contains("models", models)
+
+    def risk_category(self, *risk_cats: str) -> "EvalQuery":
+        return self.contains("risk_cats", risk_cats)
+
+    def reviewed(self, reviewed: bool = True) -> "EvalQuery":
+        return self.eq("reviewed", reviewed)
+
+    def released_between(self, start: Any = None, end: Any = None) -> "EvalQuery":
+        return self.between("release_date", start, end)
+
+
+class VersionQuery(Query):
+    def name_contains(self, keyword: str) -> "VersionQuery":
+        return self.text_contains("name", keyword)
+
+
+class EpochModelQuery(Query):
+    pass
+
+
+QUERY_CLASSES: Dict[str, type] = {
+    "incidents": IncidentQuery,
+    "benchmarks": BenchmarkQuery,
+    "evals": EvalQuery,
+    "versions": VersionQuery,
+    "epoch_models": EpochModelQuery,
+}
@@ -0,0 +1,217 @@
+"""Compact, read-only row records for accessor results.
+
+Accessor rows are plain dicts by default: every row carries its own hash
+table of repeated key strings, and repeated values (risk categories,
+countries, organizations, quarters) are separate string objects per row.
+With ``DataAccessor(records=True)`` each row becomes a ``Record`` instead:
+
+* one class per table and column set, with ``__slots__``, so keys live on
+  the class and a row costs a fixed-size object;
+* array columns become tuples, and equal tuples are shared between rows,
+  so a combination such as ``("Bio", "Cyber Offense")`` exists once;
+* category values and date strings are interned, and dates are only
+  decoded on demand with ``as_date``.
+
+Records implement ``Mapping``: ``row["id"]``, ``row.get("quarter")``,
+``"models" in row``, ``dict(row)`` and ``{**row}`` all work, and fields are
+also attributes (``row.headline``). Array values are tuples rather than
+lists, and records are not writable; ``to_dict`` gives a mutable copy with
+lists.
+"""
+
+import sys
+import threading
+from collections.abc import Mapping
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Type, Union
+
+from .projections import CATEGORY_COLUMNS, DATE_COLUMNS
+from .storage.replica import ARRAY_COLUMNS
+
+_intern = sys.intern
+
+# Shared array values; bounded so high-cardinality arrays cannot grow it forever.
+MAX_SHARED_TUPLES = 100_000
+_shared_tuples: Dict[Tuple[Any, ...], Tuple[Any, ...]] = {}
+
+
+class Record(Mapping):
+    """Slotted, dict-compatible row of one table."""
+
+    __slots__ = ()
+
+    table: str = ""
+    fields: Tuple[str, ...] = ()
+    _field_set: frozenset = frozenset()
+
+    def __init__(self, *values: Any):
+        for name, value in zip(self.fields, values):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only; use to_dict() for a copy")
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._field_set:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._field_set
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.fields)
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.fields)
+        return f"{type(self).__name__}({values})"
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (_rebuild, (self.table, self.fields, tuple(getattr(self, n) for n in self.fields)))
+
+    def as_date(self, column: str) -> Optional[Union[date, datetime]]:
+        """Decode an ISO date or timestamp column; ``None`` if empty."""
+        value = self[column]
+        if not value:
+            return None
+        if isinstance(value, (date, datetime)):
+            return value
+        if len(value) == 10:
+            return date.fromisoformat(value)
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Mutable copy of the row, with lists for the array columns."""
+        return {
+            name: list(value) if isinstance(value, tuple) else value
+            for name, value in zip(self.fields, (getattr(self, n) for n in self.fields))
+        }
+
+
+class IncidentRecord(Record):
+    __slots__ = ()
+    table = "incidents"
+
+
+class BenchmarkRecord(Record):
+    __slots__ = ()
+    table = "benchmarks"
+
+
+class EvalRecord(Record):
+    __slots__ = ()
+    table = "evals"
+
+
+class VersionRecord(Record):
+    __slots__ = ()
+    table = "versions"
+
+
+class EpochModelRecord(Record):
+    __slots__ = ()
+    table = "epoch_models"
+
+
+RECORD_CLASSES: Dict[str, Type[Record]] = {
+    "incidents": IncidentRecord,
+    "benchmarks": BenchmarkRecord,
+    "evals": EvalRecord,
+    "versions": VersionRecord,
+    "epoch_models": EpochModelRecord,
+}
+
+# Names a column cannot take because the record class already uses them.
+_RESERVED = frozenset(dir(Record))
+
+_classes: Dict[Tuple[str, Tuple[str, ...]], Optional[Type[Record]]] = {}
+_classes_lock = threading.Lock()
+
+
+def record_class(table: str, fields: Tuple[str, ...]) -> Optional[Type[Record]]:
+    """Record class for rows of ``table`` with exactly ``fields``, cached.
+
+    ``None`` when a column name cannot be a slot (not an identifier or
+    clashing with a ``Record`` method); such rows stay dicts.
+    """
+    key = (table, fields)
+    cls = _classes.get(key, False)
+    if cls is not False:
+        return cls
+    with _classes_lock:
+        if key not in _classes:
+            if all(name.isidentifier() and name not in _RESERVED for name in fields):
+                base = RECORD_CLASSES.get(table, Record)
+                _classes[key] = type(base.__name__, (base,), {
+                    "__slots__": fields,
+                    "fields": fields,
+                    "_field_set": frozenset(fields),
+                })
+            else:
+                _classes[key] = None
+        return _classes[key]
+
+
+def _rebuild(table: str, fields: Tuple[str, ...], values: Tuple[Any, ...]) -> Any:
+    cls = record_class(table, fields)
+    return cls(*values) if cls else dict(zip(fields, values))
+
+
+def _compactor(table: str, fields: Tuple[str, ...]):
+    """Per-column value converters for ``fields`` of ``table``."""
+    arrays = set(ARRAY_COLUMNS.get(table, ()))
+    categories = set(CATEGORY_COLUMNS.get(table, ())) | set(DATE_COLUMNS.get(table, ()))
+
+    def array(value: Any) -> Any:
+        if not isinstance(value, list):
+            return value
+        items = tuple(_intern(item) if type(item) is str else item for item in value)
+        shared = _shared_tuples.get(items)
+        if shared is None:
+            if len(_shared_tuples) < MAX_SHARED_TUPLES:
+                _shared_tuples[items] = items
+            return items
+        return shared
+
+    def category(value: Any) -> Any:
+        return _intern(value) if type(value) is str else value
+
+    return [
+        array if name in arrays else category if name in categories else None
+        for name in fields
+    ]
+
+
+def to_records(table: str, rows: Iterable[Any]) -> List[Any]:
+    """Convert dict rows into ``Record``s; records and odd rows pass through."""
+    result: List[Any] = []
+    current: Tuple[Optional[Tuple[str, ...]], Any, Any] = (None, None, None)
+    for row in rows:
+        if type(row) is not dict:
+            result.append(row)
+            continue
+        fields = tuple(row)
+        if fields != current[0]:
+            current = (fields, record_class(table, fields), _compactor(table, fields))
+        _, cls, converters = current
+        if cls is None:
+            result.append(row)
+            continue
+        values = row.values()
+        result.append(cls(*[
+            convert(value) if convert else value
+            for convert, value in zip(converters, values)
+        ]))
+    return result
+
+
+def records_response(table: str, response: Any) -> Any:
+    """Replace a response's row dicts with records, in place."""
+    data = getattr(response, "data", None)
+    if isinstance(data, list) and data:
+        response.data = to_records(table, data)
+    return response
+
@@ -0,0 +1,224 @@
+"""Ranked full-text search over accessor tables using SQLite FTS5.
+
+The index keeps its own SQLite file (or runs in memory) and is fed from the
+accessors, so searches never hit Supabase. Results are ranked with BM25.
+
+Query syntax: bare words must all match (``match_all=False`` accepts any),
+``"double quoted text"`` matches a phrase, and a trailing ``*`` on a word
+matches it as a prefix. Everything else is treated as literal text.
+"""
+
+import ast
+import json
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .changes import DEFAULT_FULL_INTERVAL, ChangeFeed
+from .pagination import DEFAULT_PAGE_SIZE
+from .projections import Columns, resolve_columns
+
+SEARCH_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "incidents": ("headline", "description"),
+    "benchmarks": ("benchmark", "publication"),
+    "evals": ("publication",),
+    "versions": ("name",),
+}
+
+# Per-field BM25 weights; a headline match counts more than a body match.
+DEFAULT_WEIGHTS: Dict[str, Tuple[float, ...]] = {
+    "incidents": (3.0, 1.0),
+    "benchmarks": (3.0, 1.0),
+    "evals": (1.0,),
+    "versions": (1.0,),
+}
+
+_QUERY_TOKENS = re.compile(r'"([^"]*)"|(\S+)')
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass
+class SearchHit:
+    """One ranked search result; higher ``score`` is more relevant."""
+
+    id: Any
+    score: float
+
+
+def build_match_expression(query: str, match_all: bool = True) -> str:
+    """Translate a user query into a safe FTS5 MATCH expression."""
+    terms = []
+    for phrase, word in _QUERY_TOKENS.findall(query):
+        if phrase:
+            words = _WORD.findall(phrase)
+            if words:
+                terms.append('"' + " ".join(words) + '"')
+            continue
+        parts = _WORD.findall(word)
+        terms.extend(f'"{part}"' for part in parts)
+        # A lone "*" has no word of its own to mark as a prefix; drop it.
+        if parts and word.endswith("*"):
+            terms[-1] += "*"
+    return (" AND " if match_all else " OR ").join(terms)
+
+
+class SearchIndex:
+    """Incrementally maintained FTS5 index over the text columns of one table.
+
+    ``change_column`` and ``full_interval`` control how ``update_from``
+    finds edited and deleted rows (see ``aire.data.changes``); the feed's
+    position is stored with the index.
+    """
+
+    def __init__(
+        self,
+        table: str = "incidents",
+        path: str = ":memory:",
+        fields: Optional[Sequence[str]] = None,
+        weights: Optional[Sequence[float]] = None,
+        change_column: Optional[str] = None,
+        full_interval: Optional[float] = DEFAULT_FULL_INTERVAL,
+    ):
+        self.table = table
+        self.fields = resolve_columns(table, list(fields or SEARCH_FIELDS[table]))
+        if weights is None:
+            weights = DEFAULT_WEIGHTS.get(table) if fields is None else None
+        self.weights = tuple(weights or (1.0,) * len(self.fields))
+        if len(self.weights) != len(self.fields):
+            raise ValueError("weights must match fields")
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._create_schema()
+        self._feed = ChangeFeed(change_column, full_interval)
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'feed'").fetchone()
+        if row:
+            self._feed.restore(json.loads(row[0]))
+
+    def _create_schema(self) -> None:
+        columns = ", ".join(self.fields)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS docs ("
+            "rowid INTEGER PRIMARY KEY, id TEXT NOT NULL UNIQUE, raw_id TEXT NOT NULL)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        self.conn.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS fts USING fts5({columns}, "
+            "tokenize = 'porter unicode61 remove_diacritics 2')"
+        )
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def add(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Insert or replace rows in the index; returns the number written."""
+        written = 0
+        with self._lock:
+            self.conn.execute("BEGIN")
+            try:
+                for row in rows:
+                    self._delete(str(row["id"]))
+                    cursor = self.conn.execute(
+                        "INSERT INTO docs (id, raw_id) VALUES (?, ?)",
+                        (str(row["id"]), repr(row["id"])),
+                    )
+                    values = [row.get(field) or "" for field in self.fields]
+                    placeholders = ", ".join("?" for _ in self.fields)
+                    self.conn.execute(
+                        f"INSERT INTO fts (rowid, {', '.join(self.fields)}) "
+                        f"VALUES (?, {placeholders})",
+                        (cursor.lastrowid, *values),
+                    )
+                    written += 1
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return written
+
+    def _delete(self, doc_id: str) -> bool:
+        row = self.conn.execute("SELECT rowid FROM docs WHERE id = ?", (doc_id,)).fetchone()
+        if row is None:
+            return False
+        self.conn.execute("DELETE FROM fts WHERE rowid = ?", row)
+        self.conn.execute("DELETE FROM docs WHERE rowid = ?", row)
+        return True
+
+    def remove(self, ids: Iterable[Any]) -> int:
+        """Drop rows from the index; returns the number removed."""
+        with self._lock:
+            return sum(self._delete(str(doc_id)) for doc_id in ids)
+
+    def last_id(self) -> Optional[Any]:
+        """Highest id seen by ``update_from``."""
+        return self._feed.last_id
+
+    def _known_ids(self) -> List[Any]:
+        with self._lock:
+            return [_literal(raw_id) for (raw_id,) in self.conn.execute("SELECT raw_id FROM docs")]
+
+    def update_from(
+        self, accessor: Any, page_size: int = DEFAULT_PAGE_SIZE, full: bool = False
+    ) -> int:
+        """Index rows of ``accessor``'s table changed since the last update.
+
+        Only the id and text columns are transferred; ``full`` re-reads every
+        row and drops deleted ones.
+        """
+        written, _ = self._feed.pull_from(
+            accessor,
+            ("id",) + self.fields,
+            apply=self.add,
+            remove=self.remove,
+            known_ids=self._known_ids,
+            page_size=page_size,
+            full=full,
+        )
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('feed', ?)",
+                (json.dumps(self._feed.state()),),
+            )
+        return written
+
+    def search(
+        self, query: str, limit: Optional[int] = 20, match_all: bool = True
+    ) -> List[SearchHit]:
+        """Return the best matching ids ranked by BM25 (all of them if ``limit`` is None)."""
+        expression = build_match_expression(query, match_all)
+        if not expression:
+            return []
+        weights = ", ".join(str(float(w)) for w in self.weights)
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT docs.raw_id, bm25(fts, {weights}) AS rank FROM fts "
+                "JOIN docs ON docs.rowid = fts.rowid "
+                "WHERE fts MATCH ? ORDER BY rank LIMIT ?",
+                (expression, -1 if limit is None else limit),
+            ).fetchall()
+        return [SearchHit(id=_literal(raw_id), score=-rank) for raw_id, rank in rows]
+
+    def search_rows(
+        self,
+        accessor: Any,
+        query: str,
+        limit: Optional[int] = 20,
+        match_all: bool = True,
+        columns: Columns = None,
+    ) -> List[Dict[str, Any]]:
+        """Search, then fetch the matching rows in rank order in one batch."""
+        hits = self.search(query, limit, match_all)
+        return ranked_rows(hits, accessor.get_many_by_id([hit.id for hit in hits], columns))
+
+
+def ranked_rows(hits: Sequence[SearchHit], rows: Any) -> List[Dict[str, Any]]:
+    """Order looked-up ``rows`` by ``hits``, skipping ids no longer in the table."""
+    return [rows[hit.id] for hit in hits if hit.id in rows]
+
+
+def _literal(raw: str) -> Any:
+    """Restore an id stored with ``repr`` (ints stay ints, strings stay strings)."""
+    return ast.literal_eval(raw)
@@ -0,0 +1,442 @@
+"""Memory-mapped columnar snapshots of the accessor tables.
+
+``MappedSnapshot`` writes every table as an uncompressed Arrow IPC file, with
+array columns and low-cardinality text columns dictionary-encoded. Loading
+memory-maps the files: no bytes are copied or decoded, so a worker is ready
+in milliseconds and all processes on a host share the same page-cache pages.
+
+    snapshot = MappedSnapshot("data/mapped")
+    snapshot.save(DataAccessor())          # once, e.g. from a cron job
+    tables = MappedSnapshot("data/mapped").load_all()   # in every worker
+    incidents = tables["incidents"]        # pyarrow.Table backed by the map
+
+``save`` streams each table into its file in record batches of
+``RECORD_BATCH_ROWS`` rows, so only one batch is held in memory at a time;
+``write`` publishes Arrow tables or row lists through the same writer. Each
+dictionary-encoded column ends up with one dictionary per file, so loading
+does not have to concatenate dictionary deltas.
+Each save writes a new generation directory and then atomically swaps
+``manifest.json`` to point at it, so readers never see a half-written
+snapshot and tables already mapped by running workers stay valid. Old
+generations are pruned one save late (see ``MappedSnapshot``). Only
+``pyarrow`` is needed to load (not pandas); it is imported on first use.
+"""
+
+import itertools
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from .manifests import read_manifest, require_pyarrow, write_manifest
+from .pagination import DEFAULT_PAGE_SIZE
+from .projections import CATEGORY_COLUMNS
+from .storage.replica import ARRAY_COLUMNS, TABLES
+
+DEFAULT_MAPPED_SNAPSHOT_DIR = os.path.join("data", "mapped")
+MAPPED_SNAPSHOT_FORMAT = "arrow-ipc"
+MAPPED_SNAPSHOT_FORMAT_VERSION = 1
+RECORD_BATCH_ROWS = 64 * 1024
+
+
+class _TableWriter:
+    """Streams rows of one table into an Arrow IPC file, one batch at a time.
+
+    Each dictionary-encoded column keeps one dictionary that only grows, so
+    a batch adds a dictionary delta instead of replacing it (which the IPC
+    file format does not allow). Batches are held back until every column
+    has had a non-null value, which fixes the schema; a later batch that
+    needs a wider type (an integer column receiving a float) rewrites the
+    file written so far with the wider schema. If a dictionary grew after
+    the first batch, ``close`` rewrites the file once with the final
+    dictionaries, which the earlier indices remain valid against, so the
+    published file holds a single dictionary per column.
+    """
+
+    def __init__(self, table: str, path: str):
+        self.table = table
+        self.path = path
+        self.rows = 0
+        self._pa = require_pyarrow()
+        self._schema: Any = None
+        self._held: List[Any] = []
+        self._dictionaries: Dict[str, Dict[str, None]] = {}
+        self._file = path
+        self._sink: Any = None
+        self._writer: Any = None
+        self._written = False
+        self._grown = False
+
+    def write(self, rows: Any) -> None:
+        """Add a list of rows, or an Arrow table or record batch."""
+        pa = self._pa
+        if isinstance(rows, list):
+            batch = pa.Table.from_pylist([row if type(row) is dict else dict(row) for row in rows])
+        elif isinstance(rows, pa.RecordBatch):
+            batch = self._decoded(pa.Table.from_batches([rows]))
+        else:
+            batch = self._decoded(rows)
+        self.rows += batch.num_rows
+        if self._writer is not None:
+            self._write(batch)
+            return
+        self._held.append(batch)
+        schema = pa.unify_schemas(
+            [held.schema for held in self._held], promote_options="permissive"
+        )
+        if not any(self._unresolved(field.type) for field in schema):
+            self._open(schema)
+
+    def close(self) -> Dict[str, Any]:
+        """Finish the file; returns its manifest entry."""
+        if self._writer is None:
+            schema = self._pa.schema([])
+            if self._held:
+                schema = self._pa.unify_schemas(
+                    [held.schema for held in self._held], promote_options="permissive"
+                )
+            self._open(schema)
+        self._writer.close()
+        self._sink.close()
+        if self._grown:
+            self._unify()
+        if self._file != self.path:
+            os.replace(self._file, self.path)
+        return {"rows": self.rows, "columns": self._schema.names}
+
+    def abort(self) -> None:
+        if self._sink is not None:
+            self._sink.close()
+
+    def _start_file(self, path: str, schema: Any, deltas: bool = True) -> None:
+        pa = self._pa
+        self._file = path
+        self._schema = schema
+        self._sink = pa.OSFile(path, "wb")
+        self._writer = pa.ipc.new_file(
+            self._sink, self._encoded_schema(schema),
+            options=pa.ipc.IpcWriteOptions(emit_dictionary_deltas=deltas),
+        )
+
+    def _next_file(self) -> str:
+        return self.path + (".tmp" if self._file == self.path else "")
+
+    def _open(self, schema: Any) -> None:
+        self._start_file(self.path, schema)
+        held, self._held = self._held, []
+        # The first batch written must carry a non-empty dictionary: growing
+        # from an empty one counts as a replacement.
+        for batch in held:
+            self._learn(batch)
+        for batch in held:
+            self._write(batch)
+
+    def _unresolved(self, dtype: Any) -> bool:
+        pa = self._pa
+        return pa.types.is_null(dtype) or (
+            pa.types.is_list(dtype) and pa.types.is_null(dtype.value_type)
+        )
+
+    def _write(self, batch: Any) -> None:
+        pa = self._pa
+        schema = pa.unify_schemas([self._schema, batch.schema], promote_options="permissive")
+        if not schema.equals(self._schema):
+            self._widen(schema)
+        batch = batch.select(self._schema.names).cast(self._schema)
+        self._writer.write_table(self._encode(batch), max_chunksize=RECORD_BATCH_ROWS)
+        self._written = True
+
+    def _decoded(self, arrow: Any) -> Any:
+        """``arrow`` with dictionary columns (and list items) cast back to plain values."""
+        pa = self._pa
+        fields = []
+        for field in arrow.schema:
+            dtype = field.type
+            if pa.types.is_dictionary(dtype):
+                dtype = dtype.value_type
+            elif pa.types.is_list(dtype) and pa.types.is_dictionary(dtype.value_type):
+                dtype = pa.list_(dtype.value_type.value_type)
+            fields.append(pa.field(field.name, dtype))
+        schema = pa.schema(fields)
+        return arrow if schema.equals(arrow.schema) else arrow.cast(schema)
+
+    def _unify(self) -> None:
+        """Rewrite the finished file with each column's final dictionary."""
+        pa = self._pa
+        previous = self._file
+        self._start_file(self._next_file(), self._schema, deltas=False)
+        schema = self._encoded_schema(self._schema)
+        final = {
+            name: pa.array(list(known), type=pa.string())
+            for name, known in self._dictionaries.items()
+        }
+        with pa.memory_map(previous, "r") as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i)
+                columns = [
+                    self._redictionary(column, final[name]) if name in final else column
+                    for name, column in zip(batch.schema.names, batch.columns)
+                ]
+                self._writer.write_batch(
+                    pa.RecordBatch.from_arrays(columns, schema=schema)
+                )
+        self._writer.close()
+        self._sink.close()
+        os.remove(previous)
+
+    def _redictionary(self, array: Any, dictionary: Any) -> Any:
+        pa = self._pa
+        if pa.types.is_list(array.type):
+            return pa.ListArray.from_arrays(
+                array.offsets, self._redictionary(array.values, dictionary), mask=array.is_null()
+            )
+        return pa.DictionaryArray.from_arrays(array.indices, dictionary)
+
+    def _widen(self, schema: Any) -> None:
+        """Copy the batches written so far into a new file with ``schema``."""
+        pa = self._pa
+        self._writer.close()
+        self._sink.close()
+        previous = self._file
+        self._start_file(self._next_file(), schema)
+        encoded_schema = self._encoded_schema(schema)
+        with pa.memory_map(previous, "r") as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                batch = pa.Table.from_batches([reader.get_batch(i)])
+                self._writer.write_table(batch.cast(encoded_schema))
+        os.remove(previous)
+
+    def _encoded_schema(self, schema: Any) -> Any:
+        pa = self._pa
+        dictionary = pa.dictionary(pa.int32(), pa.string())
+        fields = []
+        for field in schema:
+            if self._is_array(field):
+                field = pa.field(field.name, pa.list_(dictionary))
+            elif self._is_category(field):
+                field = pa.field(field.name, dictionary)
+            fields.append(field)
+        return pa.schema(fields)
+
+    def _is_array(self, field: Any) -> bool:
+        pa = self._pa
+        return (
+            field.name in ARRAY_COLUMNS.get(self.table, ())
+            and pa.types.is_list(field.type)
+            and pa.types.is_string(field.type.value_type)
+        )
+
+    def _is_category(self, field: Any) -> bool:
+        return field.name in CATEGORY_COLUMNS.get(self.table, ()) and self._pa.types.is_string(
+            field.type
+        )
+
+    def _extend(self, name: str, values: Any) -> Any:
+        """The column's dictionary, extended with new ``values``."""
+        known = self._dictionaries.setdefault(name, {})
+        for value in values.unique().drop_null().to_pylist():
+            known.setdefault(value, None)
+        return self._pa.array(list(known), type=self._pa.string())
+
+    def _learn(self, batch: Any) -> None:
+        import pyarrow.compute as pc
+
+        for field in self._schema:
+            if field.name not in batch.column_names:
+                continue
+            column = batch.column(field.name)
+            if self._is_array(field) and self._pa.types.is_list(column.type):
+                self._extend(field.name, pc.list_flatten(column))
+            elif self._is_category(field) and self._pa.types.is_string(column.type):
+                self._extend(field.name, column)
+
+    def _dictionary(self, name: str, values: Any) -> Any:
+        """``values`` encoded against the column's dictionary."""
+        import pyarrow.compute as pc
+
+        size = len(self._dictionaries.get(name, ()))
+        dictionary = self._extend(name, values)
+        self._grown = self._grown or (self._written and len(dictionary) > size)
+        indices = pc.index_in(values, value_set=dictionary)
+        return self._pa.DictionaryArray.from_arrays(indices, dictionary)
+
+    def _encode(self, batch: Any) -> Any:
+        pa = self._pa
+        batch = batch.combine_chunks()
+        for i, field in enumerate(self._schema):
+            if not (self._is_array(field) or self._is_category(field)):
+                continue
+            array = batch.column(i).chunk(0)
+            if self._is_array(field):
+                encoded = pa.ListArray.from_arrays(
+                    array.offsets, self._dictionary(field.name, array.values),
+                    mask=array.is_null(),
+                )
+            else:
+                encoded = self._dictionary(field.name, array)
+            batch = batch.set_column(i, pa.field(field.name, encoded.type), encoded)
+        return batch
+
+
+class MappedSnapshot:
+    """Versioned directory of memory-mappable Arrow IPC table files.
+
+    The ``keep`` newest generations are kept, plus the one before them: a
+    generation is only removed one save after it stopped being among the
+    newest, so a reader that read the manifest just before a save can
+    still open the files it names.
+    """
+
+    def __init__(self, directory: str = DEFAULT_MAPPED_SNAPSHOT_DIR, keep: int = 2):
+        if keep < 1:
+            raise ValueError("keep must be at least 1")
+        self.directory = directory
+        self.keep = keep
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.directory, "manifest.json")
+
+    def manifest(self) -> Dict[str, Any]:
+        """Current manifest, or ``{}`` if there is no compatible snapshot."""
+        return read_manifest(
+            self.manifest_path,
+            format=MAPPED_SNAPSHOT_FORMAT,
+            version=MAPPED_SNAPSHOT_FORMAT_VERSION,
+        )
+
+    @property
+    def generation(self) -> Optional[int]:
+        """Number of the published generation; increases with every save."""
+        return self.manifest().get("generation")
+
+    def path(self, table: str, generation: Optional[int] = None) -> str:
+        if generation is None:
+            generation = self.generation
+            if generation is None:
+                raise FileNotFoundError(f"No mapped snapshot in {self.directory!r}")
+        return os.path.join(self.directory, f"gen-{generation:06d}", f"{table}.arrow")
+
+    def age(self) -> Optional[float]:
+        """Seconds since the published generation was saved."""
+        saved_at = self.manifest().get("saved_at")
+        return None if saved_at is None else time.time() - saved_at
+
+    def _start(self, tables: Iterable[str]) -> Any:
+        """Number and carried-over entries of the next generation.
+
+        Tables not in ``tables`` are linked from the published generation.
+        """
+        manifest = self.manifest()
+        previous = manifest.get("generation")
+        generation = (previous or 0) + 1
+        directory = os.path.dirname(self.path("_", generation))
+        # Left over by a save that failed before publishing.
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory)
+        entries: Dict[str, Any] = {}
+        if previous is not None:
+            for table, entry in manifest.get("tables", {}).items():
+                if table not in tables:
+                    source, target = self.path(table, previous), self.path(table, generation)
+                    try:
+                        os.link(source, target)
+                    except OSError:
+                        shutil.copyfile(source, target)
+                    entries[table] = entry
+        return generation, entries
+
+    def _publish(self, generation: int, entries: Dict[str, Any]) -> int:
+        now = time.time()
+        write_manifest(self.manifest_path, {
+            "format": MAPPED_SNAPSHOT_FORMAT,
+            "version": MAPPED_SNAPSHOT_FORMAT_VERSION,
+            "generation": generation,
+            "saved_at": now,
+            "saved_at_iso": datetime.fromtimestamp(now, timezone.utc).isoformat(),
+            "tables": entries,
+        })
+        self._prune(generation)
+        return generation
+
+    def _prune(self, generation: int) -> None:
+        # The newest ``keep`` generations plus the previously published
+        # one survive. Files still mapped by other processes stay readable
+        # after unlinking.
+        for name in os.listdir(self.directory):
+            if name.startswith("gen-") and name[4:].isdigit():
+                if int(name[4:]) < generation - self.keep:
+                    shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def write(self, tables: Dict[str, Any]) -> int:
+        """Publish tables (by name) as a new generation; return its number.
+
+        Each table is an Arrow table or a list of row dicts, written like
+        ``save`` writes streamed rows. Tables not given are carried over
+        from the current generation.
+        """
+        generation, entries = self._start(tables)
+        for table, data in tables.items():
+            if isinstance(data, list):
+                rows = iter(data)
+                batches = iter(lambda: list(itertools.islice(rows, RECORD_BATCH_ROWS)), [])
+            else:
+                batches = data.to_batches(max_chunksize=RECORD_BATCH_ROWS) or [data]
+            entries[table] = self._write_table(table, generation, batches)
+        return self._publish(generation, entries)
+
+    def save(
+        self,
+        accessor: Any,
+        tables: Sequence[str] = TABLES,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> int:
+        """Stream tables from a ``DataAccessor`` and publish them as a new generation."""
+        generation, entries = self._start(tables)
+        for table in tables:
+            rows = iter(getattr(accessor, table).iter_all(page_size=page_size))
+            batches = iter(lambda: list(itertools.islice(rows, RECORD_BATCH_ROWS)), [])
+            entries[table] = self._write_table(table, generation, batches)
+        return self._publish(generation, entries)
+
+    def _write_table(self, table: str, generation: int, batches: Iterable[Any]) -> Dict[str, Any]:
+        writer = _TableWriter(table, self.path(table, generation))
+        try:
+            for batch in batches:
+                writer.write(batch)
+            return writer.close()
+        except BaseException:
+            writer.abort()
+            raise
+
+    def load(self, table: str, columns: Optional[Sequence[str]] = None) -> Any:
+        """Memory-map ``table`` from the published generation as a ``pyarrow.Table``.
+
+        The table's buffers, dictionaries included (each file holds one per
+        column), point into the mapping; nothing is read until used, and
+        selecting ``columns`` is free.
+        """
+        pa = require_pyarrow()
+        source = pa.memory_map(self.path(table), "r")
+        arrow = pa.ipc.open_file(source).read_all()
+        return arrow.select(list(columns)) if columns else arrow
+
+    def load_all(self, tables: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """Memory-map every table of one generation."""
+        manifest = self.manifest()
+        if not manifest:
+            raise FileNotFoundError(f"No mapped snapshot in {self.directory!r}")
+        generation = manifest["generation"]
+        pa = require_pyarrow()
+        result = {}
+        for table in tables or list(manifest["tables"]):
+            source = pa.memory_map(self.path(table, generation), "r")
+            result[table] = pa.ipc.open_file(source).read_all()
+        return result
+
+    def rows(self, table: str, columns: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """Decode a snapshotted table into accessor-style row dicts (copies)."""
+        return self.load(table, columns).to_pylist()
@@ -0,0 +1,258 @@
+"""Process-wide pool of Supabase clients.
+
+Clients are shared per ``(url, key)``, so every ``SupabaseDB`` and
+``DataAccessor`` in the process reuses one HTTP connection pool instead of
+opening its own. Connections are kept alive between requests and reads
+(``GET``/``HEAD``) that fail with 429, a 5xx or a dropped connection are
+retried with jittered exponential backoff.
+
+The registry is thread-safe, and so are the ``httpx`` clients it hands out.
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import httpx
+from supabase import (
+    AsyncClient,
+    AsyncClientOptions,
+    Client,
+    ClientOptions,
+    acreate_client,
+    create_client,
+)
+
+from ..instrumentation import arecord_response_size, record_response_size
+
+RETRY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504, 520})
+
+
+@dataclass(frozen=True)
+class ClientConfig:
+    """Pool, timeout and retry settings for a shared client.
+
+    Timeouts are in seconds. ``retries`` is the number of extra attempts
+    after the first; the delay before retry ``n`` is drawn uniformly from
+    ``[0, min(backoff_max, backoff_base * 2 ** n)]`` unless the server sent
+    ``Retry-After``.
+    """
+
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    write_timeout: float = 30.0
+    pool_timeout: float = 10.0
+    retries: int = 3
+    backoff_base: float = 0.25
+    backoff_max: float = 8.0
+    http2: bool = True
+
+    @property
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    @property
+    def timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(
+            connect=self.connect_timeout,
+            read=self.read_timeout,
+            write=self.write_timeout,
+            pool=self.pool_timeout,
+        )
+
+    def backoff(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """Seconds to wait before retry ``attempt`` (0-based)."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+
+DEFAULT_CLIENT_CONFIG = ClientConfig()
+
+
+def _should_retry(request: httpx.Request, config: ClientConfig, attempt: int) -> bool:
+    return attempt < config.retries and request.method in RETRY_METHODS
+
+
+class RetryTransport(httpx.BaseTransport):
+    """Pooled transport that retries idempotent requests on transient failures."""
+
+    def __init__(self, config: ClientConfig = DEFAULT_CLIENT_CONFIG):
+        self.config = config
+        self._transport = httpx.HTTPTransport(limits=config.limits, http2=config.http2)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            try:
+                response = self._transport.handle_request(request)
+            except httpx.TransportError:
+                if not _should_retry(request, self.config, attempt):
+                    raise
+                time.sleep(self.config.backoff(attempt))
+            else:
+                if response.status_code not in RETRY_STATUSES or not _should_retry(
+                    request, self.config, attempt
+                ):
+                    return response
+                response.close()
+                time.sleep(self.config.backoff(attempt, response))
+            attempt += 1
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncRetryTransport(httpx.AsyncBaseTransport):
+    """Async twin of ``RetryTransport``."""
+
+    def __init__(self, config: ClientConfig = DEFAULT_CLIENT_CONFIG):
+        self.config = config
+        self._transport = httpx.AsyncHTTPTransport(limits=config.limits, http2=config.http2)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        import asyncio
+
+        attempt = 0
+        while True:
+            try:
+                response = await self._transport.handle_async_request(request)
+            except httpx.TransportError:
+                if not _should_retry(request, self.config, attempt):
+                    raise
+                await asyncio.sleep(self.config.backoff(attempt))
+            else:
+                if response.status_code not in RETRY_STATUSES or not _should_retry(
+                    request, self.config, attempt
+                ):
+                    return response
+                await response.aclose()
+                await asyncio.sleep(self.config.backoff(attempt, response))
+            attempt += 1
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def build_http_client(config: ClientConfig = DEFAULT_CLIENT_CONFIG) -> httpx.Client:
+    """Pooled, keep-alive ``httpx.Client`` that retries transient read failures."""
+    return httpx.Client(
+        transport=RetryTransport(config),
+        timeout=config.timeout,
+        follow_redirects=True,
+        event_hooks={"response": [record_response_size]},
+    )
+
+
+def build_async_http_client(config: ClientConfig = DEFAULT_CLIENT_CONFIG) -> httpx.AsyncClient:
+    """Async twin of ``build_http_client``."""
+    return httpx.AsyncClient(
+        transport=AsyncRetryTransport(config),
+        timeout=config.timeout,
+        follow_redirects=True,
+        event_hooks={"response": [arecord_response_size]},
+    )
+
+
+class ClientRegistry:
+    """Thread-safe map of ``(url, key)`` to a shared Supabase client.
+
+    The ``config`` given on the first request for a pair is the one used;
+    later calls for the same pair get the existing client.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients: Dict[Tuple[str, str], Client] = {}
+        self._async_clients: Dict[Tuple[str, str], AsyncClient] = {}
+
+    def get(self, url: str, key: str, config: Optional[ClientConfig] = None) -> Client:
+        """Shared sync client for ``(url, key)``, created on first use."""
+        with self._lock:
+            client = self._clients.get((url, key))
+            if client is None:
+                http_client = build_http_client(config or DEFAULT_CLIENT_CONFIG)
+                client = create_client(url, key, ClientOptions(httpx_client=http_client))
+                self._clients[(url, key)] = client
+            return client
+
+    async def aget(self, url: str, key: str, config: Optional[ClientConfig] = None) -> AsyncClient:
+        """Shared async client for ``(url, key)``, created on first use.
+
+        ``httpx.AsyncClient`` connections belong to the event loop that opened
+        them, so only share these within one loop.
+        """
+        with self._lock:
+            client = self._async_clients.get((url, key))
+        if client is not None:
+            return client
+        http_client = build_async_http_client(config or DEFAULT_CLIENT_CONFIG)
+        client = await acreate_client(url, key, AsyncClientOptions(httpx_client=http_client))
+        with self._lock:
+            # Another task may have created one while this one awaited.
+            shared = self._async_clients.setdefault((url, key), client)
+        if shared is not client:
+            await http_client.aclose()
+        return shared
+
+    def close(self) -> None:
+        """Close the sync clients' connections and forget them.
+
+        Async clients are left alone: their connections belong to an event
+        loop and must be closed from it with ``aclose``.
+        """
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            client.options.httpx_client.close()
+
+    async def aclose(self) -> None:
+        """Close the async clients' connections and forget them.
+
+        Call it from the event loop the clients were used on, before it exits.
+        """
+        with self._lock:
+            clients = list(self._async_clients.values())
+            self._async_clients.clear()
+        for client in clients:
+            await client.options.httpx_client.aclose()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._clients) + len(self._async_clients)
+
+
+_registry = ClientRegistry()
+
+
+def get_client(url: str, key: str, config: Optional[ClientConfig] = None) -> Client:
+    """Shared Supabase client for ``(url, key)`` from the process-wide registry."""
+    return _registry.get(url, key, config)
+
+
+async def get_async_client(url: str, key: str, config: Optional[ClientConfig] = None) -> AsyncClient:
+    """Shared async Supabase client for ``(url, key)`` from the process-wide registry."""
+    return await _registry.aget(url, key, config)
+
+
+def close_clients() -> None:
+    """Close the shared sync clients, e.g. at shutdown or after forking."""
+    _registry.close()
+
+
+async def aclose_clients() -> None:
+    """Close the shared async clients from the event loop that used them."""
+    await _registry.aclose()
@@ -1,24 +1,123 @@
-"""Database storage using Supabase client for AIRE data mining."""
+"""Database storage using Supabase client for AIRE data mining.
+
+``supabase`` and ``dotenv`` are imported when the first client is built, not
+at module import, so importing the accessors stays cheap. Clients come from
+the process-wide registry in ``client.py``, so instances for the same
+project share one connection pool.
+"""
 
-from supabase import create_client, Client
 import os
-from dotenv import load_dotenv
+from typing import TYPE_CHECKING, Any, Optional, Tuple
+
+from ..instrumentation import Instrumentation, get_instrumentation, query_table
+
+if TYPE_CHECKING:
+    from supabase import AsyncClient, Client
+
+    from .client import ClientConfig
+
+_env_loaded = False
+
 
-load_dotenv()
+def _credentials() -> Tuple[str, str]:
+    """Read Supabase credentials, loading ``.env`` on first use."""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        _env_loaded = True
+
+    url = os.getenv("SUPABASE_URL")
+    key = os.getenv("SUPABASE_KEY")
+    if not url or not key:
+        raise ValueError("Missing SUPABASE_URL or SUPABASE_KEY environment variables")
+    return url, key
 
 
 class SupabaseDB:
     """Supabase database client for AIRE data mining repository."""
 
-    def __init__(self):
-        """Initialize Supabase client."""
-        self.url = os.getenv("SUPABASE_URL")
-        self.key = os.getenv("SUPABASE_KEY")
+    def __init__(
+        self,
+        config: Optional["ClientConfig"] = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ):
+        """Initialize Supabase client, reusing the shared one for this project."""
+        from .client import get_client
+
+        self.url, self.key = _credentials()
+        self.client: "Client" = get_client(self.url, self.key, config)
+        self.instrumentation = instrumentation or get_instrumentation()
+
+    def table(self, name: str):
+        """Access a table by name."""
+        return self.client.table(name)
+
+    def execute(self, query: Any, table: Optional[str] = None) -> Any:
+        """Execute a built query, recording it with ``instrumentation``."""
+        return self.instrumentation.run(table or query_table(query), query, query.execute)
+
+    @property
+    def incidents(self):
+        """Access incidents table."""
+        return self.client.table("incidents")
+
+    @property
+    def benchmarks(self):
+        """Access benchmarks table."""
+        return self.client.table("benchmarks")
+
+    @property
+    def evals(self):
+        """Access evals table."""
+        return self.client.table("evals")
+
+    @property
+    def versions(self):
+        """Access versions table."""
+        return self.client.table("versions")
+
+    @property
+    def epoch_models(self):
+        """Access epoch_models table."""
+        return self.client.table("epoch_models")
+
+
+class AsyncSupabaseDB:
+    """Async Supabase database client; build it with ``await AsyncSupabaseDB.create()``."""
+
+    def __init__(
+        self,
+        client: "AsyncClient",
+        url: str,
+        key: str,
+        instrumentation: Optional[Instrumentation] = None,
+    ):
+        self.client = client
+        self.url = url
+        self.key = key
+        self.instrumentation = instrumentation or get_instrumentation()
+
+    @classmethod
+    async def create(
+        cls,
+        config: Optional["ClientConfig"] = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ) -> "AsyncSupabaseDB":
+        """Initialize an async Supabase client from the environment."""
+        from .client import get_async_client
+
+        url, key = _credentials()
+        return cls(await get_async_client(url, key, config), url, key, instrumentation)
 
-        if not self.url or not self.key:
-            raise ValueError("Missing SUPABASE_URL or SUPABASE_KEY environment variables")
+    def table(self, name: str):
+        """Access a table by name."""
+        return self.client.table(name)
 
-        self.client: Client = create_client(self.url, self.key)
+    async def execute(self, query: Any, table: Optional[str] = None) -> Any:
+        """Execute a built query, recording it with ``instrumentation``."""
+        return await self.instrumentation.arun(table or query_table(query), query, query.execute)
 
     @property
     def incidents(self):
@@ -0,0 +1,515 @@
+"""Local SQLite read replica of the Supabase tables.
+
+Rows are stored as JSON documents keyed by ``id`` with expression indexes on
+the scalar columns the accessors filter and sort on, plus one side table per
+array column (``risk_cats``, ``models`` ...) so ``contains`` filters are index
+lookups. ``ReplicaDB`` exposes the same table properties as ``SupabaseDB``
+and a query builder covering the PostgREST calls the accessors make, so it
+can be passed anywhere a ``SupabaseDB`` is expected.
+
+Results follow Postgres semantics where SQLite differs: ``id`` keeps its
+native type (integer ids sort and compare as numbers, also when a filter
+passes them as strings the way PostgREST does; text ids such as UUIDs
+compare as text), and NULLs sort last ascending and first descending.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+from contextlib import closing
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..instrumentation import Instrumentation, get_instrumentation
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPLICA_PATH = "aire_replica.db"
+
+# Stored in ``PRAGMA user_version``; replicas written by an older layout
+# are emptied and refilled by the next sync.
+REPLICA_SCHEMA_VERSION = 2
+# Created with every replica; a database without it was not written by one.
+SYNC_STATE_TABLE = "_sync_state"
+
+TABLES = ("incidents", "benchmarks", "evals", "versions", "epoch_models")
+
+INDEXED_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "incidents": ("quarter", "reporting_date"),
+    "benchmarks": ("benchmark", "date", "availability"),
+    "evals": ("public_id", "release_date", "reviewed"),
+    "versions": ("name",),
+    "epoch_models": (),
+}
+
+ARRAY_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "incidents": ("risk_cats", "actors_origin"),
+    "benchmarks": ("risk_cats",),
+    "evals": ("organizations", "models", "risk_cats"),
+    "versions": (),
+    "epoch_models": (),
+}
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+_COMPARISONS = {
+    "eq": "=",
+    "neq": "!=",
+    "gt": ">",
+    "gte": ">=",
+    "lt": "<",
+    "lte": "<=",
+}
+
+
+def _identifier(name: str) -> str:
+    if not _IDENTIFIER.match(name):
+        raise ValueError(f"Invalid column name: {name!r}")
+    return name
+
+
+def column_sql(column: str) -> str:
+    """SQL expression for a column of a replicated row."""
+    if column == "id":
+        return "id"
+    return f"json_extract(row, '$.{_identifier(column)}')"
+
+
+def array_table(table: str, column: str) -> str:
+    """Name of the side table indexing an array column."""
+    return f"{table}__{column}"
+
+
+def row_hash(row: Dict[str, Any]) -> str:
+    """Stable content hash used to detect changed rows."""
+    payload = json.dumps(row, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _split_or(expression: str) -> List[str]:
+    """Split a PostgREST ``or`` expression on top-level commas."""
+    parts, current, quoted, escaped, depth = [], [], False, False, 0
+    for char in expression:
+        if escaped:
+            escaped = False
+        elif quoted and char == "\\":
+            escaped = True
+        elif char == '"':
+            quoted = not quoted
+        elif not quoted and char in "({":
+            depth += 1
+        elif not quoted and char in ")}":
+            depth -= 1
+        elif not quoted and depth == 0 and char == ",":
+            parts.append("".join(current))
+            current = []
+            continue
+        current.append(char)
+    parts.append("".join(current))
+    return [part.strip() for part in parts if part.strip()]
+
+
+def coerce_value(column: str, value: str) -> Any:
+    """Turn a filter value back into the JSON scalar it was serialized from."""
+    if column == "id":
+        return value
+    if value in ("true", "false"):
+        return value == "true"
+    for parse in (int, float):
+        try:
+            return parse(value)
+        except ValueError:
+            pass
+    return value
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1].replace('\\"', '"').replace("\\\\", "\\")
+    return value
+
+
+def _parse_list(value: str) -> List[str]:
+    return [_unquote(item) for item in _split_or(value.strip("{}()"))]
+
+
+@dataclass
+class ReplicaResponse:
+    """Result of a replica query, shaped like postgrest's ``APIResponse``."""
+
+    data: List[Dict[str, Any]] = field(default_factory=list)
+    count: Optional[int] = None
+
+
+class ReplicaQuery:
+    """Query builder over one replicated table.
+
+    Mirrors the subset of the postgrest filter builder used by the accessors.
+    """
+
+    def __init__(self, replica: "ReplicaDB", table: str):
+        if table not in TABLES:
+            raise ValueError(f"Table {table!r} is not replicated")
+        self.replica = replica
+        self.table = table
+        self.columns: Optional[List[str]] = None
+        self.count_method: Optional[str] = None
+        self.head = False
+        self.clauses: List[str] = []
+        self.params: List[Any] = []
+        self.ordering: List[str] = []
+        self.row_limit: Optional[int] = None
+        self.row_offset: Optional[int] = None
+
+    def select(self, *columns: str, count: Optional[str] = None, head: Optional[bool] = None) -> "ReplicaQuery":
+        names = [c.strip() for column in columns for c in column.split(",") if c.strip()]
+        self.columns = None if not names or "*" in names else names
+        self.count_method = count
+        self.head = bool(head)
+        return self
+
+    def _compare(self, column: str, operator: str, value: Any) -> "ReplicaQuery":
+        self.clauses.append(f"{column_sql(column)} {operator} ?")
+        self.params.append(value)
+        return self
+
+    def eq(self, column: str, value: Any) -> "ReplicaQuery":
+        return self._compare(column, "=", value)
+
+    def neq(self, column: str, value: Any) -> "ReplicaQuery":
+        return self._compare(column, "!=", value)
+
+    def gt(self, column: str, value: Any) -> "ReplicaQuery":
+        return self._compare(column, ">", value)
+
+    def gte(self, column: str, value: Any) -> "ReplicaQuery":
+        return self._compare(column, ">=", value)
+
+    def lt(self, column: str, value: Any) -> "ReplicaQuery":
+        return self._compare(column, "<", value)
+
+    def lte(self, column: str, value: Any) -> "ReplicaQuery":
+        return self._compare(column, "<=", value)
+
+    def ilike(self, column: str, pattern: str) -> "ReplicaQuery":
+        self.clauses.append(f"{column_sql(column)} LIKE ? ESCAPE '\\'")
+        self.params.append(pattern.replace("*", "%"))
+        return self
+
+    def is_(self, column: str, value: Any) -> "ReplicaQuery":
+        if value is None or value == "null":
+            self.clauses.append(f"{column_sql(column)} IS NULL")
+            return self
+        return self._compare(column, "IS", value)
+
+    def in_(self, column: str, values: Iterable[Any]) -> "ReplicaQuery":
+        values = list(values)
+        if not values:
+            self.clauses.append("0")
+            return self
+        placeholders = ", ".join("?" for _ in values)
+        self.clauses.append(f"{column_sql(column)} IN ({placeholders})")
+        self.params.extend(values)
+        return self
+
+    def contains(self, column: str, values: Sequence[Any]) -> "ReplicaQuery":
+        if column not in ARRAY_COLUMNS[self.table]:
+            raise ValueError(f"{self.table}.{column} is not an array column")
+        side = array_table(self.table, column)
+        for value in values:
+            self.clauses.append(f"id IN (SELECT id FROM {side} WHERE value = ?)")
+            self.params.append(value)
+        return self
+
+    def or_(self, filters: str) -> "ReplicaQuery":
+        clauses, params = [], []
+        for part in _split_or(filters):
+            column, operator, value = part.split(".", 2)
+            negated = operator == "not"
+            if negated:
+                operator, value = value.split(".", 1)
+            value = _unquote(value)
+            if operator == "is" and value == "null":
+                clauses.append(f"{column_sql(column)} IS {'NOT ' if negated else ''}NULL")
+            elif negated:
+                raise ValueError(f"Unsupported operator in or_ filter: not.{operator}")
+            elif operator == "ilike":
+                clauses.append(f"{column_sql(column)} LIKE ? ESCAPE '\\'")
+                params.append(value.replace("*", "%"))
+            elif operator in _COMPARISONS:
+                clauses.append(f"{column_sql(column)} {_COMPARISONS[operator]} ?")
+                params.append(coerce_value(column, value))
+            elif operator == "in":
+                items = [coerce_value(column, item) for item in _parse_list(value)]
+                placeholders = ", ".join("?" for _ in items) or "NULL"
+                clauses.append(f"{column_sql(column)} IN ({placeholders})")
+                params.extend(items)
+            elif operator == "cs":
+                # The array must hold every listed item.
+                side = array_table(self.table, _identifier(column))
+                items = _parse_list(value)
+                contained = [f"id IN (SELECT id FROM {side} WHERE value = ?)" for _ in items]
+                clauses.append("(" + " AND ".join(contained or ["1"]) + ")")
+                params.extend(items)
+            else:
+                raise ValueError(f"Unsupported operator in or_ filter: {operator!r}")
+        self.clauses.append("(" + " OR ".join(clauses) + ")")
+        self.params.extend(params)
+        return self
+
+    def order(self, column: str, desc: bool = False, nullsfirst: Optional[bool] = None) -> "ReplicaQuery":
+        if nullsfirst is None:
+            # Postgres puts NULLs last ascending and first descending.
+            nullsfirst = desc
+        direction = "DESC" if desc else "ASC"
+        direction += " NULLS FIRST" if nullsfirst else " NULLS LAST"
+        self.ordering.append(f"{column_sql(column)} {direction}")
+        return self
+
+    def limit(self, size: int) -> "ReplicaQuery":
+        self.row_limit = size
+        return self
+
+    def range(self, start: int, end: int) -> "ReplicaQuery":
+        self.row_offset = start
+        self.row_limit = end - start + 1
+        return self
+
+    def _where(self) -> str:
+        return f" WHERE {' AND '.join(self.clauses)}" if self.clauses else ""
+
+    def to_sql(self) -> Tuple[str, List[Any]]:
+        """Compile the query into SQL and parameters."""
+        sql = f"SELECT row FROM {self.table}{self._where()}"
+        if self.ordering:
+            sql += " ORDER BY " + ", ".join(self.ordering)
+        if self.row_limit is not None or self.row_offset is not None:
+            sql += " LIMIT ? OFFSET ?"
+            return sql, self.params + [
+                -1 if self.row_limit is None else self.row_limit,
+                self.row_offset or 0,
+            ]
+        return sql, list(self.params)
+
+    def execute(self) -> ReplicaResponse:
+        conn = self.replica.connection
+        count = None
+        if self.count_method:
+            sql = f"SELECT COUNT(*) FROM {self.table}{self._where()}"
+            count = conn.execute(sql, self.params).fetchone()[0]
+        if self.head:
+            return ReplicaResponse(data=[], count=count)
+
+        sql, params = self.to_sql()
+        rows = [json.loads(row) for (row,) in conn.execute(sql, params)]
+        if self.columns is not None:
+            rows = [{c: row.get(c) for c in self.columns} for row in rows]
+        return ReplicaResponse(data=rows, count=count)
+
+
+def _table_names(conn: sqlite3.Connection) -> set:
+    return {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+
+def _replica_tables() -> List[str]:
+    """Replicated tables and their array side tables."""
+    return [
+        name for table in TABLES
+        for name in (table, *(array_table(table, c) for c in ARRAY_COLUMNS[table]))
+    ]
+
+
+class ReplicaDB:
+    """SQLite replica usable in place of ``SupabaseDB``.
+
+    Each thread gets its own connection; the database runs in WAL mode so
+    readers are not blocked while a sync is writing.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_REPLICA_PATH,
+        instrumentation: Optional[Instrumentation] = None,
+    ):
+        self.path = path
+        self.instrumentation = instrumentation or get_instrumentation()
+        self._local = threading.local()
+        self.create_schema()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def create_schema(self) -> None:
+        """Create replica tables, array side tables and indexes.
+
+        ``id`` columns have NUMERIC affinity: integer ids are stored and
+        compared as integers, other ids as text. Only replicas are migrated:
+        a database with tables of the same names but without the replica's
+        sync state (such as ``aire.db``) is refused and left untouched.
+        """
+        # Inspect with a plain connection so a refused file is not switched to WAL.
+        with closing(sqlite3.connect(self.path)) as probe:
+            existing = _table_names(probe)
+            version = probe.execute("PRAGMA user_version").fetchone()[0]
+        if SYNC_STATE_TABLE not in existing:
+            foreign = sorted(existing & set(_replica_tables()))
+            if foreign:
+                raise ValueError(
+                    f"{self.path} is not a replica but has tables {', '.join(foreign)}; "
+                    "use a separate replica path"
+                )
+        conn = self.connection
+        if version < REPLICA_SCHEMA_VERSION:
+            self._drop_tables(conn, existing)
+            conn.execute(f"PRAGMA user_version = {REPLICA_SCHEMA_VERSION}")
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {SYNC_STATE_TABLE} ("
+            "table_name TEXT PRIMARY KEY, watermark TEXT, synced_at TEXT)"
+        )
+        for table in TABLES:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "id NUMERIC PRIMARY KEY, row TEXT NOT NULL, row_hash TEXT NOT NULL)"
+            )
+            for column in INDEXED_COLUMNS[table]:
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS ix_{table}_{column} "
+                    f"ON {table} ({column_sql(column)})"
+                )
+            for column in ARRAY_COLUMNS[table]:
+                side = array_table(table, column)
+                conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {side} ("
+                    "id NUMERIC NOT NULL, value TEXT NOT NULL, PRIMARY KEY (value, id)"
+                    ") WITHOUT ROWID"
+                )
+                conn.execute(f"CREATE INDEX IF NOT EXISTS ix_{side}_id ON {side} (id)")
+
+    def _drop_tables(self, conn: sqlite3.Connection, existing: set) -> None:
+        stale = [name for name in _replica_tables() if name in existing]
+        if not stale:
+            return
+        logger.warning("Replica %s uses an old layout; the next sync refills it", self.path)
+        for name in stale:
+            conn.execute(f"DROP TABLE {name}")
+        conn.execute(f"DELETE FROM {SYNC_STATE_TABLE}")
+
+    def table(self, name: str) -> ReplicaQuery:
+        """Start a query on a replicated table."""
+        return ReplicaQuery(self, name)
+
+    def execute(self, query: ReplicaQuery, table: Optional[str] = None) -> ReplicaResponse:
+        """Execute a built query, recording it with ``instrumentation``."""
+        return self.instrumentation.run(table or query.table, query, query.execute)
+
+    def upsert_rows(self, table: str, rows: Iterable[Dict[str, Any]]) -> Tuple[int, int, int]:
+        """Write rows whose content changed.
+
+        Returns ``(inserted, updated, unchanged)`` counts.
+        """
+        conn = self.connection
+        inserted = updated = unchanged = 0
+        arrays = ARRAY_COLUMNS[table]
+        conn.execute("BEGIN")
+        try:
+            for row in rows:
+                row_id = row["id"]
+                digest = row_hash(row)
+                existing = conn.execute(
+                    f"SELECT row_hash FROM {table} WHERE id = ?", (row_id,)
+                ).fetchone()
+                if existing and existing[0] == digest:
+                    unchanged += 1
+                    continue
+                conn.execute(
+                    f"INSERT INTO {table} (id, row, row_hash) VALUES (?, ?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET row = excluded.row, "
+                    "row_hash = excluded.row_hash",
+                    (row_id, json.dumps(row, default=str), digest),
+                )
+                for column in arrays:
+                    side = array_table(table, column)
+                    conn.execute(f"DELETE FROM {side} WHERE id = ?", (row_id,))
+                    conn.executemany(
+                        f"INSERT OR IGNORE INTO {side} (id, value) VALUES (?, ?)",
+                        [(row_id, value) for value in row.get(column) or []],
+                    )
+                if existing:
+                    updated += 1
+                else:
+                    inserted += 1
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return inserted, updated, unchanged
+
+    def delete_missing(self, table: str, keep_ids: Iterable[Any]) -> int:
+        """Delete replicated rows whose id is not in ``keep_ids``."""
+        conn = self.connection
+        conn.execute("BEGIN")
+        try:
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS _keep (id NUMERIC PRIMARY KEY)")
+            conn.execute("DELETE FROM _keep")
+            conn.executemany(
+                "INSERT OR IGNORE INTO _keep (id) VALUES (?)",
+                ((row_id,) for row_id in keep_ids),
+            )
+            condition = "id NOT IN (SELECT id FROM _keep)"
+            for column in ARRAY_COLUMNS[table]:
+                conn.execute(f"DELETE FROM {array_table(table, column)} WHERE {condition}")
+            deleted = conn.execute(f"DELETE FROM {table} WHERE {condition}").rowcount
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return deleted
+
+    def get_watermark(self, table: str) -> Optional[str]:
+        row = self.connection.execute(
+            f"SELECT watermark FROM {SYNC_STATE_TABLE} WHERE table_name = ?", (table,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_watermark(self, table: str, watermark: Optional[str], synced_at: str) -> None:
+        self.connection.execute(
+            f"INSERT INTO {SYNC_STATE_TABLE} (table_name, watermark, synced_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(table_name) DO UPDATE SET watermark = excluded.watermark, "
+            "synced_at = excluded.synced_at",
+            (table, watermark, synced_at),
+        )
+
+    @property
+    def incidents(self) -> ReplicaQuery:
+        """Access incidents table."""
+        return self.table("incidents")
+
+    @property
+    def benchmarks(self) -> ReplicaQuery:
+        """Access benchmarks table."""
+        return self.table("benchmarks")
+
+    @property
+    def evals(self) -> ReplicaQuery:
+        """Access evals table."""
+        return self.table("evals")
+
+    @property
+    def versions(self) -> ReplicaQuery:
+        """Access versions table."""
+        return self.table("versions")
+
+    @property
+    def epoch_models(self) -> ReplicaQuery:
+        """Access epoch_models table."""
+        return self.table("epoch_models")
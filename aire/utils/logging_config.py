@@ -1,10 +1,12 @@
 """Logging configuration for AIRE."""
 
 import logging
+from typing import TYPE_CHECKING
 
-from aire.config.settings import Settings
+if TYPE_CHECKING:
+    from aire.config.settings import Settings
 
-def setup_logging(settings: Settings) -> None:
+def setup_logging(settings: "Settings") -> None:
     """Set up logging configuration."""
     logging.basicConfig(
         level=getattr(logging, settings.log_level.upper()),
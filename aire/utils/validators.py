@@ -1,32 +1,316 @@
-"""Data validation utilities."""
+"""Data validation utilities.
 
-from typing import Any, Dict, List
+Each table has a ``Schema`` that is compiled once into a ``Validator``. A
+validator checks a whole DataFrame column by column (presence, nulls, types,
+numeric ranges, allowed categories, lengths) with vectorized pandas
+operations and returns a ``ValidationReport`` listing every failing row and
+why, alongside the valid rows with parsed types.
+"""
 
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
+# pandas 2 infers one format from the first value unless told which to use.
+_PANDAS_2 = int(pd.__version__.split(".")[0]) >= 2
+
+Batch = Union[pd.DataFrame, Sequence[Dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class Field:
+    """Constraints on one column.
+
+    ``dtype`` is one of ``"string"``, ``"number"``, ``"datetime"`` or
+    ``"boolean"``.
+    """
+
+    name: str
+    dtype: str = "string"
+    required: bool = True
+    nullable: bool = False
+    min: Optional[float] = None
+    max: Optional[float] = None
+    choices: Optional[Tuple[Any, ...]] = None
+    max_length: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class Schema:
+    """Named collection of field constraints for one table."""
+
+    name: str
+    fields: Tuple[Field, ...]
+
+    def compile(self) -> "Validator":
+        return Validator(self)
+
+
+@dataclass
+class ValidationReport:
+    """Outcome of validating one frame or batch.
+
+    ``errors`` has one row per failed check with columns ``row`` (position in
+    the input, counted across batches when streaming), ``field`` and
+    ``error``. ``valid`` holds the passing rows with parsed column types.
+    """
+
+    total: int
+    valid: pd.DataFrame
+    errors: pd.DataFrame
+    valid_positions: List[int] = field(default_factory=list)
+
+    @property
+    def invalid_count(self) -> int:
+        return self.total - len(self.valid_positions)
+
+    @property
+    def ok(self) -> bool:
+        return self.errors.empty
+
+    def summary(self) -> Dict[Tuple[str, str], int]:
+        """Count of failures per ``(field, error)``."""
+        if self.errors.empty:
+            return {}
+        counts = self.errors.groupby(["field", "error"]).size()
+        return {key: int(value) for key, value in counts.items()}
+
+
+# A compiled check returns (parsed column, [(message, failure mask), ...]).
+Check = Callable[[pd.Series], Tuple[pd.Series, List[Tuple[str, pd.Series]]]]
+
+
+_PYTHON_TYPES: Dict[str, Tuple[type, ...]] = {
+    "string": (str,),
+    "boolean": (bool, np.bool_),
+}
+
+
+def _wrong_type(series: pd.Series, dtype: str) -> pd.Series:
+    """Mask of values in ``series`` that are not of ``dtype`` (nulls excluded).
+
+    The column's inferred type settles the usual all-good case in one pass;
+    only a column that mixes types is inspected value by value to find the
+    offending rows.
+    """
+    if pd.api.types.infer_dtype(series, skipna=True) in (dtype, "empty"):
+        return pd.Series(False, index=series.index)
+    expected = _PYTHON_TYPES[dtype]
+    return ~series.map(lambda value: isinstance(value, expected)) & series.notna()
+
+
+def _parse_datetimes(series: pd.Series) -> pd.Series:
+    """Parse dates as ISO 8601 in one vectorized pass.
+
+    Only the values that fail are parsed again one by one, so a column of
+    ISO dates with a few other spellings stays fast.
+    """
+    if not _PANDAS_2:
+        return pd.to_datetime(series, errors="coerce")
+    parsed = pd.to_datetime(series, errors="coerce", format="ISO8601")
+    retry = parsed.isna() & series.notna()
+    if retry.any():
+        parsed[retry] = pd.to_datetime(series[retry], errors="coerce", format="mixed")
+    return parsed
+
+
+def _compile_field(spec: Field) -> Check:
+    """Build the vectorized check for one field."""
+
+    def parse(series: pd.Series) -> Tuple[pd.Series, pd.Series, str]:
+        if spec.dtype == "number":
+            parsed = pd.to_numeric(series, errors="coerce")
+            return parsed, parsed.isna(), "not a number"
+        if spec.dtype == "datetime":
+            parsed = _parse_datetimes(series)
+            return parsed, parsed.isna(), "not a date"
+        return series, _wrong_type(series, spec.dtype), f"not a {spec.dtype}"
+
+    def check(series: pd.Series) -> Tuple[pd.Series, List[Tuple[str, pd.Series]]]:
+        failures: List[Tuple[str, pd.Series]] = []
+        null = series.isna()
+        if not spec.nullable:
+            failures.append(("is null", null))
+
+        parsed, bad_type, message = parse(series)
+        bad_type = bad_type & ~null
+        failures.append((message, bad_type))
+
+        present = ~null & ~bad_type
+        if spec.dtype == "number":
+            if spec.min is not None:
+                failures.append((f"below minimum {spec.min}", present & (parsed < spec.min)))
+            if spec.max is not None:
+                failures.append((f"above maximum {spec.max}", present & (parsed > spec.max)))
+        if spec.choices is not None:
+            failures.append(("not an allowed value", present & ~series.isin(spec.choices)))
+        if spec.max_length is not None and spec.dtype == "string":
+            too_long = present & (series.where(present, "").str.len() > spec.max_length)
+            failures.append((f"longer than {spec.max_length}", too_long))
+        return parsed, failures
+
+    return check
+
+
+class Validator:
+    """Schema compiled into per-field vectorized checks."""
+
+    def __init__(self, schema: Schema):
+        self.schema = schema
+        self.checks: List[Tuple[Field, Check]] = [
+            (spec, _compile_field(spec)) for spec in schema.fields
+        ]
+
+    def validate_frame(
+        self,
+        frame: pd.DataFrame,
+        offset: int = 0,
+        absent: Optional[Dict[str, pd.Series]] = None,
+    ) -> ValidationReport:
+        """Validate every row of ``frame``; ``offset`` shifts reported row numbers.
+
+        ``absent`` maps a column to the rows whose input lacked the key, so
+        those are reported as missing rather than null (see
+        ``validate_records``).
+        """
+        frame = frame.reset_index(drop=True)
+        absent = absent or {}
+        invalid = pd.Series(False, index=frame.index)
+        parsed_columns: Dict[str, pd.Series] = {}
+        error_parts: List[pd.DataFrame] = []
+
+        def record(field_name: str, message: str, mask: pd.Series) -> None:
+            rows = mask[mask].index
+            if len(rows):
+                error_parts.append(pd.DataFrame({
+                    "row": rows + offset,
+                    "field": field_name,
+                    "error": message,
+                }))
+
+        for spec, check in self.checks:
+            if spec.name not in frame.columns:
+                if spec.required:
+                    record(spec.name, "missing field", pd.Series(True, index=frame.index))
+                    invalid[:] = True
+                continue
+            parsed, failures = check(frame[spec.name])
+            parsed_columns[spec.name] = parsed
+            missing = absent.get(spec.name)
+            if missing is not None:
+                failures = [(message, mask & ~missing) for message, mask in failures]
+                if spec.required:
+                    failures.insert(0, ("missing field", missing))
+            for message, mask in failures:
+                mask = mask.fillna(False).astype(bool)
+                if mask.any():
+                    record(spec.name, message, mask)
+                    invalid |= mask
+
+        if error_parts:
+            errors = pd.concat(error_parts, ignore_index=True).sort_values(
+                ["row", "field"], kind="stable"
+            ).reset_index(drop=True)
+        else:
+            errors = pd.DataFrame({"row": pd.Series(dtype="int64"), "field": [], "error": []})
+
+        valid = frame.assign(**parsed_columns)[~invalid]
+        positions = [int(i) + offset for i in valid.index]
+        return ValidationReport(
+            total=len(frame),
+            valid=valid.reset_index(drop=True),
+            errors=errors,
+            valid_positions=positions,
+        )
+
+    def _absent_keys(
+        self, records: Sequence[Dict[str, Any]], frame: pd.DataFrame
+    ) -> Dict[str, pd.Series]:
+        """Rows lacking each schema key, for columns where some row lacks it."""
+        absent = {}
+        for spec in self.schema.fields:
+            # A key missing from a row shows up as a null in its column.
+            if spec.name in frame.columns and frame[spec.name].isna().any():
+                mask = pd.Series([spec.name not in record for record in records], index=frame.index)
+                if mask.any():
+                    absent[spec.name] = mask
+        return absent
+
+    def validate_records(self, records: Sequence[Dict[str, Any]], offset: int = 0) -> ValidationReport:
+        """Validate a list of dicts; keys absent from a row are reported as missing."""
+        records = list(records)
+        frame = pd.DataFrame.from_records(records)
+        return self.validate_frame(frame, offset, self._absent_keys(records, frame))
+
+    def validate_batches(self, batches: Iterable[Batch]) -> Iterator[ValidationReport]:
+        """Validate a stream of DataFrames or record lists, one report per batch."""
+        offset = 0
+        for batch in batches:
+            if isinstance(batch, pd.DataFrame):
+                report = self.validate_frame(batch, offset)
+            else:
+                report = self.validate_records(batch, offset)
+            yield report
+            offset += report.total
+
+
+# Lengths follow the VARCHAR sizes of the aire.db tables. Categories and
+# numeric columns are only type-checked: the data defines no fixed set of
+# categories or scale for severity and scores.
+INCIDENT_SCHEMA = Schema("incidents", (
+    Field("title", max_length=255),
+    Field("description"),
+    Field("date", "datetime"),
+    Field("category", max_length=50),
+    Field("severity", "number"),
+))
+
+BENCHMARK_SCHEMA = Schema("benchmarks", (
+    Field("name", max_length=255),
+    Field("metric", max_length=100),
+    Field("value", "number"),
+    Field("category", max_length=50),
+))
+
+EVALUATION_SCHEMA = Schema("evaluations", (
+    Field("assessment", max_length=255),
+    Field("score", "number"),
+    Field("category", max_length=50),
+    Field("date", "datetime"),
+))
+
+INCIDENT_VALIDATOR = INCIDENT_SCHEMA.compile()
+BENCHMARK_VALIDATOR = BENCHMARK_SCHEMA.compile()
+EVALUATION_VALIDATOR = EVALUATION_SCHEMA.compile()
+
+
+def _validate_items(validator: Validator, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Return the valid input items unchanged, logging why others were dropped."""
+    if not data:
+        return []
+    report = validator.validate_records(data)
+    if not report.ok:
+        for (field_name, error), count in report.summary().items():
+            logger.warning(
+                "%s: dropped %d row(s) where %s %s",
+                validator.schema.name, count, field_name, error,
+            )
+    return [data[position] for position in report.valid_positions]
+
+
 def validate_incident_data(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Validate incident data format."""
-    required_fields = ["title", "description", "date", "category", "severity"]
-    validated = []
-    for item in data:
-        if all(field in item for field in required_fields):
-            validated.append(item)
-    return validated
+    return _validate_items(INCIDENT_VALIDATOR, data)
 
 def validate_benchmark_data(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Validate benchmark data."""
-    required_fields = ["name", "metric", "value", "category"]
-    validated = []
-    for item in data:
-        if all(field in item for field in required_fields):
-            validated.append(item)
-    return validated
+    return _validate_items(BENCHMARK_VALIDATOR, data)
 
 def validate_evaluation_data(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Validate evaluation data."""
-    required_fields = ["assessment", "score", "category", "date"]
-    validated = []
-    for item in data:
-        if all(field in item for field in required_fields):
-            validated.append(item)
-    return validated
\ No newline at end of file
+    return _validate_items(EVALUATION_VALIDATOR, data)
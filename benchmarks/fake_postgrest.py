@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""Local PostgREST stand-in serving a ``ReplicaDB`` over HTTP.
+
+Understands the subset of the PostgREST protocol the accessors use:
+``select``, ``order``, ``limit``/``offset``, column filters (``eq``,
+``neq``, ``gt``, ``gte``, ``lt``, ``lte``, ``like``, ``ilike``, ``is``,
+``in``, ``cs``), ``or`` expressions, ``Prefer: count=exact`` and ``HEAD``.
+Like Supabase, responses are capped at ``max_rows`` rows.
+
+Run it directly to serve a replica file; the chosen port is printed on the
+first line of stdout:
+
+    python benchmarks/fake_postgrest.py --db /tmp/bench.db --port 0
+"""
+
+import argparse
+import json
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from aire.data.storage.replica import ReplicaDB, ReplicaQuery, _parse_list, coerce_value
+
+REST_PREFIX = "/rest/v1/"
+DEFAULT_MAX_ROWS = 1000
+
+_RESERVED_PARAMS = {"select", "order", "limit", "offset", "or"}
+_COMPARISONS = {"eq", "neq", "gt", "gte", "lt", "lte"}
+
+
+def apply_filter(query: ReplicaQuery, column: str, expression: str) -> ReplicaQuery:
+    """Apply one ``column=operator.value`` query parameter."""
+    operator, _, value = expression.partition(".")
+    if operator in _COMPARISONS:
+        return getattr(query, operator)(column, coerce_value(column, value))
+    if operator in ("like", "ilike"):
+        return query.ilike(column, value)
+    if operator == "is":
+        return query.is_(column, None if value == "null" else coerce_value(column, value))
+    if operator == "in":
+        return query.in_(column, [coerce_value(column, item) for item in _parse_list(value)])
+    if operator == "cs":
+        return query.contains(column, _parse_list(value))
+    raise ValueError(f"Unsupported filter: {column}={expression}")
+
+
+def apply_order(query: ReplicaQuery, expression: str) -> ReplicaQuery:
+    """Apply a PostgREST ``order`` parameter such as ``date.desc.nullslast``."""
+    for term in expression.split(","):
+        column, *modifiers = term.split(".")
+        nullsfirst: Optional[bool] = None
+        if "nullsfirst" in modifiers:
+            nullsfirst = True
+        elif "nullslast" in modifiers:
+            nullsfirst = False
+        query.order(column, desc="desc" in modifiers, nullsfirst=nullsfirst)
+    return query
+
+
+def build_query(
+    replica: ReplicaDB,
+    table: str,
+    params: List[Tuple[str, str]],
+    count: Optional[str],
+    head: bool,
+    max_rows: int,
+) -> Tuple[ReplicaQuery, int]:
+    """Translate request parameters into a replica query and its offset."""
+    values = dict(params)
+    query = replica.table(table).select(values.get("select", "*"), count=count, head=head)
+    for name, value in params:
+        if name == "or":
+            query.or_(value.strip("()"))
+        elif name not in _RESERVED_PARAMS:
+            apply_filter(query, name, value)
+    if "order" in values:
+        apply_order(query, values["order"])
+    offset = int(values.get("offset", 0))
+    limit = min(int(values.get("limit", max_rows)), max_rows)
+    query.range(offset, offset + limit - 1)
+    return query, offset
+
+
+class FakePostgRESTHandler(BaseHTTPRequestHandler):
+    """Request handler; the server carries ``replica`` and ``max_rows``."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without this, Nagle's
+    # algorithm and delayed ACKs add ~40 ms to small keep-alive responses.
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        self._handle(head=False)
+
+    def do_HEAD(self) -> None:
+        self._handle(head=True)
+
+    def _handle(self, head: bool) -> None:
+        url = urlsplit(self.path)
+        if not url.path.startswith(REST_PREFIX):
+            self._send(404, {"message": f"Unknown path {url.path}"})
+            return
+        table = url.path[len(REST_PREFIX):]
+        prefer = self.headers.get("Prefer", "")
+        count = "exact" if "count=exact" in prefer else None
+        try:
+            query, offset = build_query(
+                self.server.replica,
+                table,
+                parse_qsl(url.query, keep_blank_values=True),
+                count,
+                head,
+                self.server.max_rows,
+            )
+            response = query.execute()
+        except ValueError as exc:
+            self._send(400, {"message": str(exc)})
+            return
+
+        rows = len(response.data)
+        total = "*" if response.count is None else response.count
+        content_range = f"{offset}-{offset + rows - 1}/{total}" if rows else f"*/{total}"
+        self._send(200, response.data, {"Content-Range": content_range}, head)
+
+    def _send(self, status: int, payload: Any, headers: Optional[dict] = None, head: bool = False) -> None:
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", "0" if head else str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class FakePostgREST(ThreadingHTTPServer):
+    """Threaded HTTP server answering PostgREST requests from a replica."""
+
+    daemon_threads = True
+
+    def __init__(self, replica: ReplicaDB, port: int = 0, max_rows: int = DEFAULT_MAX_ROWS):
+        super().__init__(("127.0.0.1", port), FakePostgRESTHandler)
+        self.replica = replica
+        self.max_rows = max_rows
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+def main():
+    """Serve a replica file until interrupted."""
+    parser = argparse.ArgumentParser(description="Serve a replica as a fake PostgREST API")
+    parser.add_argument("--db", required=True, help="replica SQLite file")
+    parser.add_argument("--port", type=int, default=0, help="port (0 picks a free one)")
+    parser.add_argument("--max-rows", type=int, default=DEFAULT_MAX_ROWS)
+    args = parser.parse_args()
+
+    server = FakePostgREST(ReplicaDB(args.db), args.port, args.max_rows)
+    print(server.server_port, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""Benchmark the accessor layer offline against a local PostgREST stand-in.
+
+For every scale a replica file is seeded with synthetic rows, served by
+``fake_postgrest.py`` in a separate process, and each accessor method plus
+``DataAccessor.get_summary`` is timed through the real Supabase client.
+Latency percentiles, throughput and peak Python allocations are printed
+and written as JSON; pass ``--compare`` with an earlier results file to
+see how the p50 latencies moved.
+
+    python benchmarks/run_benchmarks.py --scales 1000 10000
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/old.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+ROOT = Path(__file__).parent.parent
+
+# Add parent directory to path
+sys.path.insert(0, str(ROOT))
+
+import synthetic
+from aire.data.accessors import DataAccessor
+from aire.data.storage.client import ClientConfig
+from aire.data.storage.database import SupabaseDB
+from aire.data.storage.replica import TABLES, ReplicaDB
+
+DEFAULT_SCALES = (1_000, 10_000, 100_000)
+DEFAULT_RESULTS_DIR = ROOT / "benchmarks" / "results"
+
+
+@dataclass
+class Case:
+    """One benchmarked call; ``heavy`` cases stream whole tables and run fewer times."""
+
+    name: str
+    call: Callable[[DataAccessor], Any]
+    heavy: bool = False
+
+
+def _rows(result: Any) -> int:
+    """Rows returned by one call (lookup results count the rows found)."""
+    if hasattr(result, "found"):
+        return len(result.found)
+    if isinstance(result, list):
+        return len(result)
+    return 0 if result is None else 1
+
+
+def build_cases(scale: int) -> List[Case]:
+    """Accessor calls to time, with arguments that exist at ``scale``."""
+    incident_ids = [f"inc-{i:07d}" for i in range(0, synthetic.table_rows("incidents", scale), 7)][:500]
+    eval_ids = [f"card_{i:07d}" for i in range(0, synthetic.table_rows("evals", scale), 3)][:200]
+    return [
+        Case("incidents.count", lambda a: a.incidents.count()),
+        Case("incidents.get_by_id", lambda a: a.incidents.get_by_id("inc-0000042")),
+        Case("incidents.get_all[limit=100]", lambda a: a.incidents.get_all(limit=100)),
+        Case("incidents.get_all[listing]", lambda a: a.incidents.get_all(columns="listing")),
+        Case("incidents.get_recent", lambda a: a.incidents.get_recent(10)),
+        Case("incidents.get_by_quarter", lambda a: a.incidents.get_by_quarter("Q3 2023")),
+        Case("incidents.get_by_risk_category", lambda a: a.incidents.get_by_risk_category("Cyber Offense")),
+        Case("incidents.get_by_actor_origin", lambda a: a.incidents.get_by_actor_origin("Iran")),
+        Case("incidents.search_by_keyword", lambda a: a.incidents.search_by_keyword("deepfake election")),
+        Case("incidents.get_many_by_id[500]", lambda a: a.incidents.get_many_by_id(incident_ids)),
+        Case("incidents.iter_all[listing]", lambda a: list(a.incidents.iter_all(columns="listing")), heavy=True),
+        Case("benchmarks.get_by_name", lambda a: a.benchmarks.get_by_name("Bench-000007")),
+        Case("benchmarks.get_open_source", lambda a: a.benchmarks.get_open_source()),
+        Case("benchmarks.get_recent", lambda a: a.benchmarks.get_recent(10)),
+        Case("evals.get_by_public_id", lambda a: a.evals.get_by_public_id("card_0000003")),
+        Case("evals.get_by_organization", lambda a: a.evals.get_by_organization("Lab Helix")),
+        Case("evals.get_by_model", lambda a: a.evals.get_by_model("model-7-m")),
+        Case("evals.get_reviewed", lambda a: a.evals.get_reviewed()),
+        Case("evals.get_many_by_public_id[200]", lambda a: a.evals.get_many_by_public_id(eval_ids)),
+        Case("evals.iter_all", lambda a: list(a.evals.iter_all()), heavy=True),
+        Case("versions.search_by_name", lambda a: a.versions.search_by_name("release 1")),
+        Case("epoch_models.get_all[limit=100]", lambda a: a.epoch_models.get_all(limit=100)),
+        Case("get_summary", lambda a: a.get_summary()),
+    ]
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Linear-interpolated percentile of ``values`` (``q`` in 0..100)."""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    low = int(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def seed_replica(path: str, scale: int, seed: int) -> Dict[str, int]:
+    """Fill a fresh replica file with synthetic rows for every table."""
+    replica = ReplicaDB(path)
+    counts = {}
+    for table in TABLES:
+        inserted, _, _ = replica.upsert_rows(table, synthetic.generate(table, scale, seed))
+        counts[table] = inserted
+    replica.connection.close()
+    return counts
+
+
+def start_server(path: str, max_rows: int) -> "tuple[subprocess.Popen, str]":
+    """Launch the fake PostgREST server on a free port and return its URL."""
+    process = subprocess.Popen(
+        [sys.executable, str(Path(__file__).parent / "fake_postgrest.py"),
+         "--db", path, "--port", "0", "--max-rows", str(max_rows)],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    port = process.stdout.readline().strip()
+    if not port:
+        process.kill()
+        raise RuntimeError("fake PostgREST server failed to start")
+    return process, f"http://127.0.0.1:{port}"
+
+
+def time_case(case: Case, accessor: DataAccessor, runs: int, warmup: int) -> Dict[str, Any]:
+    """Time ``runs`` calls of ``case`` and measure peak allocations of one more."""
+    for _ in range(warmup):
+        case.call(accessor)
+
+    latencies = []
+    rows = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = case.call(accessor)
+        latencies.append(time.perf_counter() - start)
+        rows = _rows(result)
+
+    tracemalloc.start()
+    case.call(accessor)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total = sum(latencies)
+    return {
+        "method": case.name,
+        "heavy": case.heavy,
+        "runs": runs,
+        "rows": rows,
+        "latency_ms": {
+            "min": min(latencies) * 1000,
+            "p50": percentile(latencies, 50) * 1000,
+            "p90": percentile(latencies, 90) * 1000,
+            "p99": percentile(latencies, 99) * 1000,
+            "max": max(latencies) * 1000,
+            "mean": statistics.fmean(latencies) * 1000,
+        },
+        "calls_per_s": runs / total if total else None,
+        "rows_per_s": rows * runs / total if total else None,
+        "peak_alloc_kib": peak / 1024,
+    }
+
+
+def run_scale(scale: int, args: argparse.Namespace) -> Dict[str, Any]:
+    """Seed, serve and benchmark one scale."""
+    with tempfile.TemporaryDirectory(prefix="aire-bench-") as directory:
+        path = os.path.join(directory, "replica.db")
+        start = time.perf_counter()
+        counts = seed_replica(path, scale, args.seed)
+        seed_seconds = time.perf_counter() - start
+        print(f"\nScale {scale:,}: seeded {sum(counts.values()):,} rows in {seed_seconds:.1f}s")
+
+        process, url = start_server(path, args.max_rows)
+        try:
+            os.environ["SUPABASE_URL"] = url
+            os.environ["SUPABASE_KEY"] = args.key
+            accessor = DataAccessor(SupabaseDB(ClientConfig(retries=0)))
+            results = []
+            for case in build_cases(scale):
+                if args.only and not any(name in case.name for name in args.only):
+                    continue
+                runs = args.heavy_runs if case.heavy else args.runs
+                result = time_case(case, accessor, runs, args.warmup)
+                latency = result["latency_ms"]
+                print(
+                    f"  {case.name:36} p50 {latency['p50']:9.2f} ms  p99 {latency['p99']:9.2f} ms"
+                    f"  {result['rows']:>8,} rows  {result['peak_alloc_kib']:10,.0f} KiB"
+                )
+                results.append(result)
+        finally:
+            process.terminate()
+            process.wait()
+
+    return {
+        "scale": scale,
+        "rows": counts,
+        "seed_seconds": seed_seconds,
+        "results": results,
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: Dict[str, Any], baseline_path: str) -> None:
+    """Print p50 latency changes against an earlier results file."""
+    with open(baseline_path) as handle:
+        baseline = json.load(handle)
+    previous = {
+        (scale["scale"], result["method"]): result["latency_ms"]["p50"]
+        for scale in baseline["scales"]
+        for result in scale["results"]
+    }
+    print(f"\nCompared with {baseline_path} ({baseline['meta'].get('git_revision')}):")
+    for scale in current["scales"]:
+        for result in scale["results"]:
+            before = previous.get((scale["scale"], result["method"]))
+            if not before:
+                continue
+            after = result["latency_ms"]["p50"]
+            change = (after - before) / before * 100
+            print(f"  {scale['scale']:>9,} {result['method']:36} {before:9.2f} -> {after:9.2f} ms ({change:+.1f}%)")
+
+
+def main():
+    """Run the benchmark suite and save the results."""
+    parser = argparse.ArgumentParser(description="Offline accessor benchmarks")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(DEFAULT_SCALES),
+                        help="incident rows per run (other tables scale proportionally)")
+    parser.add_argument("--runs", type=int, default=20, help="timed calls per method")
+    parser.add_argument("--heavy-runs", type=int, default=3, help="timed calls for full-table methods")
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--max-rows", type=int, default=1000, help="server row cap, as in Supabase")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", nargs="*", help="only methods whose name contains one of these")
+    parser.add_argument("--key", default="benchmark-key", help="API key sent to the fake server")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<time>-<rev>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("AIRE ACCESSOR BENCHMARKS")
+    print("=" * 60)
+
+    revision = git_revision()
+    report = {
+        "meta": {
+            "git_revision": revision,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "runs": args.runs,
+            "heavy_runs": args.heavy_runs,
+            "max_rows": args.max_rows,
+            "seed": args.seed,
+        },
+        "scales": [run_scale(scale, args) for scale in args.scales],
+    }
+    report["meta"]["max_rss_kib"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    output = Path(args.output) if args.output else DEFAULT_RESULTS_DIR / (
+        f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{revision or 'unknown'}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as handle:
+        json.dump(report, handle, indent=2)
+    print(f"\n✅ Results saved to {output}")
+
+    if args.compare:
+        compare(report, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
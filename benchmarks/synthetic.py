@@ -0,0 +1,136 @@
+"""Deterministic synthetic rows for the five Supabase tables.
+
+The value pools mimic the shape of the real data (a dozen risk categories,
+a few dozen organisations, a few hundred models ...) so filters select
+realistic fractions of each table.
+"""
+
+import random
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator
+
+RISK_CATEGORIES = (
+    "Cyber Offense", "Manipulation", "Bio", "Chemical", "Loss of Control",
+    "Deception", "Privacy", "Misinformation", "Autonomy", "Fraud",
+    "Surveillance", "Critical Infrastructure",
+)
+ORIGINS = (
+    "United States", "China", "Russia", "Iran", "North Korea", "United Kingdom",
+    "Israel", "India", "Brazil", "Germany", "France", "Nigeria", "Unknown",
+)
+ORGANIZATIONS = tuple(f"Lab {name}" for name in (
+    "Aurora", "Beacon", "Cobalt", "Delta", "Ember", "Fjord", "Granite", "Helix",
+    "Iris", "Juniper", "Kestrel", "Lumen", "Meridian", "Nimbus", "Orchid", "Pulsar",
+    "Quartz", "Radiant", "Sable", "Tundra",
+))
+MODELS = tuple(f"model-{family}-{size}" for family in range(60) for size in ("s", "m", "l", "xl"))
+WORDS = (
+    "model", "agent", "attack", "jailbreak", "phishing", "exploit", "dataset",
+    "benchmark", "evaluation", "uplift", "synthesis", "campaign", "deepfake",
+    "election", "malware", "ransomware", "prompt", "injection", "autonomous",
+    "replication", "oversight", "disclosure", "vulnerability", "pathogen",
+)
+
+# Rows per table relative to the requested scale.
+TABLE_RATIOS: Dict[str, float] = {
+    "incidents": 1.0,
+    "benchmarks": 0.1,
+    "evals": 0.5,
+    "versions": 0.01,
+    "epoch_models": 0.05,
+}
+
+_START = date(2020, 1, 1)
+_DAYS = 6 * 365
+
+
+def table_rows(table: str, scale: int) -> int:
+    """Number of rows seeded into ``table`` at ``scale``."""
+    return max(10, int(scale * TABLE_RATIOS[table]))
+
+
+def _date(rng: random.Random) -> date:
+    return _START + timedelta(days=rng.randrange(_DAYS))
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def _incident(rng: random.Random, i: int) -> Dict[str, Any]:
+    day = _date(rng)
+    return {
+        "id": f"inc-{i:07d}",
+        "headline": _text(rng, 8).capitalize(),
+        "description": _text(rng, 60),
+        "reporting_date": day.isoformat(),
+        "quarter": f"Q{(day.month - 1) // 3 + 1} {day.year}",
+        "risk_cats": rng.sample(RISK_CATEGORIES, rng.randint(1, 3)),
+        "actors_origin": rng.sample(ORIGINS, rng.randint(1, 2)),
+        "created_at": f"{day.isoformat()}T12:00:00+00:00",
+    }
+
+
+def _benchmark(rng: random.Random, i: int) -> Dict[str, Any]:
+    day = _date(rng)
+    return {
+        "id": f"bm-{i:07d}",
+        "benchmark": f"Bench-{i:06d}",
+        "publication": _text(rng, 10),
+        "date": day.isoformat(),
+        "availability": rng.choice(("Open", "Closed", "On request")),
+        "risk_cats": rng.sample(RISK_CATEGORIES, rng.randint(1, 2)),
+        "created_at": f"{day.isoformat()}T12:00:00+00:00",
+    }
+
+
+def _eval(rng: random.Random, i: int) -> Dict[str, Any]:
+    day = _date(rng)
+    return {
+        "id": f"ev-{i:07d}",
+        "public_id": f"card_{i:07d}",
+        "publication": _text(rng, 10),
+        "release_date": day.isoformat(),
+        "organizations": rng.sample(ORGANIZATIONS, rng.randint(1, 2)),
+        "models": rng.sample(MODELS, rng.randint(1, 4)),
+        "risk_cats": rng.sample(RISK_CATEGORIES, rng.randint(1, 3)),
+        "reviewed": rng.random() < 0.4,
+        "created_at": f"{day.isoformat()}T12:00:00+00:00",
+    }
+
+
+def _version(rng: random.Random, i: int) -> Dict[str, Any]:
+    return {
+        "id": f"ver-{i:07d}",
+        "name": f"release {i // 10}.{i % 10} {rng.choice(WORDS)}",
+        "created_at": f"{_date(rng).isoformat()}T12:00:00+00:00",
+    }
+
+
+def _epoch_model(rng: random.Random, i: int) -> Dict[str, Any]:
+    return {
+        "id": f"em-{i:07d}",
+        "model": MODELS[i % len(MODELS)] + f"-{i // len(MODELS)}",
+        "organization": rng.choice(ORGANIZATIONS),
+        "parameters": rng.randint(10 ** 8, 10 ** 12),
+        "training_compute_flop": float(rng.randint(10 ** 20, 10 ** 26)),
+        "publication_date": _date(rng).isoformat(),
+        "created_at": f"{_date(rng).isoformat()}T12:00:00+00:00",
+    }
+
+
+_BUILDERS = {
+    "incidents": _incident,
+    "benchmarks": _benchmark,
+    "evals": _eval,
+    "versions": _version,
+    "epoch_models": _epoch_model,
+}
+
+
+def generate(table: str, scale: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """Yield the synthetic rows of ``table`` at ``scale``, in id order."""
+    rng = random.Random(f"{table}:{seed}")
+    build = _BUILDERS[table]
+    for i in range(table_rows(table, scale)):
+        yield build(rng, i)
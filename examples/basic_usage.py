@@ -33,7 +33,7 @@ def main():
 
     # Get recent incidents
     print("\n3. Fetching recent incidents...")
-    recent_incidents = accessor.incidents.get_recent(limit=3)
+    recent_incidents = accessor.incidents.get_recent(limit=3, columns="listing")
     print(f"\n🚨 Recent Incidents:")
     for incident in recent_incidents:
         print(f"\n  • {incident['headline']}")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Check that importing AIRE modules stays cheap.
+
+Each module is imported in a fresh interpreter, and the check fails if a
+heavy dependency (pandas, supabase, pyarrow, scikit-learn ...) is loaded as
+a side effect. The median cumulative ``-X importtime`` over several runs is
+also reported. Absolute times depend on the machine, so they are only
+compared against a baseline recorded earlier on the same machine:
+
+    python scripts/check_import_time.py --save-baseline /tmp/import-baseline.json
+    # ... make changes ...
+    python scripts/check_import_time.py --baseline /tmp/import-baseline.json
+
+Exits non-zero on any regression, so it can run in CI.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+MODULES = ("aire", "aire.data.accessors", "aire.data.async_accessors")
+
+HEAVY_MODULES = ("pandas", "numpy", "supabase", "sklearn", "pyarrow", "httpx", "dotenv")
+
+# Allowed slowdown relative to the baseline, as a fraction, plus a fixed
+# allowance so sub-millisecond imports do not fail on timer noise.
+DEFAULT_TOLERANCE = 0.5
+SLACK_MS = 2.0
+
+
+def measure(module: str) -> float:
+    """Cumulative import time of ``module`` in milliseconds, from a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    for line in result.stderr.splitlines():
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1000
+    raise RuntimeError(f"No import time reported for {module}")
+
+
+def heavy_imports(module: str) -> list:
+    """Heavy dependencies loaded as a side effect of importing ``module``."""
+    code = (
+        f"import json, sys, {module}; "
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout)
+
+
+def main():
+    """Check for heavy imports and compare import times with a baseline."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5, help="imports per module")
+    parser.add_argument("--baseline", help="JSON file of earlier times on this machine to compare with")
+    parser.add_argument("--save-baseline", help="write the measured times to this JSON file")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown against the baseline (0.5 = 50%%)")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)
+
+    print("=" * 60)
+    print("IMPORT TIME CHECK")
+    print("=" * 60)
+
+    failures = 0
+    times = {}
+    for module in MODULES:
+        median = times[module] = statistics.median(measure(module) for _ in range(args.runs))
+        heavy = heavy_imports(module)
+        line = f"{module:28} {median:6.1f} ms"
+        ok = not heavy
+        if module in baseline:
+            limit = baseline[module] * (1 + args.tolerance) + SLACK_MS
+            ok = ok and median <= limit
+            line += f" (baseline {baseline[module]:.1f} ms, limit {limit:.1f} ms)"
+        failures += not ok
+        print(f"{'✅' if ok else '❌'} {line}")
+        if heavy:
+            print(f"   imports heavy dependencies: {', '.join(heavy)}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as handle:
+            json.dump(times, handle, indent=2)
+        print(f"Baseline saved to {args.save_baseline}")
+
+    print("=" * 60)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Bulk-load NDJSON or CSV files into the local aire.db tables."""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from aire.data.storage.ingest import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_TRANSACTION_ROWS,
+    VALIDATORS,
+    BulkIngestor,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("table", choices=sorted(VALIDATORS))
+    parser.add_argument("files", nargs="+", help=".ndjson, .jsonl or .csv files")
+    parser.add_argument(
+        "--database", required=True, help="SQLite file to load into (created if missing)"
+    )
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--transaction-rows", type=int, default=DEFAULT_TRANSACTION_ROWS)
+    parser.add_argument(
+        "--rebuild-indexes",
+        action="store_true",
+        help="drop secondary indexes during the load and rebuild them afterwards",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(message)s")
+
+    with BulkIngestor(args.database, transaction_rows=args.transaction_rows) as ingestor:
+        for path in args.files:
+            stats = ingestor.ingest_file(
+                args.table, path, args.batch_size, rebuild_indexes=args.rebuild_indexes
+            )
+            print(
+                f"{path}: {stats.written:,} written, {stats.rejected:,} rejected "
+                f"in {stats.seconds:.1f}s ({stats.rows_per_second:,.0f} rows/s)"
+            )
+            for (field_name, error), count in stats.errors.most_common():
+                print(f"  {count:,} rows: {field_name} {error}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""Shared fixtures: a small seeded replica and a local PostgREST stand-in.
+
+Incident ids run from 1 to 12 so that ordering and keyset paging cross a
+digit boundary. ``supabase_db`` talks to ``benchmarks/fake_postgrest.py``
+through the real Supabase client, so no network access is needed.
+"""
+
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from aire.data.accessors import DataAccessor
+from aire.data.storage.replica import ReplicaDB
+
+_RISKS = ("Cyber Offense", "Bio", "Manipulation", "Loss of Control")
+_ORIGINS = ("Russia", "China", "United States")
+
+
+def _incident(i: int) -> Dict[str, Any]:
+    month = (i - 1) % 12 + 1
+    return {
+        "id": i,
+        "headline": f"Incident {i}: {'deepfake' if i % 3 == 0 else 'phishing'} campaign",
+        "description": f"Report number {i} about a {_RISKS[i % 4].lower()} event.",
+        "reporting_date": f"2024-{month:02d}-15",
+        "quarter": f"Q{(month - 1) // 3 + 1} 2024",
+        "risk_cats": [_RISKS[i % 4]] + ([_RISKS[(i + 1) % 4]] if i % 2 else []),
+        "actors_origin": [_ORIGINS[i % 3]],
+        "created_at": f"2024-{month:02d}-15T12:00:00+00:00",
+    }
+
+
+INCIDENTS: List[Dict[str, Any]] = [_incident(i) for i in range(1, 13)]
+
+BENCHMARKS: List[Dict[str, Any]] = [
+    {"id": 1, "benchmark": "VCT", "publication": "Virology capabilities test",
+     "date": "2024-03-01", "availability": "Open", "risk_cats": ["Bio"]},
+    {"id": 2, "benchmark": "AttackSeqBench", "publication": "Attack sequence reasoning",
+     "date": "2024-06-01", "availability": "Closed", "risk_cats": ["Cyber Offense"]},
+    {"id": 3, "benchmark": "MASK", "publication": "Honesty under pressure",
+     "date": None, "availability": "Open", "risk_cats": ["Manipulation"]},
+    {"id": 4, "benchmark": "Cybench", "publication": "Capture the flag tasks",
+     "date": "2024-09-01", "availability": "Open", "risk_cats": ["Cyber Offense"]},
+]
+
+EVALS: List[Dict[str, Any]] = [
+    {"id": 1, "public_id": "card_claude4.5", "publication": "System card",
+     "release_date": "2025-01-10", "organizations": ["Anthropic"],
+     "models": ["Claude 4.5 Sonnet"], "risk_cats": ["Bio", "Cyber Offense"], "reviewed": True},
+    {"id": 2, "public_id": "card_gpt4o", "publication": "GPT-4o system card",
+     "release_date": "2024-08-08", "organizations": ["OpenAI"],
+     "models": ["GPT-4o"], "risk_cats": ["Manipulation"], "reviewed": False},
+    {"id": 3, "public_id": "aisi_joint", "publication": "Joint pre-deployment test",
+     "release_date": "2024-11-19", "organizations": ["UK AISI", "US AISI"],
+     "models": ["claude-4.5-sonnet", "GPT-4o"], "risk_cats": ["Cyber Offense"], "reviewed": True},
+    {"id": 4, "public_id": "no_model", "publication": "Survey of evaluations",
+     "release_date": "2024-02-01", "organizations": ["Epoch"],
+     "models": [], "risk_cats": ["Loss of Control"], "reviewed": False},
+]
+
+VERSIONS: List[Dict[str, Any]] = [
+    {"id": 1, "name": "Claude 4.5 Sonnet"},
+    {"id": 2, "name": "GPT-4o"},
+    {"id": 3, "name": "Gemini 100% Pro"},
+]
+
+EPOCH_MODELS: List[Dict[str, Any]] = [
+    {"id": 1, "model": "claude_4.5_sonnet", "organization": "Anthropic", "parameters": None},
+    {"id": 2, "model": "gpt-4o", "organization": "OpenAI", "parameters": 200_000_000_000},
+    {"id": 3, "model": "Llama 3 70B", "organization": "Meta", "parameters": 70_000_000_000},
+]
+
+ROWS: Dict[str, List[Dict[str, Any]]] = {
+    "incidents": INCIDENTS,
+    "benchmarks": BENCHMARKS,
+    "evals": EVALS,
+    "versions": VERSIONS,
+    "epoch_models": EPOCH_MODELS,
+}
+
+
+@pytest.fixture
+def replica(tmp_path) -> ReplicaDB:
+    db = ReplicaDB(str(tmp_path / "replica.db"))
+    for table, rows in ROWS.items():
+        db.upsert_rows(table, rows)
+    return db
+
+
+@pytest.fixture
+def accessor(replica) -> DataAccessor:
+    return DataAccessor(db=replica)
+
+
+@pytest.fixture
+def postgrest(replica):
+    """Fake PostgREST server answering from ``replica``; yields its URL."""
+    from fake_postgrest import FakePostgREST
+
+    server = FakePostgREST(replica)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    try:
+        yield server.url
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def supabase_env(postgrest, monkeypatch):
+    monkeypatch.setenv("SUPABASE_URL", postgrest)
+    monkeypatch.setenv("SUPABASE_KEY", "test-key")
+    return postgrest
+
+
+@pytest.fixture
+def supabase_db(supabase_env):
+    """``SupabaseDB`` backed by the fake server, closed after the test."""
+    from aire.data.storage.client import ClientConfig, close_clients
+    from aire.data.storage.database import SupabaseDB
+
+    yield SupabaseDB(ClientConfig(retries=0))
+    close_clients()
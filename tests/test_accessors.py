@@ -0,0 +1,69 @@
+"""Behaviour of the synchronous accessors against a seeded replica."""
+
+import pytest
+
+from aire.data.accessors import DataAccessor
+from aire.data.cache import QueryCache
+from aire.data.instrumentation import Instrumentation
+from aire.data.records import Record
+
+from .conftest import ROWS
+
+
+def test_count_transfers_no_rows(accessor):
+    events = []
+    instrumentation = Instrumentation(slow_query_seconds=None)
+    instrumentation.add_hook(events.append)
+    accessor.db.instrumentation = instrumentation
+
+    assert accessor.incidents.count() == len(ROWS["incidents"])
+    assert accessor.evals.count() == len(ROWS["evals"])
+    assert [event.rows for event in events] == [0, 0]
+
+
+def test_get_summary_totals_and_recent(accessor):
+    summary = accessor.get_summary(max_workers=4)
+
+    for table, rows in ROWS.items():
+        assert summary[table]["total"] == len(rows)
+    recent = summary["incidents"]["recent"]
+    assert [row["reporting_date"] for row in recent] == sorted(
+        (row["reporting_date"] for row in ROWS["incidents"]), reverse=True
+    )[:5]
+    assert len(summary["benchmarks"]["recent"]) == len(ROWS["benchmarks"])
+    assert "distinct" not in summary["incidents"]
+
+
+def test_listing_projection(accessor):
+    rows = accessor.incidents.get_recent(2, columns="listing")
+    assert set(rows[0]) == {"id", "headline", "reporting_date", "quarter", "risk_cats", "actors_origin"}
+
+
+def test_column_list_projection_and_validation(accessor):
+    assert set(accessor.versions.get_by_id(1, columns=["name"])) == {"name"}
+    with pytest.raises(ValueError):
+        accessor.versions.get_all(columns="name; drop table versions")
+
+
+def test_hydrate_returns_new_rows(accessor):
+    rows = accessor.incidents.get_recent(3, columns="listing")
+    hydrated = accessor.incidents.hydrate(rows)
+    assert all("description" in row for row in hydrated)
+    assert all("description" not in row for row in rows)
+
+
+def test_hydrate_does_not_widen_cached_rows(replica):
+    accessor = DataAccessor(db=replica, cache=QueryCache())
+    rows = accessor.incidents.get_recent(3, columns="listing")
+    accessor.incidents.hydrate(rows)
+    again = accessor.incidents.get_recent(3, columns="listing")
+    assert all("description" not in row for row in again)
+
+
+def test_hydrate_records(replica):
+    accessor = DataAccessor(db=replica, records=True)
+    rows = accessor.incidents.get_recent(2, columns="listing")
+    hydrated = accessor.incidents.hydrate(rows)
+    assert isinstance(hydrated[0], Record)
+    assert hydrated[0]["description"].startswith("Report number")
+    assert "description" not in rows[0]
@@ -0,0 +1,87 @@
+"""Async accessors through the real async Supabase client and the fake server."""
+
+import asyncio
+
+import pytest
+
+from aire.data.async_accessors import AsyncDataAccessor
+from aire.data.storage.client import ClientConfig, aclose_clients
+from aire.data.storage.database import AsyncSupabaseDB
+
+from .conftest import ROWS
+
+
+@pytest.fixture
+def run(supabase_env):
+    """Run a coroutine taking an ``AsyncDataAccessor``."""
+
+    def runner(coroutine_function, **options):
+        async def main():
+            db = await AsyncSupabaseDB.create(ClientConfig(retries=0))
+            try:
+                return await coroutine_function(AsyncDataAccessor(db, **options))
+            finally:
+                await aclose_clients()
+
+        return asyncio.run(main())
+
+    return runner
+
+
+def test_summary_matches_the_data(run):
+    async def summary(accessor):
+        return await accessor.get_summary()
+
+    result = run(summary)
+    for table, rows in ROWS.items():
+        assert result[table]["total"] == len(rows)
+    assert len(result["incidents"]["recent"]) == 5
+
+
+def test_lookups_and_filters(run):
+    async def calls(accessor):
+        return await asyncio.gather(
+            accessor.incidents.get_by_id(3),
+            accessor.benchmarks.get_by_name("VCT"),
+            accessor.evals.get_by_model("GPT-4o"),
+            accessor.versions.search_by_name("100%"),
+            accessor.evals.get_many_by_public_id(["card_gpt4o", "missing"]),
+        )
+
+    incident, benchmark, evals, versions, lookup = run(calls)
+    assert incident["headline"].startswith("Incident 3:")
+    assert benchmark["id"] == 1
+    assert [row["id"] for row in evals] == [2, 3]
+    assert [row["name"] for row in versions] == ["Gemini 100% Pro"]
+    assert lookup.missing == ["missing"]
+
+
+def test_iter_all_pages_in_id_order(run):
+    async def collect(accessor):
+        return [row["id"] async for row in accessor.incidents.iter_all(page_size=5)]
+
+    assert run(collect) == list(range(1, 13))
+
+
+def test_concurrency_limit_is_respected(run):
+    async def gather_many(accessor):
+        active = peak = 0
+        execute = accessor.db.execute
+
+        async def tracked(query, table=None):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            try:
+                await asyncio.sleep(0.01)
+                return await execute(query, table)
+            finally:
+                active -= 1
+
+        accessor.db.execute = tracked
+        rows = await asyncio.gather(*(accessor.incidents.get_by_id(i) for i in range(1, 13)))
+        return peak, rows
+
+    peak, rows = run(gather_many, max_concurrency=2)
+    assert peak == 2
+    assert [row["id"] for row in rows] == list(range(1, 13))
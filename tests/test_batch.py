@@ -0,0 +1,48 @@
+"""Batched multi-key lookups."""
+
+from aire.data.accessors import DataAccessor
+from aire.data.batch import chunk_keys, collect_lookup
+from aire.data.instrumentation import Instrumentation
+
+
+def test_chunks_respect_key_and_url_budgets():
+    keys = [f"key-{i:04d}" for i in range(1000)]
+    chunks = list(chunk_keys(keys, max_url_chars=500, max_keys=30))
+    assert [key for chunk in chunks for key in chunk] == keys
+    assert all(len(chunk) <= 30 for chunk in chunks)
+    assert all(sum(len(key) + 3 for key in chunk) <= 500 for chunk in chunks)
+
+
+def test_collect_lookup_matches_keys_as_strings():
+    rows = [{"id": 42, "name": "a"}, {"id": 42, "name": "duplicate"}, {"id": 7, "name": "b"}]
+    result = collect_lookup(["42", 7, 9], "id", rows)
+    assert result["42"]["name"] == "a"
+    assert result[7]["name"] == "b"
+    assert result.missing == [9]
+
+
+def test_get_many_by_id_batches_requests(replica):
+    events = []
+    instrumentation = Instrumentation(slow_query_seconds=None)
+    instrumentation.add_hook(events.append)
+    replica.instrumentation = instrumentation
+    accessor = DataAccessor(db=replica)
+
+    result = accessor.incidents.get_many_by_id([3, 1, 3, 99], columns="listing")
+    assert sorted(result.found) == [1, 3]
+    assert result.missing == [99]
+    assert len(events) == 1
+
+
+def test_get_many_by_name(accessor):
+    result = accessor.benchmarks.get_many_by_name(["VCT", "MASK", "Nope"], columns=["benchmark", "date"])
+    assert result["VCT"] == {"benchmark": "VCT", "date": "2024-03-01"}
+    assert result["MASK"]["date"] is None
+    assert result.missing == ["Nope"]
+
+
+def test_get_many_through_postgrest_with_reserved_characters(supabase_db):
+    accessor = DataAccessor(supabase_db)
+    result = accessor.versions.get_many_by_name(["Gemini 100% Pro", "GPT-4o", "a,b"])
+    assert sorted(row["id"] for row in result.found.values()) == [2, 3]
+    assert result.missing == ["a,b"]
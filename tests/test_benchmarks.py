@@ -0,0 +1,41 @@
+"""Benchmark harness helpers: synthetic data, percentiles and a tiny run."""
+
+import json
+import subprocess
+import sys
+
+import run_benchmarks
+import synthetic
+
+from .conftest import ROOT
+
+
+def test_synthetic_rows_are_deterministic():
+    first = list(synthetic.generate("evals", 100, seed=1))
+    assert first == list(synthetic.generate("evals", 100, seed=1))
+    assert first != list(synthetic.generate("evals", 100, seed=2))
+    assert len(first) == synthetic.table_rows("evals", 100) == 50
+    assert [row["id"] for row in first] == sorted(row["id"] for row in first)
+
+
+def test_percentile_interpolates():
+    values = [4.0, 1.0, 3.0, 2.0]
+    assert run_benchmarks.percentile(values, 0) == 1.0
+    assert run_benchmarks.percentile(values, 50) == 2.5
+    assert run_benchmarks.percentile(values, 100) == 4.0
+
+
+def test_small_run_writes_results(tmp_path):
+    output = tmp_path / "results.json"
+    result = subprocess.run(
+        [sys.executable, str(ROOT / "benchmarks" / "run_benchmarks.py"),
+         "--scales", "100", "--runs", "2", "--heavy-runs", "1", "--warmup", "0",
+         "--only", "count", "get_many_by_id", "--output", str(output)],
+        capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    report = json.loads(output.read_text())
+    results = {entry["method"]: entry for entry in report["scales"][0]["results"]}
+    assert set(results) == {"incidents.count", "incidents.get_many_by_id[500]"}
+    assert results["incidents.get_many_by_id[500]"]["rows"] == 15
+    assert results["incidents.count"]["latency_ms"]["p50"] > 0
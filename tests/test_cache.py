@@ -0,0 +1,123 @@
+"""Query-result cache: keys, TTLs, invalidation, isolation and stats."""
+
+import threading
+
+import pytest
+
+from aire.data import cache as cache_module
+from aire.data.accessors import DataAccessor
+from aire.data.cache import DiskCache, MemoryCache, QueryCache, query_key
+
+
+def test_key_depends_on_everything_that_shapes_the_request(replica):
+    base = lambda: replica.table("incidents").select("id,headline")
+    assert query_key("incidents", base().eq("quarter", "Q1 2024")) == query_key(
+        "incidents", base().eq("quarter", "Q1 2024")
+    )
+    keys = {
+        query_key("incidents", base().eq("quarter", "Q1 2024")),
+        query_key("incidents", base().eq("quarter", "Q2 2024")),
+        query_key("incidents", base().eq("quarter", "Q1 2024").limit(1)),
+        query_key("incidents", replica.table("incidents").select("id").eq("quarter", "Q1 2024")),
+        query_key("incidents", replica.table("incidents").select("id", count="exact", head=True)),
+    }
+    assert len(keys) == 5
+
+
+def test_key_for_postgrest_builders(supabase_db):
+    table = supabase_db.table("incidents")
+    one = query_key("incidents", table.select("*").eq("quarter", "Q1 2024"))
+    same = query_key("incidents", supabase_db.table("incidents").select("*").eq("quarter", "Q1 2024"))
+    other = query_key("incidents", supabase_db.table("incidents").select("*").eq("quarter", "Q2 2024"))
+    assert one == same != other
+
+
+def test_hits_and_misses(replica):
+    accessor = DataAccessor(db=replica, cache=QueryCache())
+    first = accessor.incidents.get_by_quarter("Q1 2024")
+    second = accessor.incidents.get_by_quarter("Q1 2024")
+    assert first == second
+    stats = accessor.cache.stats()["tables"]["incidents"]
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_ttl_expiry(replica, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    accessor = DataAccessor(db=replica, cache=QueryCache(default_ttl=10))
+    accessor.versions.get_all()
+    now[0] += 11
+    accessor.versions.get_all()
+    stats = accessor.cache.stats()["tables"]["versions"]
+    assert (stats["hits"], stats["misses"], stats["expirations"]) == (0, 2, 1)
+
+
+def test_zero_ttl_disables_caching_for_a_table(replica):
+    accessor = DataAccessor(db=replica, cache=QueryCache(ttls={"versions": 0}))
+    accessor.versions.get_all()
+    accessor.versions.get_all()
+    assert len(accessor.cache.backend) == 0
+
+
+def test_invalidate_one_table(replica):
+    accessor = DataAccessor(db=replica, cache=QueryCache())
+    accessor.versions.get_all()
+    accessor.evals.get_all()
+    assert accessor.cache.invalidate("versions") == 1
+    assert len(accessor.cache.backend) == 1
+    accessor.versions.get_all()
+    assert accessor.cache.stats()["tables"]["versions"]["misses"] == 2
+
+
+def test_lru_eviction():
+    backend = MemoryCache(max_entries=2)
+    for i in range(3):
+        backend.set(("t", str(i)), cache_module.CacheEntry(cache_module.CachedResponse([])))
+    assert backend.get(("t", "0")) is None
+    assert backend.evictions == 1
+
+
+@pytest.mark.parametrize("backend", ["memory", "disk"])
+def test_callers_cannot_corrupt_cached_rows(replica, tmp_path, backend):
+    store = MemoryCache() if backend == "memory" else DiskCache(str(tmp_path / "cache.db"))
+    accessor = DataAccessor(db=replica, cache=QueryCache(store))
+    rows = accessor.incidents.get_recent(3, columns="listing")
+    rows[0]["headline"] = "edited"
+    rows[0]["risk_cats"].append("edited")
+    rows.append({"id": -1})
+
+    again = accessor.incidents.get_recent(3, columns="listing")
+    again.sort(key=lambda row: row["id"])
+    again[0]["headline"] = "edited again"
+
+    fresh = accessor.incidents.get_recent(3, columns="listing")
+    assert len(fresh) == 3
+    assert [row["id"] for row in fresh] == [12, 11, 10]
+    assert "edited" not in fresh[0]["risk_cats"]
+    assert not any(row["headline"].startswith("edited") for row in fresh)
+
+
+def test_disk_cache_survives_restarts(replica, tmp_path):
+    path = str(tmp_path / "cache.db")
+    DataAccessor(db=replica, cache=QueryCache(DiskCache(path))).versions.get_all()
+    accessor = DataAccessor(db=replica, cache=QueryCache(DiskCache(path)))
+    accessor.versions.get_all()
+    assert accessor.cache.stats()["hits"] == 1
+
+
+def test_stats_are_exact_under_threads(replica):
+    cache = QueryCache()
+    query = replica.table("versions").select("*")
+    calls = 8 * 200
+
+    def worker():
+        for _ in range(200):
+            cache.get_or_execute("t", query, lambda q: cache_module.CachedResponse([]))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = cache.stats()
+    assert stats["hits"] + stats["misses"] == calls
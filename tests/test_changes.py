@@ -0,0 +1,179 @@
+"""Change feeds: inserts, edits and deletions reach every derived index."""
+
+import threading
+
+import pytest
+
+from aire.analysis.cube import IncidentCube
+from aire.analysis.mining import RiskAnalyzer
+from aire.analysis.similarity import SimilarityIndex
+from aire.data.accessors import DataAccessor
+from aire.data.changes import ChangeFeed
+from aire.data.dedup import DuplicateIndex
+from aire.data.facets import FacetIndex
+from aire.data.search import SearchIndex
+
+from .conftest import ROWS
+
+
+class Consumer:
+    """Minimal consumer keeping rows by id."""
+
+    def __init__(self):
+        self.rows = {}
+
+    def apply(self, batch):
+        self.rows.update((row["id"], row) for row in batch)
+        return len(batch)
+
+    def remove(self, ids):
+        for row_id in ids:
+            del self.rows[row_id]
+        return len(ids)
+
+
+def _pull(feed, replica, consumer, full=False):
+    return feed.pull(
+        lambda: replica.table("incidents").select(",".join(feed.columns(("id", "headline")))),
+        replica.execute,
+        apply=consumer.apply,
+        remove=consumer.remove,
+        known_ids=lambda: list(consumer.rows),
+        page_size=5,
+        full=full,
+    )
+
+
+def _edit(replica, row_id, **changes):
+    row = next(row for row in ROWS["incidents"] if row["id"] == row_id)
+    replica.upsert_rows("incidents", [{**row, **changes}])
+
+
+def _delete(replica, *ids):
+    keep = [row["id"] for row in ROWS["incidents"] if row["id"] not in ids]
+    replica.delete_missing("incidents", keep)
+
+
+def test_without_change_column_edits_and_deletes_wait_for_a_full_pull(replica):
+    feed, consumer = ChangeFeed(full_interval=None), Consumer()
+    assert _pull(feed, replica, consumer) == (12, 0)
+
+    _edit(replica, 2, headline="edited")
+    _delete(replica, 3)
+    replica.upsert_rows("incidents", [{"id": 13, "headline": "new"}])
+    assert _pull(feed, replica, consumer) == (1, 0)
+    assert consumer.rows[2]["headline"] != "edited" and 3 in consumer.rows
+
+    assert _pull(feed, replica, consumer, full=True) == (12, 1)
+    assert consumer.rows[2]["headline"] == "edited" and 3 not in consumer.rows
+
+
+def test_change_column_picks_up_edits(replica):
+    feed, consumer = ChangeFeed("created_at", full_interval=None), Consumer()
+    _pull(feed, replica, consumer)
+    assert feed.watermark == "2024-12-15T12:00:00+00:00"
+
+    _edit(replica, 2, headline="edited", created_at="2025-01-01T00:00:00+00:00")
+    applied, removed = _pull(feed, replica, consumer)
+    assert consumer.rows[2]["headline"] == "edited"
+    assert applied == 2  # the edited row and the one at the old watermark
+    assert feed.watermark == "2025-01-01T00:00:00+00:00"
+
+
+def test_full_pulls_are_periodic(replica, monkeypatch):
+    feed, consumer = ChangeFeed(full_interval=60), Consumer()
+    _pull(feed, replica, consumer)
+    _delete(replica, 5)
+    assert _pull(feed, replica, consumer) == (0, 0)
+    monkeypatch.setattr("aire.data.changes.time.time", lambda: feed.full_at + 61)
+    assert _pull(feed, replica, consumer) == (11, 1)
+
+
+def test_failed_apply_does_not_advance(replica):
+    feed = ChangeFeed("created_at", full_interval=None)
+
+    def fail(batch):
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        feed.pull(
+            lambda: replica.table("incidents").select("id,created_at"),
+            replica.execute, apply=fail, remove=len, known_ids=list,
+        )
+    assert feed.state() == {"watermark": None, "last_id": None, "full_at": None}
+
+
+def test_analyzer_fetches_outside_its_lock(accessor):
+    analyzer = RiskAnalyzer(accessor, auto_refresh=False)
+    send = accessor.incidents.send
+    free = []
+
+    def try_lock():
+        if analyzer._lock.acquire(blocking=False):
+            analyzer._lock.release()
+            free.append(True)
+        else:
+            free.append(False)
+
+    def probe(query):
+        thread = threading.Thread(target=try_lock)
+        thread.start()
+        thread.join()
+        return send(query)
+
+    accessor.incidents.send = probe
+    analyzer.refresh(["incidents"])
+    assert free and all(free)
+
+
+def test_analyzer_sees_deletions_on_full_refresh(accessor, replica):
+    analyzer = RiskAnalyzer(accessor, auto_refresh=False)
+    analyzer.refresh()
+    _delete(replica, 1, 2)
+    analyzer.refresh()
+    assert analyzer.analyze_incident_trends()["total_incidents"] == 12
+    analyzer.refresh(full=True)
+    assert analyzer.analyze_incident_trends()["total_incidents"] == 10
+
+
+@pytest.mark.parametrize("build, update, size", [
+    (IncidentCube, lambda index, accessor: index.update_from(accessor.incidents), len),
+    (lambda: FacetIndex("incidents"), lambda index, accessor: index.update_from(accessor.incidents), len),
+    (DuplicateIndex, lambda index, accessor: index.update_from(accessor.incidents), len),
+    (SearchIndex, lambda index, accessor: index.update_from(accessor.incidents), len),
+])
+def test_indexes_drop_deleted_rows(build, update, size, accessor, replica):
+    index = build()
+    update(index, accessor)
+    assert size(index) == 12
+    _delete(replica, 4)
+    index._feed.full_at = 0  # make the next pull a full one
+    update(index, accessor)
+    assert size(index) == 11
+
+
+@pytest.mark.parametrize("build", [
+    IncidentCube, lambda: FacetIndex("incidents"), DuplicateIndex, SearchIndex,
+])
+def test_indexes_pull_through_the_accessor(build, replica):
+    accessor = DataAccessor(db=replica, records=True)
+    sent = []
+    send = accessor.incidents.send
+    accessor.incidents.send = lambda query: sent.append(query) or send(query)
+    index = build()
+    assert index.update_from(accessor.incidents, page_size=5) == 12
+    assert len(sent) == 3
+
+
+def test_similarity_index_follows_changes(tmp_path, accessor, replica):
+    index = SimilarityIndex(str(tmp_path), full_interval=None)
+    index.update_from(accessor)
+    _delete(replica, 4)
+    replica.upsert_rows("incidents", [{**ROWS["incidents"][0], "id": 20}])
+    assert index.update_from(accessor)["incidents"] == 1
+    assert len(index._matrices["incidents"]) == 13
+    index.update_from(accessor, full=True)
+    assert 4 not in index._matrices["incidents"].positions
+    index.save()
+    loaded = SimilarityIndex.load(str(tmp_path))
+    assert loaded._feeds["incidents"].last_id == 20
@@ -0,0 +1,100 @@
+"""Shared client registry and retrying transports."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from aire.data.storage.client import (
+    AsyncRetryTransport,
+    ClientConfig,
+    ClientRegistry,
+    RetryTransport,
+)
+
+NO_WAIT = ClientConfig(retries=2, backoff_base=0.0)
+
+
+def _flaky(statuses):
+    """Handler answering with ``statuses`` in turn, recording each request."""
+    seen = []
+
+    def handler(request):
+        seen.append(request.method)
+        return httpx.Response(statuses[min(len(seen), len(statuses)) - 1])
+
+    return handler, seen
+
+
+def _client(handler, config=NO_WAIT):
+    transport = RetryTransport(config)
+    transport._transport = httpx.MockTransport(handler)
+    return httpx.Client(transport=transport, base_url="http://test")
+
+
+def test_reads_are_retried_on_transient_status():
+    handler, seen = _flaky([503, 429, 200])
+    assert _client(handler).get("/").status_code == 200
+    assert seen == ["GET"] * 3
+
+
+def test_retries_are_bounded_and_writes_are_not_retried():
+    handler, seen = _flaky([503])
+    assert _client(handler).get("/").status_code == 503
+    assert len(seen) == 3
+    seen.clear()
+    assert _client(handler).post("/").status_code == 503
+    assert seen == ["POST"]
+
+
+def test_dropped_connections_are_retried():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            raise httpx.ConnectError("reset", request=request)
+        return httpx.Response(200)
+
+    assert _client(handler).get("/").status_code == 200
+    assert len(calls) == 2
+
+
+def test_backoff_honours_retry_after():
+    config = ClientConfig(backoff_max=5.0)
+    assert config.backoff(0, httpx.Response(429, headers={"Retry-After": "3"})) == 3.0
+    assert config.backoff(0, httpx.Response(429, headers={"Retry-After": "60"})) == 5.0
+    assert 0 <= config.backoff(10) <= 5.0
+
+
+def test_async_transport_retries():
+    handler, seen = _flaky([502, 200])
+
+    async def main():
+        transport = AsyncRetryTransport(NO_WAIT)
+        transport._transport = httpx.MockTransport(handler)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return (await client.get("/")).status_code
+
+    assert asyncio.run(main()) == 200
+    assert len(seen) == 2
+
+
+def test_registry_shares_and_closes_clients(postgrest):
+    registry = ClientRegistry()
+    client = registry.get(postgrest, "key")
+    assert registry.get(postgrest, "key") is client
+    assert registry.get(postgrest, "other") is not client
+
+    async def use_async():
+        first = await registry.aget(postgrest, "key")
+        assert await registry.aget(postgrest, "key") is first
+        registry.close()
+        assert len(registry) == 1
+        await registry.aclose()
+        return first
+
+    async_client = asyncio.run(use_async())
+    assert len(registry) == 0
+    assert client.options.httpx_client.is_closed
+    assert async_client.options.httpx_client.is_closed
@@ -0,0 +1,221 @@
+"""Single-flight coalescing of identical concurrent requests."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from aire.data import coalesce
+from aire.data.accessors import DataAccessor
+from aire.data.coalesce import AsyncSingleFlight, SingleFlight, share_response
+from aire.data.instrumentation import Instrumentation
+
+CALLERS = 4
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.001)
+
+
+def run_together(group, key, fn, callers=CALLERS):
+    """Call ``group.do`` from several threads; ``fn`` returns once all have joined."""
+    with ThreadPoolExecutor(callers) as pool:
+        futures = [pool.submit(group.do, key, fn) for _ in range(callers)]
+        return [future.exception() or future.result() for future in futures]
+
+
+def test_share_response_copies_rows_and_arrays():
+    response = SimpleNamespace(data=[{"id": 1, "risk_cats": ["Bio"]}], count=None)
+    shared = share_response(response)
+    shared.data[0]["risk_cats"].append("Other")
+    shared.data.append({"id": 2})
+    assert response.data == [{"id": 1, "risk_cats": ["Bio"]}]
+
+
+def test_concurrent_calls_share_one_request():
+    group = SingleFlight()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        wait_for(lambda: group.stats.followers == CALLERS - 1)
+        return SimpleNamespace(data=[{"id": 1, "models": ["GPT-4o"]}])
+
+    results = run_together(group, "key", fetch)
+
+    assert len(calls) == 1
+    assert (group.stats.leaders, group.stats.followers) == (1, CALLERS - 1)
+    assert group.stats.saved_ratio == pytest.approx(0.75)
+    assert all(result.data == [{"id": 1, "models": ["GPT-4o"]}] for result in results)
+    results[0].data[0]["models"].append("edited")
+    assert all(result.data[0]["models"] == ["GPT-4o"] for result in results[1:])
+    assert len(group) == 0
+
+
+def test_leader_edits_do_not_reach_waiting_followers(monkeypatch):
+    group = SingleFlight()
+    leader = []
+    edited = threading.Event()
+    share = coalesce.share_response
+
+    def slow_share(response):
+        # Followers only copy once the leader has edited its rows.
+        if threading.get_ident() not in leader:
+            edited.wait(5)
+        return share(response)
+
+    monkeypatch.setattr(coalesce, "share_response", slow_share)
+
+    def fetch():
+        leader.append(threading.get_ident())
+        wait_for(lambda: group.stats.followers == CALLERS - 1)
+        return SimpleNamespace(data=[{"id": 1, "models": ["GPT-4o"]}])
+
+    def call():
+        result = group.do("key", fetch)
+        if threading.get_ident() in leader:
+            result.data[0]["models"].append("edited")
+            result.data.append({"id": 2})
+            edited.set()
+        return result
+
+    with ThreadPoolExecutor(CALLERS) as pool:
+        results = [future.result() for future in [pool.submit(call) for _ in range(CALLERS)]]
+
+    edits = [result for result in results if len(result.data) == 2]
+    assert len(edits) == 1
+    assert all(
+        result.data == [{"id": 1, "models": ["GPT-4o"]}]
+        for result in results if result is not edits[0]
+    )
+
+
+def test_errors_reach_every_caller():
+    group = SingleFlight()
+
+    def fail():
+        wait_for(lambda: group.stats.followers == CALLERS - 1)
+        raise RuntimeError("upstream down")
+
+    results = run_together(group, "key", fail)
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert len(group) == 0
+
+
+def test_nothing_is_kept_after_a_flight():
+    group = SingleFlight()
+    assert group.do("key", lambda: 1) == 1
+    assert group.do("key", lambda: 2) == 2
+    assert group.stats.leaders == 2
+
+
+def test_different_keys_do_not_wait_for_each_other():
+    group = SingleFlight()
+    release = threading.Event()
+    slow = threading.Thread(target=group.do, args=("slow", release.wait))
+    slow.start()
+    try:
+        wait_for(lambda: len(group) == 1)
+        assert group.do("fast", lambda: "done") == "done"
+    finally:
+        release.set()
+        slow.join()
+
+
+def test_async_calls_share_one_request_and_survive_cancellation():
+    async def main():
+        group = AsyncSingleFlight()
+        calls = []
+        release = asyncio.Event()
+
+        async def fetch():
+            calls.append(1)
+            await release.wait()
+            return SimpleNamespace(data=[{"id": 1}])
+
+        leader = asyncio.ensure_future(group.do("key", fetch))
+        followers = [asyncio.ensure_future(group.do("key", fetch)) for _ in range(3)]
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*followers)
+
+        assert len(calls) == 1
+        assert leader.cancelled()
+        assert [result.data for result in results] == [[{"id": 1}]] * 3
+        assert len(group) == 0
+
+    asyncio.run(main())
+
+
+def test_async_leader_edits_do_not_reach_followers():
+    async def main():
+        group = AsyncSingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            return SimpleNamespace(data=[{"id": 1, "models": ["GPT-4o"]}])
+
+        async def leader():
+            # Resumes first and edits its rows before the followers run again.
+            result = await group.do("key", fetch)
+            result.data[0]["models"].append("edited")
+            return result
+
+        first = asyncio.ensure_future(leader())
+        await asyncio.sleep(0)
+        followers = await asyncio.gather(*(group.do("key", fetch) for _ in range(3)))
+
+        assert (await first).data[0]["models"] == ["GPT-4o", "edited"]
+        assert all(result.data[0]["models"] == ["GPT-4o"] for result in followers)
+        assert group.stats.leaders == 1
+
+    asyncio.run(main())
+
+
+def test_async_errors_reach_every_caller():
+    async def main():
+        group = AsyncSingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        results = await asyncio.gather(
+            *(group.do("key", fail) for _ in range(3)), return_exceptions=True
+        )
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert group.stats.leaders == 1
+
+    asyncio.run(main())
+
+
+def test_accessor_coalesces_identical_queries(replica):
+    accessor = DataAccessor(db=replica, coalesce=True)
+    events = []
+    instrumentation = Instrumentation(slow_query_seconds=None)
+    instrumentation.add_hook(events.append)
+    replica.instrumentation = instrumentation
+
+    fetch = accessor.incidents._fetch
+
+    def slow_fetch(query):
+        wait_for(lambda: accessor.coalescer.stats.followers == CALLERS - 1)
+        return fetch(query)
+
+    accessor.incidents._fetch = slow_fetch
+    with ThreadPoolExecutor(CALLERS) as pool:
+        results = list(pool.map(lambda _: accessor.incidents.get_recent(3), range(CALLERS)))
+
+    assert len(events) == 1
+    assert all(rows == results[0] for rows in results)
+    assert accessor.incidents.get_recent(3) == results[0]
+    assert len(events) == 2
@@ -0,0 +1,82 @@
+"""Incident cube counts over the seeded incidents."""
+
+import pytest
+
+from aire.analysis.cube import IncidentCube
+from aire.analysis.rows import distinct_items, month_key, quarter_key
+
+
+@pytest.fixture
+def cube(accessor):
+    cube = IncidentCube()
+    cube.update_from(accessor.incidents)
+    return cube
+
+
+def test_row_helpers():
+    assert distinct_items(["Bio", "Bio", "Cyber Offense"]) == ["Bio", "Cyber Offense"]
+    assert distinct_items("Bio") == ["Bio"]
+    assert distinct_items(None) == []
+    assert quarter_key({"quarter": "Q3 2025"}) == (2025, 3)
+    assert quarter_key({"reporting_date": "2025-08-01T10:00:00"}) == (2025, 3)
+    assert quarter_key({"reporting_date": "2025-11"}) == (2025, 4)
+    assert quarter_key({"reporting_date": "not a date"}) is None
+    assert month_key({"reporting_date": "2025-07"}) == (2025, 7)
+    assert month_key({}) is None
+
+
+def test_counts_are_distinct_incidents(cube):
+    assert len(cube) == 12
+    assert cube.count() == 12
+    assert cube.count(risk="Cyber Offense") == 6
+    assert cube.count(risk="Cyber Offense", origin="Russia") == 2
+    assert cube.count(time="Q3 2024", risk="Cyber Offense") == 2
+
+
+def test_quarter_grain_accepts_months_and_dates(cube):
+    assert cube.bucket("2024-08") == (2024, 3)
+    assert cube.bucket("2024-08-15") == (2024, 3)
+    assert cube.bucket((2024, 3)) == (2024, 3)
+    assert cube.count(time="2024-08", risk="Cyber Offense") == 2
+    with pytest.raises(ValueError):
+        cube.bucket("sometime")
+
+
+def test_month_grain(accessor):
+    cube = IncidentCube(grain="month")
+    cube.update_from(accessor.incidents)
+    assert cube.bucket("2024-07") == cube.bucket("2024-07-15") == (2024, 7)
+    assert cube.count(time="2024-07") == 1
+    assert cube.members("time")[:2] == ["2024-01", "2024-02"]
+    with pytest.raises(ValueError):
+        IncidentCube(grain="week")
+
+
+def test_series_breakdown_and_pivot(cube):
+    assert cube.series(risk="Cyber Offense") == {
+        "Q1 2024": 1, "Q2 2024": 1, "Q3 2024": 2, "Q4 2024": 2,
+    }
+    assert cube.series(risk="Cyber Offense", start="2024-07", end="Q4 2024") == {
+        "Q3 2024": 2, "Q4 2024": 2,
+    }
+    assert cube.breakdown("origin", risk="Cyber Offense") == {
+        "China": 2, "Russia": 2, "United States": 2,
+    }
+    assert cube.breakdown("risk", origin="China", start="Q3 2024") == {
+        "Cyber Offense": 1, "Loss of Control": 1, "Manipulation": 1,
+    }
+    table = cube.pivot("time", "risk", origin="China")
+    assert table["Q3 2024"] == {
+        "Bio": 0, "Cyber Offense": 1, "Loss of Control": 1, "Manipulation": 0,
+    }
+    with pytest.raises(ValueError):
+        cube.pivot("time", "time")
+
+
+def test_replacing_and_removing_rows(cube):
+    cube.apply_rows([{"id": 7, "quarter": "Q1 2024", "risk_cats": ["Bio"], "actors_origin": []}])
+    assert cube.count(time="Q3 2024") == 2
+    assert cube.count(time="Q1 2024", risk="Bio") == 2
+    assert cube.remove_rows([7, 99]) == 1
+    assert cube.count() == 11
+    assert cube.count(risk="Bio", time="Q1 2024") == 1
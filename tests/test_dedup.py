@@ -0,0 +1,112 @@
+"""MinHash near-duplicate clusters."""
+
+import threading
+
+import numpy as np
+import pytest
+
+from aire.data import dedup
+from aire.data.dedup import DuplicateIndex, lsh_bands, shingle_hashes
+
+STORY = "Researchers found a model that writes working exploits for a known router flaw"
+
+
+def row(row_id, headline, description=""):
+    return {"id": row_id, "headline": headline, "description": description}
+
+
+@pytest.fixture
+def index():
+    index = DuplicateIndex("incidents", threshold=0.6)
+    index.add([
+        row(1, STORY),
+        row(2, "Deepfake audio of a mayor spread on social media before the vote"),
+        row(3, STORY + " again"),
+        row(4, ""),
+    ])
+    return index
+
+
+def test_shingles_and_bands():
+    hashes, counts = shingle_hashes(["one two three four", "one", ""], size=3)
+    assert counts.tolist() == [2, 1, 0]
+    assert len(hashes) == 3
+    bands, rows = lsh_bands(0.8, 64)
+    assert bands * rows <= 64
+
+
+def test_chunked_signatures_match_one_pass(monkeypatch):
+    index = DuplicateIndex("incidents")
+    texts = [STORY, "", "short", "a b c d e f g h i j k l m n o p"]
+    hashes, counts = shingle_hashes(texts, index.shingle_size)
+    permuted = (np.outer(index._a, hashes) + index._b[:, None]) >> np.uint64(32)
+    starts = (np.cumsum(counts) - counts)[counts > 0]
+    expected = np.zeros((len(texts), index.num_perm), dtype=np.uint32)
+    expected[counts > 0] = np.minimum.reduceat(permuted.astype(np.uint32), starts, axis=1).T
+
+    monkeypatch.setattr(dedup, "SIGNATURE_CHUNK", 3)
+    signatures, present = index.signatures(texts)
+    assert present.tolist() == [True, False, True, True]
+    assert np.array_equal(signatures, expected)
+
+
+def test_near_duplicates_share_a_cluster(index):
+    assert index.cluster_id(3) == 1
+    assert index.cluster(1) == [1, 3]
+    assert index.clusters() == {1: [1, 3]}
+    assert index.cluster_id(4) == 4
+    assert index.distinct_count() == 3
+    assert [r["id"] for r in index.deduplicate([{"id": 3}, {"id": 1}, {"id": 9}])] == [3, 9]
+    with pytest.raises(ValueError):
+        DuplicateIndex("incidents", threshold=0)
+
+
+def test_replaced_row_keeps_its_place(index):
+    index.add([row(1, STORY + " today")])
+    assert index.cluster_id(3) == 1
+    assert index.cluster(3) == [1, 3]
+
+    index.add([row(1, "An unrelated story about chip export rules")])
+    assert index.cluster_id(3) == 3
+    index.add([row(1, STORY)])
+    assert index.clusters() == {1: [1, 3]}
+
+
+def test_removing_a_link_splits_the_cluster():
+    # 1 and 3 are only similar through 2.
+    index = DuplicateIndex("incidents", threshold=0.6)
+    words = [f"w{i}" for i in range(36)]
+    index.add([
+        row(1, " ".join(words[:30])),
+        row(2, " ".join(words[3:33])),
+        row(3, " ".join(words[6:36])),
+    ])
+    assert index.cluster(1) == [1, 2, 3]
+    assert index.remove([2, 99]) == 1
+    assert index.cluster(1) == [1]
+    assert index.cluster_id(3) == 3
+    assert 2 not in index
+
+
+def test_update_from_accessor(accessor):
+    index = DuplicateIndex("incidents")
+    assert index.update_from(accessor.incidents) == 12
+    assert len(index) == 12
+    assert all(index.cluster_id(i) is not None for i in range(1, 13))
+
+
+@pytest.mark.parametrize("read", [
+    lambda index: index.cluster_id(3),
+    lambda index: index.cluster(3),
+    lambda index: index.distinct_count(),
+    lambda index: index.deduplicate([{"id": 3}]),
+])
+def test_readers_wait_for_updates(index, read):
+    results = []
+    with index._lock:
+        reader = threading.Thread(target=lambda: results.append(read(index)))
+        reader.start()
+        reader.join(0.05)
+        assert reader.is_alive() and not results
+    reader.join(5)
+    assert results
@@ -0,0 +1,85 @@
+"""Bitmap facet index."""
+
+import threading
+
+from aire.data.facets import FacetIndex, _bitmap, _positions
+
+from .conftest import ROWS
+
+
+def _expected(predicate):
+    return [row["id"] for row in ROWS["incidents"] if predicate(row)]
+
+
+def test_bitmap_round_trip():
+    positions = [0, 7, 8, 63, 64, 1000]
+    assert _positions(_bitmap(positions)).tolist() == positions
+    assert _positions(0).tolist() == []
+
+
+def test_filters_match_a_scan(accessor):
+    index = FacetIndex("incidents", ["risk_cats", "actors_origin", "quarter"])
+    assert index.update_from(accessor.incidents, page_size=5) == 12
+
+    bio_or_cyber = index.filter({"risk_cats": ["Bio", "Cyber Offense"]})
+    assert index.ids(bio_or_cyber) == _expected(
+        lambda row: {"Bio", "Cyber Offense"} & set(row["risk_cats"])
+    )
+    both = index.filter({"risk_cats": ["Bio", "Manipulation"]}, match_all=True)
+    assert index.ids(both) == _expected(lambda row: {"Bio", "Manipulation"} <= set(row["risk_cats"]))
+    combined = index.filter({"risk_cats": ["Bio"], "actors_origin": ["China"]})
+    assert index.ids(combined) == _expected(
+        lambda row: "Bio" in row["risk_cats"] and "China" in row["actors_origin"]
+    )
+    excluded = index.filter({"quarter": ["Q1 2024"]}, exclude={"actors_origin": ["Russia"]})
+    assert index.ids(excluded) == _expected(
+        lambda row: row["quarter"] == "Q1 2024" and "Russia" not in row["actors_origin"]
+    )
+    assert index.ids(index.all, limit=3) == [1, 2, 3]
+
+
+def test_facet_counts_ignore_their_own_filter(accessor):
+    index = FacetIndex("incidents")
+    index.update_from(accessor.incidents)
+    counts = index.facet_counts({"actors_origin": ["Russia"]})
+    assert sum(counts["actors_origin"].values()) == 12
+    russia = _expected(lambda row: "Russia" in row["actors_origin"])
+    assert sum(counts["risk_cats"].values()) == sum(
+        len(row["risk_cats"]) for row in ROWS["incidents"] if row["id"] in russia
+    )
+
+
+def test_replace_remove_and_compact():
+    index = FacetIndex("evals")
+    index.add([{"id": 1, "models": ["a"]}, {"id": 2, "models": ["a", "b"]}])
+    index.add([{"id": 1, "models": ["b"]}])
+    assert index.ids(index.filter({"models": ["a"]})) == [2]
+    assert sorted(index.ids(index.filter({"models": ["b"]}))) == [1, 2]
+    index.remove([2, 99])
+    assert 2 not in index and 1 in index and len(index) == 1
+    index.compact()
+    assert index.ids(index.all) == [1]
+    assert index.values("models") == ["b"]
+
+
+def test_queries_while_updating():
+    index = FacetIndex("evals")
+    errors = []
+
+    def write():
+        for i in range(2000):
+            index.add([{"id": i % 50, "models": [f"m{i % 7}"]}])
+
+    def read():
+        try:
+            for _ in range(2000):
+                index.ids(index.match("models", ["m1", "m2"]))
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=write), threading.Thread(target=read)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
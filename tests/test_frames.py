@@ -0,0 +1,68 @@
+"""Typed frames, Arrow conversion and the Parquet snapshot."""
+
+import pandas as pd
+import pytest
+
+from aire.data.frames import (
+    ParquetSnapshot,
+    explode_list,
+    indicator_matrix,
+    rows_to_arrow,
+    rows_to_frame,
+)
+from aire.data.records import to_records
+
+from .conftest import ROWS
+
+
+def test_rows_to_frame_types_columns():
+    frame = rows_to_frame("benchmarks", ROWS["benchmarks"])
+    assert pd.api.types.is_datetime64_any_dtype(frame["date"])
+    assert frame["date"].isna().tolist() == [False, False, True, False]
+    assert isinstance(frame["availability"].dtype, pd.CategoricalDtype)
+    assert frame["risk_cats"].tolist() == [row["risk_cats"] for row in ROWS["benchmarks"]]
+
+
+def test_rows_to_frame_accepts_records():
+    rows = ROWS["incidents"]
+    from_records = rows_to_frame("incidents", to_records("incidents", rows))
+    pd.testing.assert_frame_equal(from_records, rows_to_frame("incidents", rows))
+
+
+def test_missing_arrays_become_empty_lists():
+    frame = rows_to_frame("evals", [{"id": 1, "models": None}, {"id": 2, "models": ["a"]}])
+    assert frame["models"].tolist() == [[], ["a"]]
+
+
+def test_explode_and_indicator_matrix():
+    frame = rows_to_frame("evals", ROWS["evals"])
+    long = explode_list(frame, "models")
+    assert len(long) == sum(len(row["models"]) for row in ROWS["evals"])
+    matrix = indicator_matrix(frame, "models")
+    assert list(matrix.index) == [1, 2, 3, 4]
+    assert matrix.loc[3, "GPT-4o"] and not matrix.loc[1, "GPT-4o"]
+    assert not matrix.loc[4].any()
+
+
+def test_arrow_dictionary_encodes_arrays():
+    pa = pytest.importorskip("pyarrow")
+    arrow = rows_to_arrow("incidents", ROWS["incidents"])
+    assert pa.types.is_dictionary(arrow.schema.field("risk_cats").type.value_type)
+    assert arrow.column("risk_cats").to_pylist() == [row["risk_cats"] for row in ROWS["incidents"]]
+
+
+def test_snapshot_round_trip_and_refresh(tmp_path, accessor):
+    pytest.importorskip("pyarrow")
+    snapshot = ParquetSnapshot(str(tmp_path))
+    assert snapshot.age("incidents") is None
+
+    assert snapshot.save(accessor, ["incidents", "evals"]) == {"incidents": 12, "evals": 4}
+    assert snapshot.age("incidents") < 60
+    loaded = snapshot.load_frame("evals")
+    assert loaded["models"].tolist() == [row["models"] for row in ROWS["evals"]]
+    assert snapshot.load_frame("incidents", columns=["id", "quarter"]).shape == (12, 2)
+
+    accessor.db.upsert_rows("evals", [{**ROWS["evals"][0], "id": 5, "public_id": "new"}])
+    assert len(snapshot.frame(accessor, "evals")) == 4
+    assert len(snapshot.frame(accessor, "evals", max_age=0)) == 5
+    assert snapshot.manifest()["tables"]["evals"]["rows"] == 5
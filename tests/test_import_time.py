@@ -0,0 +1,30 @@
+"""Importing the accessors must not load heavy dependencies."""
+
+import importlib.util
+import json
+import subprocess
+import sys
+
+import pytest
+
+from .conftest import ROOT
+
+spec = importlib.util.spec_from_file_location("check_import_time", ROOT / "scripts" / "check_import_time.py")
+check_import_time = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(check_import_time)
+
+
+@pytest.mark.parametrize("module", check_import_time.MODULES)
+def test_no_heavy_imports(module):
+    assert check_import_time.heavy_imports(module) == []
+
+
+def test_script_passes_and_saves_baseline(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    result = subprocess.run(
+        [sys.executable, str(ROOT / "scripts" / "check_import_time.py"),
+         "--runs", "1", "--save-baseline", str(baseline)],
+        capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stdout
+    assert set(json.loads(baseline.read_text())) == set(check_import_time.MODULES)
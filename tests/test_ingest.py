@@ -0,0 +1,113 @@
+"""Bulk ingest into a local SQLite file."""
+
+import json
+import sqlite3
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+from aire.data.storage.ingest import BulkIngestor
+
+from .conftest import ROOT
+
+INCIDENT = {
+    "title": "Model exfiltration attempt",
+    "description": "An agent copied its weights.",
+    "date": "2025-07-01",
+    "category": "Loss of Control",
+    "severity": 7.5,
+}
+
+
+@pytest.fixture
+def ingestor(tmp_path):
+    with BulkIngestor(str(tmp_path / "local.db"), progress=None) as ingestor:
+        yield ingestor
+
+
+def stored(ingestor, table="incidents"):
+    return ingestor.connection.execute(f"SELECT id, title FROM {table} ORDER BY id").fetchall()
+
+
+def test_ids_replace_rows_and_missing_ids_append(ingestor):
+    ingestor.ingest("incidents", [[
+        {**INCIDENT, "id": 5, "title": "first"},
+        {**INCIDENT, "id": "7", "title": "text id"},
+    ]])
+    stats = ingestor.ingest("incidents", [[
+        {**INCIDENT, "id": 5, "title": "replaced"},
+        {**INCIDENT, "title": "appended"},
+    ]])
+    assert stats.written == 2
+    assert stored(ingestor) == [(5, "replaced"), (7, "text id"), (8, "appended")]
+
+
+def test_non_integer_ids_are_rejected(ingestor):
+    stats = ingestor.ingest("incidents", [[
+        {**INCIDENT, "id": 1},
+        {**INCIDENT, "id": "abc"},
+        {**INCIDENT, "id": 2.5},
+        {**INCIDENT, "id": "3.0"},
+    ]])
+    assert (stats.read, stats.written, stats.rejected) == (4, 2, 2)
+    assert stats.errors[("id", "not an integer")] == 2
+    assert [row[0] for row in stored(ingestor)] == [1, 3]
+
+
+def test_invalid_rows_are_counted_per_error(ingestor):
+    frame = pd.DataFrame([INCIDENT, {**INCIDENT, "severity": "high"}, {**INCIDENT, "date": None}])
+    stats = ingestor.ingest_frame("incidents", frame, batch_size=2)
+    assert (stats.batches, stats.written, stats.rejected) == (2, 1, 2)
+    assert stats.errors == {("severity", "not a number"): 1, ("date", "is null"): 1}
+
+
+def test_rebuild_indexes_restores_them_after_a_failed_load(ingestor):
+    def batches():
+        yield [INCIDENT]
+        raise RuntimeError("source went away")
+
+    with pytest.raises(RuntimeError):
+        ingestor.ingest("incidents", batches(), rebuild_indexes=True)
+    assert stored(ingestor) == []
+    indexes = {
+        row[0] for row in ingestor.connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'incidents'"
+        )
+    }
+    assert {"ix_incidents_date", "ix_incidents_category"} <= indexes
+
+
+def test_ingest_file_reads_ndjson_and_csv(ingestor, tmp_path):
+    ndjson = tmp_path / "incidents.ndjson"
+    ndjson.write_text("\n".join(json.dumps({**INCIDENT, "id": i}) for i in (1, 2)) + "\n")
+    csv = tmp_path / "incidents.csv"
+    pd.DataFrame([{**INCIDENT, "id": 3}, {**INCIDENT, "id": "x"}]).to_csv(csv, index=False)
+
+    assert ingestor.ingest_file("incidents", str(ndjson)).written == 2
+    stats = ingestor.ingest_file("incidents", str(csv))
+    assert (stats.written, stats.rejected) == (1, 1)
+    assert [row[0] for row in stored(ingestor)] == [1, 2, 3]
+    with pytest.raises(ValueError):
+        ingestor.ingest_file("incidents", str(tmp_path / "incidents.xlsx"))
+
+
+def test_script_requires_an_explicit_database(tmp_path):
+    source = tmp_path / "incidents.ndjson"
+    source.write_text(json.dumps(INCIDENT) + "\n")
+    script = str(ROOT / "scripts" / "ingest_data.py")
+
+    missing = subprocess.run(
+        [sys.executable, script, "incidents", str(source)], capture_output=True, text=True
+    )
+    assert missing.returncode != 0
+    assert "--database" in missing.stderr
+
+    database = tmp_path / "local.db"
+    subprocess.run(
+        [sys.executable, script, "incidents", str(source), "--database", str(database)],
+        check=True, capture_output=True,
+    )
+    with sqlite3.connect(database) as conn:
+        assert conn.execute("SELECT count(*) FROM incidents").fetchone() == (1,)
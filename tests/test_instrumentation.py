@@ -0,0 +1,64 @@
+"""Query instrumentation: histograms, exposition text, shapes and hooks."""
+
+import logging
+
+from aire.data.accessors import DataAccessor
+from aire.data.instrumentation import Histogram, Instrumentation, QueryEvent
+
+
+def test_histogram_exposition_is_exact():
+    histogram = Histogram("h", "Sizes.", (0.005, 1048576, 16777216))
+    histogram.observe("evals", 0.1)
+    histogram.observe("evals", 0.2)
+    histogram.observe("evals", 2_000_000)
+    assert list(histogram.render()) == [
+        "# HELP h Sizes.",
+        "# TYPE h histogram",
+        'h_bucket{table="evals",le="0.005"} 0',
+        'h_bucket{table="evals",le="1048576"} 2',
+        'h_bucket{table="evals",le="16777216"} 3',
+        'h_bucket{table="evals",le="+Inf"} 3',
+        'h_sum{table="evals"} 2000000.3',
+        'h_count{table="evals"} 3',
+    ]
+
+
+def test_histogram_sum_keeps_full_precision():
+    histogram = Histogram("h", "Latency.", (1.0,))
+    histogram.observe("t", 1234.56789)
+    assert 'h_sum{table="t"} 1234.56789' in list(histogram.render())
+    assert histogram.quantile("t", 0.5) == float("inf")
+    assert histogram.quantile("missing", 0.5) is None
+
+
+def test_prometheus_includes_every_metric():
+    instrumentation = Instrumentation(slow_query_seconds=None)
+    instrumentation.record(QueryEvent("evals", "GET", 0.02, rows=4, bytes=2048))
+    instrumentation.record(QueryEvent("evals", "GET", 0.5, rows=0, error="HTTPError"))
+    text = instrumentation.prometheus()
+    assert 'aire_query_duration_seconds_count{table="evals"} 2' in text
+    assert 'aire_query_rows_bucket{table="evals",le="10"} 1' in text
+    assert 'aire_query_response_bytes_bucket{table="evals",le="4096"} 1' in text
+    assert 'aire_query_errors_total{table="evals"} 1' in text
+    assert text.endswith("\n")
+
+
+def test_replica_queries_are_recorded_by_shape(replica, caplog):
+    instrumentation = Instrumentation(slow_query_seconds=0.0)
+    events = []
+    instrumentation.add_hook(events.append)
+    instrumentation.add_hook(lambda event: 1 / 0)
+    replica.instrumentation = instrumentation
+    accessor = DataAccessor(db=replica)
+
+    with caplog.at_level(logging.WARNING, logger="aire.data.instrumentation"):
+        accessor.incidents.get_by_quarter("Q1 2024")
+        accessor.incidents.get_by_quarter("Q2 2024")
+
+    assert [event.rows for event in events] == [3, 3]
+    assert events[0].shape == events[1].shape
+    assert "Q1 2024" not in events[0].shape
+    [stats] = instrumentation.top_shapes()
+    assert (stats.calls, stats.rows) == (2, 6)
+    assert any("Slow query on incidents" in message for message in caplog.messages)
+    assert any("hook" in message for message in caplog.messages)
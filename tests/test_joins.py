@@ -0,0 +1,86 @@
+"""Local hash joins over the seeded evals, versions and epoch_models."""
+
+import pytest
+
+from aire.data.joins import KEY_FIELD, JoinEngine, normalize_model_name
+
+
+def test_normalize_model_name_unifies_spellings():
+    assert normalize_model_name("Claude 3.5 Sonnet") == "claude-3.5-sonnet"
+    assert normalize_model_name("claude_3.5_sonnet") == "claude-3.5-sonnet"
+    assert normalize_model_name(" CLAUDE–3.5–SONNET ") == "claude-3.5-sonnet"
+    assert normalize_model_name("o1.preview") == "o1-preview"
+
+
+def test_inner_join_matches_across_spellings(accessor):
+    engine = JoinEngine(accessor)
+    pairs = sorted(
+        (row["model"], row["evals"]["id"], row["epoch_models"]["id"])
+        for row in engine.join("evals", "epoch_models")
+    )
+    assert pairs == [
+        ("claude-4.5-sonnet", 1, 1),
+        ("claude-4.5-sonnet", 3, 1),
+        ("gpt-4o", 2, 2),
+        ("gpt-4o", 3, 2),
+    ]
+
+
+def test_three_table_join_and_group_by(accessor):
+    engine = JoinEngine(accessor)
+    large = lambda model: (model.get("parameters") or 0) > 1e11
+    rows = engine.join("evals", "versions", "epoch_models", where={"epoch_models": large})
+    by_org = engine.group_by(rows, key=lambda row: row["epoch_models"]["organization"])
+    assert by_org == {"OpenAI": 2}
+
+
+def test_left_join_keeps_rows_without_model_names(accessor):
+    engine = JoinEngine(accessor)
+    rows = list(engine.join("evals", "epoch_models", how="left"))
+
+    keyless = [row for row in rows if row["model"] is None]
+    assert [row["evals"]["id"] for row in keyless] == [4]
+    assert keyless[0]["epoch_models"] is None
+    assert {row["evals"]["id"] for row in rows} == {1, 2, 3, 4}
+
+
+def test_left_join_filters_keyless_rows_with_where(accessor):
+    engine = JoinEngine(accessor)
+    rows = engine.join(
+        "evals", "versions", how="left", where={"evals": lambda row: row["reviewed"]}
+    )
+    assert {row["evals"]["id"] for row in rows} == {1, 3}
+
+
+def test_aliases_keep_the_original_name(accessor):
+    engine = JoinEngine(accessor, aliases={"Llama 3 70B": "GPT-4o"})
+    epoch = engine.index("epoch_models")
+
+    llama = next(row for row in epoch.rows if row["id"] == 3)
+    assert llama["model"] == "Llama 3 70B"
+    assert llama[KEY_FIELD] == ("gpt-4o",)
+    assert sorted(row["id"] for row in epoch.lookup("gpt-4o")) == [2, 3]
+
+
+def test_semi_join_uses_aliased_keys(accessor):
+    engine = JoinEngine(accessor, aliases={"Gemini 100% Pro": "Llama 3 70B"})
+    versions = engine.semi_join(
+        "versions", "epoch_models", where=lambda row: row["organization"] == "Meta"
+    )
+    assert [(row["id"], row["name"]) for row in versions] == [(3, "Gemini 100% Pro")]
+
+
+def test_add_rows_indexes_given_rows(accessor):
+    engine = JoinEngine(accessor)
+    engine.add_rows("versions", [{"id": 9, "name": "GPT 4o"}, {"id": 10, "name": None}])
+    index = engine.index("versions")
+    assert [row["id"] for row in index.lookup("gpt-4o")] == [9]
+    assert [row["id"] for row in index.keyless] == [10]
+
+
+def test_join_rejects_bad_arguments(accessor):
+    engine = JoinEngine(accessor)
+    with pytest.raises(ValueError):
+        list(engine.join("evals"))
+    with pytest.raises(ValueError):
+        list(engine.join("evals", "versions", how="outer"))
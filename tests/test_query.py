@@ -0,0 +1,102 @@
+"""Composable queries, run on the replica and through PostgREST."""
+
+from datetime import date
+
+import pytest
+
+from aire.data.accessors import DataAccessor
+
+
+@pytest.fixture(params=["replica", "postgrest"])
+def data(request, replica) -> DataAccessor:
+    if request.param == "replica":
+        return DataAccessor(db=replica)
+    return DataAccessor(db=request.getfixturevalue("supabase_db"))
+
+
+def ids(rows):
+    return sorted(row["id"] for row in rows)
+
+
+def test_filters_combine_into_one_request(data):
+    query = data.incidents.query("listing").risk_category("Cyber Offense").actor_origin("Russia")
+    assert ids(query.all()) == [3, 12]
+    assert ids(query.quarter("Q1 2024").all()) == [3]
+    assert query.count() == 2
+
+
+def test_queries_are_immutable(data):
+    base = data.incidents.query().risk_category("Cyber Offense")
+    narrowed = base.quarter("Q4 2024", "Q3 2024")
+    assert ids(narrowed.all()) == [7, 8, 11, 12]
+    assert ids(base.all()) == [3, 4, 7, 8, 11, 12]
+
+
+def test_order_limit_and_offset(data):
+    query = data.incidents.query(["id"]).order("reporting_date", desc=True)
+    assert [row["id"] for row in query.limit(3).all()] == [12, 11, 10]
+    assert [row["id"] for row in query.offset(2).limit(2).all()] == [10, 9]
+    assert query.first() == {"id": 12}
+    assert query.limit(0).all() == []
+
+
+def test_iter_pages_by_keyset_and_by_offset(data):
+    query = data.incidents.query("ids").neq("quarter", "Q2 2024")
+    assert [row["id"] for row in query.iter(page_size=2)] == [1, 2, 3, 7, 8, 9, 10, 11, 12]
+    window = query.order("id", desc=True).offset(1).limit(5)
+    assert [row["id"] for row in window.iter(page_size=2)] == [11, 10, 9, 8, 7]
+
+
+def test_any_of_groups_conditions(data):
+    query = data.incidents.query().any_of(
+        ("quarter", "in", ["Q1 2024", "Q4 2024"]),
+        ("id", "eq", 5),
+        ("risk_cats", "contains", ["Loss of Control", "Cyber Offense"]),
+    )
+    assert ids(query.all()) == [1, 2, 3, 5, 7, 10, 11, 12]
+    unreviewed = data.evals.query().any_of(("reviewed", "eq", False))
+    assert ids(unreviewed.all()) == [2, 4]
+
+
+def test_any_of_matches_none_as_null(data):
+    benchmarks = data.benchmarks.query()
+    undated_or_closed = benchmarks.any_of(("date", "eq", None), ("availability", "eq", "Closed"))
+    assert ids(undated_or_closed.all()) == [2, 3]
+    assert ids(benchmarks.any_of(("date", "neq", None)).all()) == [1, 2, 4]
+    for condition in [("date", "gt", None), ("date", "in", ["2024-03-01", None])]:
+        with pytest.raises(ValueError):
+            benchmarks.any_of(condition)
+
+
+def test_text_searches_are_escaped(data):
+    assert ids(data.incidents.query().search("Incident 1:", "headline").all()) == [1]
+    versions = data.versions.query()
+    assert ids(versions.name_contains("100%").all()) == [3]
+    assert ids(versions.name_contains("4.5").all()) == [1]
+    assert versions.name_contains("_").all() == []
+    assert versions.name_contains('"),id.gt.0').all() == []
+
+
+def test_table_helpers(data):
+    evals = data.evals.query()
+    assert ids(evals.reviewed().all()) == [1, 3]
+    assert ids(evals.released_between("2024-06-01", date(2024, 12, 31)).all()) == [2, 3]
+    assert ids(evals.organization("UK AISI").model("GPT-4o").all()) == [3]
+    assert ids(data.benchmarks.query().open_source().dated_between(end="2024-06-30").all()) == [1]
+    assert data.benchmarks.query().is_null("date").exists()
+
+
+def test_columns_and_operators_are_validated(accessor):
+    query = accessor.incidents.query()
+    with pytest.raises(ValueError):
+        query.eq("risk_cats", "Bio")
+    with pytest.raises(ValueError):
+        query.contains("quarter", ["Q1 2024"])
+    with pytest.raises(ValueError):
+        query.eq("headline; drop table incidents", "x")
+    with pytest.raises(ValueError):
+        query.any_of(("id", "like", 1))
+    with pytest.raises(ValueError):
+        query.any_of()
+    with pytest.raises(ValueError):
+        query.limit(-1)
@@ -0,0 +1,91 @@
+"""Compact ``Record`` rows."""
+
+import copy
+import pickle
+from datetime import date, datetime, timezone
+
+import pytest
+
+from aire.data.accessors import DataAccessor
+from aire.data.records import IncidentRecord, Record, record_class, to_records
+
+from .conftest import ROWS
+
+
+def test_records_behave_like_read_only_dicts():
+    (row,) = to_records("incidents", [ROWS["incidents"][0]])
+    source = ROWS["incidents"][0]
+
+    assert isinstance(row, IncidentRecord)
+    assert row["id"] == row.id == 1
+    assert row.get("missing", "default") == "default"
+    assert "headline" in row and "missing" not in row
+    assert list(row) == list(source)
+    assert len(row) == len(source)
+    assert row == {**source, "risk_cats": tuple(source["risk_cats"]),
+                   "actors_origin": tuple(source["actors_origin"])}
+    with pytest.raises(KeyError):
+        row["missing"]
+    with pytest.raises(AttributeError):
+        row.headline = "changed"
+
+
+def test_to_dict_is_a_mutable_copy_with_lists():
+    (row,) = to_records("incidents", [ROWS["incidents"][0]])
+    mutable = row.to_dict()
+    assert mutable == ROWS["incidents"][0]
+    mutable["risk_cats"].append("Other")
+    assert row.risk_cats == ("Bio", "Manipulation")
+
+
+def test_equal_arrays_and_categories_are_shared():
+    rows = to_records("incidents", [dict(row) for row in ROWS["incidents"]])
+    by_cats = {}
+    for row in rows:
+        by_cats.setdefault(row.risk_cats, []).append(row)
+    for group in by_cats.values():
+        assert all(row.risk_cats is group[0].risk_cats for row in group)
+    q1 = [row.quarter for row in rows if row.quarter == "Q1 2024"]
+    assert all(quarter is q1[0] for quarter in q1)
+
+
+def test_one_class_per_table_and_column_set():
+    rows = to_records("versions", [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}, {"id": 3}])
+    assert type(rows[0]) is type(rows[1]) is record_class("versions", ("id", "name"))
+    assert type(rows[2]) is not type(rows[0])
+    assert rows[2].fields == ("id",)
+
+
+def test_unsuitable_rows_stay_dicts():
+    rows = [{"id": 1, "values": [1]}, {"id": 2, "not-an-identifier": 1}]
+    assert to_records("versions", rows) == rows
+    assert all(type(row) is dict for row in to_records("versions", rows))
+    (record,) = to_records("versions", [{"id": 1}])
+    assert to_records("versions", [record])[0] is record
+
+
+def test_as_date_decodes_on_demand():
+    (row,) = to_records("incidents", [ROWS["incidents"][0]])
+    assert row.reporting_date == "2024-01-15"
+    assert row.as_date("reporting_date") == date(2024, 1, 15)
+    assert row.as_date("created_at") == datetime(2024, 1, 15, 12, tzinfo=timezone.utc)
+    (undated,) = to_records("benchmarks", [ROWS["benchmarks"][2]])
+    assert undated.as_date("date") is None
+
+
+def test_records_pickle_and_copy():
+    (row,) = to_records("evals", [ROWS["evals"][0]])
+    for clone in (pickle.loads(pickle.dumps(row)), copy.copy(row), copy.deepcopy(row)):
+        assert type(clone) is type(row)
+        assert clone == row
+
+
+def test_accessor_returns_records_when_enabled(replica):
+    rows = DataAccessor(db=replica, records=True).incidents.get_recent(3, columns="listing")
+    assert all(isinstance(row, Record) for row in rows)
+    assert [row.id for row in rows] == [12, 11, 10]
+    plain = DataAccessor(db=replica).incidents.get_recent(3, columns="listing")
+    assert [dict(row) for row in rows] == [
+        {key: tuple(value) if isinstance(value, list) else value for key, value in row.items()}
+        for row in plain
+    ]
@@ -0,0 +1,163 @@
+"""Replica parity with PostgREST.
+
+Each case lists the ids Supabase's PostgREST returns for the same request on
+the seeded rows (Postgres semantics: typed ids, NULLS LAST ascending and
+NULLS FIRST descending, case-insensitive ``ilike``, ``cs`` as array
+containment). Cases run against the replica directly and through the fake
+PostgREST server with the real Supabase client.
+"""
+
+import pytest
+
+from aire.data.escaping import contains_pattern, quote_value
+from aire.data.storage.replica import ReplicaDB
+
+from .conftest import ROWS
+
+CASES = {
+    "order_by_integer_id": (
+        "incidents", lambda q: q.order("id"), list(range(1, 13)),
+    ),
+    "gt_integer_id": (
+        "incidents", lambda q: q.gt("id", 9).order("id"), [10, 11, 12],
+    ),
+    "gt_integer_id_as_text": (
+        "incidents", lambda q: q.gt("id", "9").order("id"), [10, 11, 12],
+    ),
+    "in_ids_as_text": (
+        "incidents", lambda q: q.in_("id", ["2", "11"]).order("id"), [2, 11],
+    ),
+    "order_desc_nulls_first": (
+        "benchmarks", lambda q: q.order("date", desc=True), [3, 4, 2, 1],
+    ),
+    "order_asc_nulls_last": (
+        "benchmarks", lambda q: q.order("date"), [1, 2, 4, 3],
+    ),
+    "explicit_nulls_last_desc": (
+        "benchmarks", lambda q: q.order("date", desc=True, nullsfirst=False), [4, 2, 1, 3],
+    ),
+    "is_null": (
+        "benchmarks", lambda q: q.is_("date", None), [3],
+    ),
+    "neq_skips_other_values": (
+        "benchmarks", lambda q: q.neq("availability", "Open"), [2],
+    ),
+    "ilike_is_case_insensitive": (
+        "incidents", lambda q: q.ilike("headline", "%DEEPFAKE%").order("id"), [3, 6, 9, 12],
+    ),
+    "contains_every_value": (
+        "incidents", lambda q: q.contains("risk_cats", ["Bio", "Manipulation"]).order("id"),
+        [1, 5, 9],
+    ),
+    "or_ilike_and_eq": (
+        "incidents", lambda q: q.or_("headline.ilike.*deepfake*,id.eq.1").order("id"),
+        [1, 3, 6, 9, 12],
+    ),
+    "or_quoted_ilike_with_reserved_characters": (
+        "incidents",
+        lambda q: q.or_(f"headline.ilike.{quote_value(contains_pattern('Incident 1:'))}"),
+        [1],
+    ),
+    "or_cs_and_eq": (
+        "incidents", lambda q: q.or_('risk_cats.cs.{"Loss of Control"},id.eq.2').order("id"),
+        [2, 3, 7, 11],
+    ),
+    "or_cs_needs_every_value": (
+        "incidents",
+        lambda q: q.or_('risk_cats.cs.{"Loss of Control","Cyber Offense"},id.eq.1').order("id"),
+        [1, 3, 7, 11],
+    ),
+    "or_eq_boolean": (
+        "evals", lambda q: q.or_("reviewed.eq.false,id.eq.1").order("id"), [1, 2, 4],
+    ),
+    "or_in_quoted_list": (
+        "incidents", lambda q: q.or_('quarter.in.("Q1 2024","Q4 2024")').order("id"),
+        [1, 2, 3, 10, 11, 12],
+    ),
+    "limit_after_order": (
+        "incidents", lambda q: q.order("id", desc=True).limit(3), [12, 11, 10],
+    ),
+}
+
+
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_replica_matches_postgrest(replica, name):
+    table, build, expected = CASES[name]
+    rows = build(replica.table(table).select("*")).execute().data
+    assert [row["id"] for row in rows] == expected
+
+
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_fake_server_matches_postgrest(supabase_db, name):
+    table, build, expected = CASES[name]
+    rows = supabase_db.execute(build(supabase_db.table(table).select("*"))).data
+    assert [row["id"] for row in rows] == expected
+
+
+def test_count_and_head(replica):
+    response = replica.table("incidents").select("id", count="exact", head=True).gt("id", 10).execute()
+    assert response.count == 2
+    assert response.data == []
+
+
+def test_projection(replica):
+    rows = replica.table("versions").select("id,name").eq("id", 1).execute().data
+    assert rows == [{"id": 1, "name": "Claude 4.5 Sonnet"}]
+
+
+def test_text_ids_compare_as_text(tmp_path):
+    db = ReplicaDB(str(tmp_path / "text.db"))
+    db.upsert_rows("versions", [{"id": f"v-{i}", "name": str(i)} for i in (1, 2, 10)])
+    rows = db.table("versions").select("id").order("id").execute().data
+    assert [row["id"] for row in rows] == ["v-1", "v-10", "v-2"]
+
+
+def test_upsert_reports_changes_and_delete_missing(replica):
+    changed = dict(ROWS["versions"][0], name="Claude 4.5 Sonnet (new)")
+    assert replica.upsert_rows("versions", [changed, ROWS["versions"][1]]) == (0, 1, 1)
+    assert replica.delete_missing("versions", [1, 2]) == 1
+    rows = replica.table("versions").select("*").order("id").execute().data
+    assert rows == [changed, ROWS["versions"][1]]
+
+
+def test_array_side_tables_follow_updates(replica):
+    row = dict(ROWS["incidents"][0], risk_cats=["Privacy"])
+    replica.upsert_rows("incidents", [row])
+    ids = lambda cat: [r["id"] for r in replica.table("incidents").select("id").contains("risk_cats", [cat]).execute().data]
+    assert 1 in ids("Privacy")
+    assert 1 not in ids("Bio")
+
+
+def test_old_layout_is_rebuilt(tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE _sync_state (table_name TEXT PRIMARY KEY, watermark TEXT, synced_at TEXT)")
+    conn.execute("CREATE TABLE incidents (id TEXT PRIMARY KEY, row TEXT NOT NULL, row_hash TEXT NOT NULL)")
+    conn.execute("INSERT INTO incidents VALUES ('1', '{\"id\": 1}', 'x')")
+    conn.commit()
+    conn.close()
+
+    db = ReplicaDB(path)
+    assert db.table("incidents").select("*").execute().data == []
+    db.upsert_rows("incidents", ROWS["incidents"])
+    assert [r["id"] for r in db.table("incidents").select("id").order("id").limit(3).execute().data] == [1, 2, 3]
+
+
+def test_other_databases_are_refused_untouched(tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / "aire.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE incidents (id INTEGER PRIMARY KEY, headline TEXT)")
+    conn.execute("INSERT INTO incidents VALUES (1, 'kept')")
+    conn.commit()
+    conn.close()
+
+    with pytest.raises(ValueError, match="not a replica"):
+        ReplicaDB(path)
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT headline FROM incidents").fetchall() == [("kept",)]
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    conn.close()
@@ -0,0 +1,77 @@
+"""Full-text search index and MATCH expression building."""
+
+import asyncio
+
+import pytest
+
+from aire.data.async_accessors import AsyncDataAccessor
+from aire.data.search import SearchIndex, build_match_expression
+
+from .conftest import ROWS
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("bio risk", '"bio" AND "risk"'),
+    ("bio*", '"bio"*'),
+    ("bio *", '"bio"'),
+    ("* bio", '"bio"'),
+    ('"loss of control" AND', '"loss of control" AND "AND"'),
+    ('NEAR(a b) col:x', '"NEAR" AND "a" AND "b" AND "col" AND "x"'),
+    ("***", ""),
+])
+def test_match_expression_is_literal(query, expected):
+    assert build_match_expression(query) == expected
+
+
+def test_match_any():
+    assert build_match_expression("bio cyber", match_all=False) == '"bio" OR "cyber"'
+
+
+@pytest.fixture
+def index(accessor):
+    index = SearchIndex("incidents")
+    index.update_from(accessor.incidents, page_size=5)
+    return index
+
+
+def test_update_from_indexes_every_row_once(index, accessor):
+    assert len(index) == len(ROWS["incidents"])
+    assert index.update_from(accessor.incidents) == 0
+    assert index.last_id() == 12
+
+
+def test_search_ranks_and_keeps_id_types(index):
+    hits = index.search("deepfake")
+    assert sorted(hit.id for hit in hits) == [3, 6, 9, 12]
+    assert all(isinstance(hit.id, int) for hit in hits)
+    assert index.search("deepfake", limit=2) == hits[:2]
+    assert index.search("bio *") == index.search("bio")
+    assert index.search("phish*", limit=None)
+
+
+def test_removed_and_replaced_rows(index):
+    index.remove([3])
+    index.add([{"id": 6, "headline": "Unrelated", "description": ""}])
+    assert sorted(hit.id for hit in index.search("deepfake", limit=None)) == [9, 12]
+
+
+def test_search_by_keyword_uses_index(index, accessor):
+    expected = {row["id"] for row in accessor.incidents.search_by_keyword("deepfake")}
+    ranked = accessor.incidents.search_by_keyword("deepfake", columns="listing", index=index)
+    assert [row["id"] for row in ranked] == [hit.id for hit in index.search("deepfake", limit=None)]
+    assert {row["id"] for row in ranked} == expected
+
+
+def test_async_search_by_keyword_uses_index(index, supabase_env):
+    from aire.data.storage.client import ClientConfig, aclose_clients
+    from aire.data.storage.database import AsyncSupabaseDB
+
+    async def main():
+        accessor = AsyncDataAccessor(await AsyncSupabaseDB.create(ClientConfig(retries=0)))
+        try:
+            return await accessor.incidents.search_by_keyword("deepfake", index=index)
+        finally:
+            await aclose_clients()
+
+    rows = asyncio.run(main())
+    assert [row["id"] for row in rows] == [hit.id for hit in index.search("deepfake", limit=None)]
@@ -0,0 +1,94 @@
+"""TF-IDF similarity between incidents, benchmarks and evaluations."""
+
+import json
+
+import pytest
+
+from aire.analysis import similarity
+from aire.analysis.similarity import SimilarityIndex
+
+from .conftest import ROWS
+
+
+def incident(row_id, headline):
+    return {"id": row_id, "headline": headline, "description": ""}
+
+
+@pytest.fixture
+def index(tmp_path, accessor):
+    index = SimilarityIndex(str(tmp_path))
+    index.update_from(accessor)
+    return index
+
+
+def test_related_finds_matching_rows(index):
+    assert len(index) == 20
+    hits = index.related("incidents", 3, targets=["incidents"], k=3)["incidents"]
+    # 7 and 11 are also about a manipulation event.
+    assert {hit.id for hit in hits[:2]} == {7, 11}
+    assert all(0 < hit.score <= 1 for hit in hits)
+    assert index.similar_to_text("deepfake campaign", "incidents", k=1)[0].id in (3, 6, 9, 12)
+    with pytest.raises(KeyError):
+        index.related("incidents", 99)
+
+
+def test_small_corpus_keeps_every_term(tmp_path):
+    index = SimilarityIndex(str(tmp_path), tables=["incidents"])
+    index.fit({"incidents": [incident(1, "router exploit"), incident(2, "router outage")]})
+    assert "router" in index.vectorizer.vocabulary_
+    assert index.vectorizer.min_df == 2 and index.vectorizer.max_df == 0.5
+    assert index.related("incidents", 1, targets=["incidents"])["incidents"][0].id == 2
+    with pytest.raises(ValueError):
+        index.fit({"incidents": [incident(1, "the and of")]})
+
+
+def test_update_appends_a_segment_and_marks_replaced_rows_dead(index):
+    current = index._matrices["incidents"]
+    first = current.segments[0]
+    assert index.update(
+        "incidents", [incident(1, "deepfake campaign"), incident(20, "phishing campaign")], [4, 1, 99]
+    ) == (2, 1)
+
+    assert current.segments[0] is first and len(current.segments) == 2
+    assert current.dead == 2 and len(current) == 12
+    assert 4 not in current.positions and current.positions[1] == 12
+    hits = index.related("incidents", 20, targets=["incidents"], k=20)["incidents"]
+    assert 4 not in [hit.id for hit in hits]
+    assert len({hit.id for hit in hits}) == len(hits)
+    assert index.related("incidents", 1, targets=["incidents"], k=1)["incidents"][0].id in (3, 6, 9, 12)
+
+    assert index.remove("incidents", [99]) == 0
+    assert index.update("incidents") == (0, 0)
+    assert len(current.segments) == 2
+
+
+def test_segments_are_compacted_when_they_pile_up(index, monkeypatch):
+    monkeypatch.setattr(similarity, "COMPACT_SEGMENTS", 3)
+    current = index._matrices["incidents"]
+    index.add("incidents", [incident(20, "phishing campaign")])
+    index.add("incidents", [incident(21, "deepfake campaign")])
+    assert len(current.segments) == 3
+    index.add("incidents", [incident(20, "phishing campaign again")])
+    assert len(current.segments) == 1 and current.dead == 0
+    assert current.ids == list(range(1, 13)) + [21, 20]
+    assert index.remove("incidents", range(1, 9)) == 8
+    index.add("incidents", [incident(22, "deepfake")])
+    assert current.dead == 0 and len(current.ids) == len(current) == 7
+
+
+def test_update_from_applies_deletions_with_additions(index, accessor, replica):
+    keep = [row["id"] for row in ROWS["incidents"] if row["id"] != 4]
+    replica.delete_missing("incidents", keep)
+    replica.upsert_rows("incidents", [incident(20, "phishing campaign")])
+    assert index.update_from(accessor, full=True)["incidents"] == 12
+    assert 4 not in index._matrices["incidents"].positions
+    assert len(index) == 20
+
+
+def test_save_and_load(index, tmp_path):
+    index.save()
+    loaded = SimilarityIndex.load(str(tmp_path))
+    assert len(loaded) == len(index)
+    assert loaded.related("incidents", 3, k=2) == index.related("incidents", 3, k=2)
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    assert manifest["tables"]["incidents"]["rows"] == 12
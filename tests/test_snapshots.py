@@ -0,0 +1,164 @@
+"""Memory-mapped Arrow IPC snapshots."""
+
+import os
+from types import SimpleNamespace
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from aire.data import snapshots
+from aire.data.snapshots import MappedSnapshot
+
+from .conftest import ROWS
+
+
+def generations(directory):
+    return sorted(name for name in os.listdir(directory) if name.startswith("gen-"))
+
+
+def source(table, rows):
+    """Stand-in accessor streaming ``rows`` for ``table``."""
+    return SimpleNamespace(**{table: SimpleNamespace(iter_all=lambda page_size: iter(rows))})
+
+
+def test_save_and_load_round_trip(accessor, tmp_path):
+    snapshot = MappedSnapshot(str(tmp_path))
+    assert snapshot.save(accessor) == 1
+
+    tables = MappedSnapshot(str(tmp_path)).load_all()
+    for table, rows in ROWS.items():
+        assert tables[table].to_pylist() == rows
+    assert snapshot.rows("incidents", ["id", "quarter"])[0] == {"id": 1, "quarter": "Q1 2024"}
+    assert snapshot.manifest()["tables"]["evals"]["rows"] == len(ROWS["evals"])
+    assert snapshot.age() < 60
+
+
+def test_arrays_and_categories_are_dictionary_encoded(accessor, tmp_path):
+    snapshot = MappedSnapshot(str(tmp_path))
+    snapshot.save(accessor, tables=["incidents"])
+    schema = snapshot.load("incidents").schema
+    assert pa.types.is_dictionary(schema.field("quarter").type)
+    assert pa.types.is_dictionary(schema.field("risk_cats").type.value_type)
+    assert pa.types.is_string(schema.field("headline").type)
+
+
+def test_save_streams_record_batches(accessor, tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshots, "RECORD_BATCH_ROWS", 5)
+    batches = []
+    write = snapshots._TableWriter.write
+    monkeypatch.setattr(
+        snapshots._TableWriter, "write",
+        lambda self, rows: (batches.append(len(rows)), write(self, rows))[1],
+    )
+    snapshot = MappedSnapshot(str(tmp_path))
+    snapshot.save(accessor, tables=["incidents"], page_size=4)
+
+    assert batches == [5, 5, 2]
+    with pa.memory_map(snapshot.path("incidents"), "r") as mapped:
+        reader = pa.ipc.open_file(mapped)
+        assert reader.num_record_batches == 3
+        assert reader.read_all().to_pylist() == ROWS["incidents"]
+
+
+def test_schema_waits_for_values_and_widens_numbers(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshots, "RECORD_BATCH_ROWS", 2)
+    rows = [
+        # Held back until "name" has a value, then written with integer scores.
+        {"id": 1, "name": None, "score": 1},
+        {"id": 2, "name": None, "score": 2},
+        {"id": 3, "name": "a", "score": 3},
+        {"id": 4, "name": None, "score": None},
+        # A float score rewrites the file with a double column.
+        {"id": 5, "name": "b", "score": 4.5},
+    ]
+    snapshot = MappedSnapshot(str(tmp_path))
+    snapshot.save(source("versions", rows), tables=["versions"])
+
+    arrow = snapshot.load("versions")
+    assert arrow.schema.field("score").type == pa.float64()
+    assert arrow.to_pylist() == rows
+    assert os.listdir(os.path.dirname(snapshot.path("versions"))) == ["versions.arrow"]
+
+
+def test_dictionaries_are_unified_per_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshots, "RECORD_BATCH_ROWS", 2)
+    rows = [
+        {"id": i, "quarter": f"Q{i % 4 + 1} 2024", "risk_cats": [f"risk {i}"]}
+        for i in range(1, 8)
+    ]
+    snapshot = MappedSnapshot(str(tmp_path))
+    snapshot.save(source("incidents", rows), tables=["incidents"])
+
+    with pa.memory_map(snapshot.path("incidents"), "r") as mapped:
+        reader = pa.ipc.open_file(mapped)
+        assert reader.num_record_batches == 4
+        arrow = reader.read_all()
+        assert reader.stats.num_dictionary_deltas == 0
+        assert reader.stats.num_dictionary_batches == 2
+    assert arrow.to_pylist() == rows
+    assert os.listdir(os.path.dirname(snapshot.path("incidents"))) == ["incidents.arrow"]
+
+
+def test_write_goes_through_the_streaming_writer(tmp_path):
+    snapshot = MappedSnapshot(str(tmp_path))
+    arrow = pa.Table.from_pylist(ROWS["incidents"])
+    snapshot.write({"incidents": arrow, "versions": ROWS["versions"]})
+
+    written = snapshot.load("incidents")
+    assert pa.types.is_dictionary(written.schema.field("quarter").type)
+    assert written.to_pylist() == ROWS["incidents"]
+    assert snapshot.rows("versions") == ROWS["versions"]
+    # Already dictionary-encoded input is decoded and encoded the same way.
+    snapshot.write({"incidents": written})
+    assert snapshot.load("incidents").schema == written.schema
+
+
+def test_write_carries_other_tables_over(accessor, tmp_path):
+    snapshot = MappedSnapshot(str(tmp_path))
+    snapshot.save(accessor, tables=["incidents", "versions"])
+    assert snapshot.write({"versions": [{"id": 9, "name": "new"}]}) == 2
+
+    tables = snapshot.load_all()
+    assert tables["versions"].to_pylist() == [{"id": 9, "name": "new"}]
+    assert tables["incidents"].num_rows == len(ROWS["incidents"])
+
+
+def test_pruning_lags_one_save(accessor, tmp_path):
+    snapshot = MappedSnapshot(str(tmp_path), keep=1)
+    snapshot.save(accessor, tables=["versions"])
+    snapshot.save(accessor, tables=["versions"])
+    read_before_save = snapshot.path("versions")
+    snapshot.save(accessor, tables=["versions"])
+
+    assert generations(tmp_path) == ["gen-000002", "gen-000003"]
+    with pa.memory_map(read_before_save, "r") as mapped:
+        assert pa.ipc.open_file(mapped).read_all().num_rows == len(ROWS["versions"])
+    with pytest.raises(ValueError):
+        MappedSnapshot(str(tmp_path), keep=0)
+
+
+def test_failed_save_keeps_the_published_generation(accessor, tmp_path):
+    snapshot = MappedSnapshot(str(tmp_path))
+    snapshot.save(accessor, tables=["versions"])
+
+    def broken(page_size):
+        yield {"id": 1, "name": "partial"}
+        raise RuntimeError("connection lost")
+
+    failing = SimpleNamespace(versions=SimpleNamespace(iter_all=broken))
+    with pytest.raises(RuntimeError):
+        snapshot.save(failing, tables=["versions"])
+    assert snapshot.generation == 1
+    assert snapshot.rows("versions") == ROWS["versions"]
+
+    assert snapshot.save(accessor, tables=["versions"]) == 2
+    assert snapshot.rows("versions") == ROWS["versions"]
+
+
+def test_missing_snapshot(tmp_path):
+    snapshot = MappedSnapshot(str(tmp_path / "empty"))
+    assert snapshot.manifest() == {}
+    assert snapshot.age() is None
+    with pytest.raises(FileNotFoundError):
+        snapshot.load_all()
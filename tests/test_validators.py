@@ -0,0 +1,85 @@
+"""Schema validators."""
+
+import pandas as pd
+
+from aire.utils.validators import (
+    INCIDENT_VALIDATOR,
+    Field,
+    Schema,
+    validate_incident_data,
+)
+
+INCIDENT = {
+    "title": "Model exfiltration attempt",
+    "description": "An agent copied its weights.",
+    "date": "2025-07-01",
+    "category": "Loss of Control",
+    "severity": 7.5,
+}
+
+
+def test_valid_rows_keep_input_and_parse_types():
+    report = INCIDENT_VALIDATOR.validate_records([INCIDENT, {**INCIDENT, "severity": "42"}])
+    assert report.ok
+    assert report.valid["severity"].tolist() == [7.5, 42.0]
+    assert pd.api.types.is_datetime64_any_dtype(report.valid["date"])
+
+
+def test_categories_and_scales_are_not_invented():
+    row = {**INCIDENT, "category": "Chemical", "severity": 250}
+    assert validate_incident_data([row]) == [row]
+
+
+def test_missing_key_is_not_reported_as_null():
+    rows = [INCIDENT, {k: v for k, v in INCIDENT.items() if k != "severity"}, {**INCIDENT, "severity": None}]
+    report = INCIDENT_VALIDATOR.validate_records(rows)
+    errors = list(report.errors.itertuples(index=False, name=None))
+    assert errors == [(1, "severity", "missing field"), (2, "severity", "is null")]
+    assert report.valid_positions == [0]
+
+
+def test_optional_key_may_be_absent():
+    validator = Schema("t", (Field("a"), Field("b", required=False))).compile()
+    report = validator.validate_records([{"a": "x"}, {"a": "y", "b": "z"}])
+    assert report.ok
+
+
+def test_type_checks_find_offending_rows():
+    validator = Schema("t", (Field("name"), Field("flag", "boolean"))).compile()
+    frame = pd.DataFrame({"name": ["a", 1, "c"], "flag": [True, 1, False]})
+    report = validator.validate_frame(frame)
+    assert set(report.errors.itertuples(index=False, name=None)) == {
+        (1, "name", "not a string"), (1, "flag", "not a boolean"),
+    }
+    assert validator.validate_frame(pd.DataFrame({"name": ["a"], "flag": [True]})).ok
+
+
+def test_lengths_follow_the_table_columns():
+    report = INCIDENT_VALIDATOR.validate_records([{**INCIDENT, "category": "x" * 51}])
+    assert report.summary() == {("category", "longer than 50"): 1}
+
+
+def test_dates_parse_as_iso_and_retry_only_the_rest(monkeypatch):
+    to_datetime = pd.to_datetime
+    retried = []
+
+    def spy(values, **options):
+        if options.get("format") == "mixed":
+            retried.append(list(values))
+        return to_datetime(values, **options)
+
+    monkeypatch.setattr(pd, "to_datetime", spy)
+    dates = ["2025-07-01", "2025-07-02T10:30:00", "July 3, 2025", "not a date", None]
+    validator = Schema("t", (Field("date", "datetime", nullable=True),)).compile()
+    report = validator.validate_frame(pd.DataFrame({"date": dates}))
+
+    assert retried == [["July 3, 2025", "not a date"]]
+    assert report.errors[["row", "error"]].values.tolist() == [[3, "not a date"]]
+    assert report.valid["date"].dt.day.tolist()[:3] == [1, 2, 3]
+
+
+def test_batches_keep_global_row_numbers():
+    batches = [[INCIDENT, INCIDENT], pd.DataFrame([{**INCIDENT, "date": "not a date"}])]
+    reports = list(INCIDENT_VALIDATOR.validate_batches(batches))
+    assert reports[1].errors["row"].tolist() == [2]
+    assert reports[1].errors["error"].tolist() == ["not a date"]